@@ -0,0 +1,193 @@
+"""
+This module contains the allocation matrices of the politicians used by the
+Align Your Investment Strategy page. For every politician they hold the share
+of the purchases in every instrument type and in every equity sector, as dense
+politicians x categories arrays with their label vectors. The updaters store
+them next to the datasets, so the page does not rebuild them on every rerun.
+"""
+import os
+import json
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from Src.scraping.politician_summary import load_trades
+from Src.scraping.price_store import source_version
+from Src.scraping.scraper_utils import save_array, save_json
+
+ALLOCATION_COLUMNS = ["quoteType", "sectorKey"]
+ALLOCATION_SOURCES = ["senators_trading.csv", "financial_instruments.csv"]
+
+
+def allocation_sources(data_dir: str = "Data") -> List[List[int]]:
+    """
+    Return the versions of the datasets the allocations are built from,
+    recorded with the stored matrices to detect matrices older than the data.
+    """
+    return [source_version(os.path.join(data_dir, name)) for name in ALLOCATION_SOURCES]
+
+
+def align_columns(matrix: np.ndarray, columns: List[str], categories: List[str]) -> np.ndarray:
+    """
+    Return the columns of a matrix for the categories in their order, 0 for
+    categories that are not among its columns.
+    """
+    indexer = pd.Index(columns).get_indexer(categories)
+
+    return np.where(indexer >= 0, matrix[:, indexer], 0.0)
+
+
+def allocation_paths(data_dir: str, join: str) -> Tuple[str, str]:
+    """
+    Return the paths of the stored matrix of a category column and of its
+    index.
+    """
+    return (os.path.join(data_dir, f"allocation_{join}.npy"),
+            os.path.join(data_dir, f"allocation_{join}.json"))
+
+
+class Allocation_Matrix:
+    def __init__(self, join: str, politicians: List[str], categories: List[str],
+                 matrix: np.ndarray):
+        """
+        The matrix holds the allocations in percent of the politicians (rows)
+        in the categories of join (columns), 0 for categories a politician
+        does not invest in.
+        """
+        self.join = join
+        self.politicians = list(politicians)
+        self.categories = list(categories)
+        self.matrix = np.asarray(matrix, dtype=np.float64)
+        self.rows = {politician: row for row, politician in enumerate(self.politicians)}
+
+    @classmethod
+    def from_table(cls, data_general: pd.DataFrame, join: str) -> "Allocation_Matrix":
+        """
+        Function that converts the long allocation table of the politicians,
+        one row per politician and category, to the dense matrix.
+        """
+        value = "Total Invested Type" if "Total Invested Type" in data_general.columns else "Total Invested Sector"
+        matrix = data_general.pivot_table(index="Politician", columns=join, values=value,
+                                          aggfunc="sum", fill_value=0)
+
+        return cls(join, matrix.index.tolist(), matrix.columns.tolist(), matrix.to_numpy())
+
+    @classmethod
+    def from_trades(cls, data: pd.DataFrame, join: str) -> "Allocation_Matrix":
+        """
+        Function that builds the allocations from the trades merged with the
+        financial instruments. The types are the shares of all purchases, the
+        sectors the shares of the equity purchases, unknown categories are
+        left out.
+        """
+        purchases = data[(data["Transaction"] == "Purchase") & (data[join] != "Unknown")]
+        if join == "sectorKey":
+            purchases = purchases[purchases["quoteType"] == "EQUITY"]
+        invested = pd.DataFrame({
+            "Politician": purchases["Politician"],
+            join: purchases[join],
+            "Invested": pd.to_numeric(purchases["Invested"], errors="coerce")
+        })
+        totals = invested.pivot_table(index="Politician", columns=join, values="Invested",
+                                      aggfunc="sum", fill_value=0)
+        matrix = totals.to_numpy(dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            matrix = np.nan_to_num(matrix * 100 / matrix.sum(axis=1, keepdims=True))
+
+        return cls(join, totals.index.tolist(), totals.columns.tolist(), matrix)
+
+    def subset(self, rows: np.ndarray) -> "Allocation_Matrix":
+        """
+        Function that returns the allocations of the politicians of the rows.
+        """
+        return Allocation_Matrix(self.join, [self.politicians[row] for row in rows], self.categories,
+                                 self.matrix[rows])
+
+    def align(self, categories: List[str]) -> np.ndarray:
+        """
+        Function that returns the columns of the categories in their order, 0
+        for categories no politician invests in.
+        """
+        return align_columns(self.matrix, self.categories, categories)
+
+    def allocation(self, politician: str) -> pd.Series:
+        """
+        Function that returns the allocations of a politician by category,
+        empty for unknown politicians.
+        """
+        if politician not in self.rows:
+            return pd.Series(dtype=np.float64)
+
+        return pd.Series(self.matrix[self.rows[politician]], index=self.categories)
+
+    def save(self, data_dir: str = "Data") -> None:
+        """
+        Function that stores the matrix and its index of politicians and
+        categories. Both files are replaced atomically, a reader that finds
+        them out of step rebuilds the matrix.
+        """
+        matrix_path, index_path = allocation_paths(data_dir, self.join)
+        save_array(matrix_path, self.matrix)
+        save_json(index_path, {"politicians": self.politicians, "categories": self.categories,
+                               "source": allocation_sources(data_dir)})
+
+    @classmethod
+    def load(cls, data_dir: str, join: str) -> Optional["Allocation_Matrix"]:
+        """
+        Function that loads a stored matrix, None if it is missing, does not
+        match its index or is older than the datasets.
+        """
+        matrix_path, index_path = allocation_paths(data_dir, join)
+        try:
+            with open(index_path) as index_file:
+                index = json.load(index_file)
+            if index["source"] != allocation_sources(data_dir):
+                raise ValueError("The allocation matrix is older than the datasets")
+            matrix = np.load(matrix_path)
+            if matrix.shape != (len(index["politicians"]), len(index["categories"])):
+                raise ValueError("The allocation matrix does not match its index")
+        except (OSError, ValueError, KeyError) as e:
+            if os.path.exists(index_path):
+                logging.info(f"Rebuilding the {join} allocation matrix: {e}")
+            return None
+
+        return cls(join, index["politicians"], index["categories"], matrix)
+
+
+def build_allocation_matrices(data: pd.DataFrame) -> Dict[str, Allocation_Matrix]:
+    """
+    Build the type and the sector allocation matrices.
+
+    Args:
+        data (pd.DataFrame): The trades with the columns Politician,
+        Transaction, Invested, quoteType and sectorKey.
+
+    Returns:
+        Dict[str, Allocation_Matrix]: The matrices by their category column.
+    """
+    return {join: Allocation_Matrix.from_trades(data, join) for join in ALLOCATION_COLUMNS}
+
+
+def refresh_allocation_matrices(data_loader, data: Optional[pd.DataFrame] = None) -> Dict[str, Allocation_Matrix]:
+    """
+    Rebuild the stored allocation matrices from the senators trading and the
+    financial instruments datasets.
+
+    Args:
+        data_loader (DataLoader): The data loader of the datasets.
+        data (Optional[pd.DataFrame]): The trades merged with the financial
+        instruments, loaded from the datasets if not given.
+
+    Returns:
+        Dict[str, Allocation_Matrix]: The saved matrices.
+    """
+    if data is None:
+        data = load_trades(data_loader)
+
+    matrices = build_allocation_matrices(data)
+    for matrix in matrices.values():
+        matrix.save(data_loader.data_dir)
+
+    return matrices
@@ -0,0 +1,142 @@
+"""
+This module contains the batch alignment of many user allocations, e.g. the
+portfolios of the clients of an advisor, against all politicians. The clients
+are scored in chunks, every chunk with one broadcast clients x politicians x
+categories operation, so the memory stays bounded for any number of clients.
+"""
+import time
+import logging
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from Src.clustering.allocations import Allocation_Matrix
+from Src.clustering.cluster import alignment_kernel, top_k
+
+MAX_CHUNK_ELEMENTS = 2 ** 22
+
+
+def read_user_allocations(source: Union[str, pd.DataFrame], join: str) -> Tuple[List[str], List[str], np.ndarray]:
+    """
+    Read the allocations of the clients, either in the wide layout with a
+    'Client' column and one column per category, or in the long layout of the
+    Align page with the columns 'Client', join and 'Invested by User'.
+
+    Args:
+        source (Union[str, pd.DataFrame]): The allocations or the path of
+        their CSV file.
+        join (str): The category column (e.g., 'quoteType').
+
+    Returns:
+        Tuple[List[str], List[str], np.ndarray]:
+            - The clients in the order of the rows.
+            - The categories in the order of the columns.
+            - The clients x categories allocations in percent, 0 for missing
+            categories.
+    """
+    data = pd.read_csv(source) if isinstance(source, str) else source
+    if join in data.columns:
+        data = data.pivot_table(index="Client", columns=join, values="Invested by User",
+                                aggfunc="last", fill_value=0, sort=False)
+    else:
+        data = data.set_index("Client") if "Client" in data.columns else data
+    data = data.apply(pd.to_numeric, errors="coerce").fillna(0)
+
+    return [str(client) for client in data.index], [str(column) for column in data.columns], \
+        data.to_numpy(dtype=np.float64)
+
+
+def chunk_top_k(alignment: np.ndarray, score: np.ndarray, k: int) -> np.ndarray:
+    """
+    Select the k best politicians of every client of a chunk in the order of
+    top_k, with one partial sort of the clients x politicians matrix. Only the
+    clients whose k-th alignment is tied with a politician left out by the
+    partition are ranked again one by one.
+
+    Args:
+        alignment (np.ndarray): The clients x politicians alignments.
+        score (np.ndarray): The clients x politicians scores.
+        k (int): The number of politicians.
+
+    Returns:
+        np.ndarray: The clients x k indices of the best politicians, the best
+        first.
+    """
+    clients, politicians = alignment.shape
+    k = min(k, politicians)
+    if k <= 0:
+        return np.empty((clients, 0), dtype=np.intp)
+
+    if politicians > k:
+        candidates = np.argpartition(-alignment, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(politicians), (clients, politicians))
+    candidate_alignment = np.take_along_axis(alignment, candidates, axis=1)
+    candidate_score = np.take_along_axis(score, candidates, axis=1)
+    order = np.lexsort((candidates, candidate_score, -candidate_alignment), axis=-1)
+    best = np.take_along_axis(candidates, order, axis=1)
+
+    tied = (alignment >= candidate_alignment.min(axis=1, keepdims=True)).sum(axis=1) > k
+    for row in np.flatnonzero(tied):
+        best[row] = top_k(alignment[row], score[row], k)
+
+    return best
+
+
+def batch_alignment(allocations: Allocation_Matrix, users: Union[str, pd.DataFrame],
+                    k: int = 5, chunk_size: Optional[int] = None) -> Tuple[pd.DataFrame, Dict[str, float]]:
+    """
+    Rank the politicians for every client by the alignment of the Align page.
+
+    Args:
+        allocations (Allocation_Matrix): The allocations of the politicians.
+        users (Union[str, pd.DataFrame]): The allocations of the clients, see
+        read_user_allocations.
+        k (int): The number of politicians per client.
+        chunk_size (Optional[int]): The number of clients scored at once, by
+        default as many as fit into MAX_CHUNK_ELEMENTS per temporary array.
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, float]]:
+            - The top k politicians of every client with the columns Client,
+            Rank, Politician and Alignment (%).
+            - The clients, politicians, seconds and clients_per_second of the
+            run.
+    """
+    start = time.perf_counter()
+    clients, categories, user_matrix = read_user_allocations(users, allocations.join)
+    politician_matrix = allocations.align(categories)
+    politicians = np.asarray(allocations.politicians, dtype=object)
+    if chunk_size is None:
+        chunk_size = max(1, MAX_CHUNK_ELEMENTS // max(1, politician_matrix.size))
+
+    chunks, chunk_alignments = [], []
+    for first in range(0, len(clients), chunk_size):
+        alignment, score = alignment_kernel(politician_matrix, user_matrix[first:first + chunk_size, np.newaxis, :])
+        best = chunk_top_k(alignment, score, k)
+        chunks.append(best)
+        chunk_alignments.append(np.take_along_axis(alignment, best, axis=1))
+
+    ranked = max(0, min(k, len(politicians)))
+    best_rows = np.concatenate(chunks) if chunks else np.empty((0, ranked), dtype=np.intp)
+    result = pd.DataFrame({
+        "Client": np.repeat(np.asarray(clients, dtype=object), ranked),
+        "Rank": np.tile(np.arange(1, ranked + 1), len(clients)),
+        "Politician": politicians[best_rows.ravel()],
+        "Alignment (%)": np.concatenate(chunk_alignments).ravel() if chunk_alignments else np.empty(0)
+    })
+
+    seconds = time.perf_counter() - start
+    metrics = {
+        "clients": len(clients),
+        "politicians": len(politicians),
+        "seconds": seconds,
+        "clients_per_second": len(clients) / seconds if seconds > 0 else float("inf")
+    }
+    logging.info(
+        f"Aligned {metrics['clients']} clients with {metrics['politicians']} politicians "
+        f"in {seconds:.3f} s ({metrics['clients_per_second']:.0f} clients per second)"
+    )
+
+    return result, metrics
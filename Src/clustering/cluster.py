@@ -1,69 +1,322 @@
 """
 This module contains the functions to cluster the data and recommend the best
-alignment
+alignment. The politicians are also grouped by trading style with k-means
+over their allocations after every data update, the labels and centroids are
+stored next to the allocation matrices, so the alignment of a user only ranks
+the members of the nearest cluster.
 """
+import os
+import json
+import logging
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
 import pandas as pd
 
+from Src.clustering.allocations import Allocation_Matrix, align_columns, allocation_sources
+from Src.scraping.scraper_utils import save_array, save_json
+
+
+def alignment_kernel(allocations: np.ndarray, user: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    This function scores every politician against a user allocation. The
+    alignment of a category is 1 for equal allocations, falls linearly with
+    the difference relative to the politician's allocation and is 0 for
+    differences larger than the allocation or for categories the politician
+    does not invest in. A clients x 1 x categories array of users is
+    broadcast to all politicians at once.
+
+    Args:
+        allocations (np.ndarray): The politicians x categories allocations.
+        user (np.ndarray): The user allocation of every category.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The mean alignment in percent and the
+        mean squared error of every politician (of every client).
+    """
+    difference = np.abs(allocations - user)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative = difference / allocations
+    alignment = np.where(difference == 0, 1.0,
+                         np.where((allocations == 0) | (relative > 1), 0.0, 1 - relative))
+
+    return alignment.mean(axis=-1) * 100, (difference ** 2).mean(axis=-1)
+
+
+def top_k(alignment: np.ndarray, score: np.ndarray, k: int = 5) -> np.ndarray:
+    """
+    This function selects the k best politicians, by the highest alignment and
+    then the lowest score, with a partial sort. Politicians tied on both keys
+    keep their order.
+
+    Args:
+        alignment (np.ndarray): The alignment of every politician.
+        score (np.ndarray): The score of every politician.
+        k (int): The number of politicians.
+
+    Returns:
+        np.ndarray: The indices of the best politicians, the best first.
+    """
+    if len(alignment) > k > 0:
+        # Keep all politicians tied with the k-th alignment as candidates
+        threshold = np.partition(alignment, len(alignment) - k)[len(alignment) - k]
+        candidates = np.flatnonzero(alignment >= threshold)
+    else:
+        candidates = np.arange(len(alignment))
+    order = np.lexsort((score[candidates], -alignment[candidates]))
+
+    return candidates[order][:k]
+
 
-def best_alignment(data_general: pd.DataFrame, data_user: pd.DataFrame,
-                   join: str) -> pd.DataFrame:
+def best_alignment(data_general: Union[Allocation_Matrix, pd.DataFrame], data_user: pd.DataFrame,
+                   join: str, k: int = 5) -> pd.DataFrame:
     """
     This function calculates the alignment between general data (e.g., Total
     Invested Type) and user-provided data (e.g., Invested by User) based on a
     common column. It computes a Mean Squared Error (MSE) score and alignment
-    percentage for each politician, ranks the top 5 politicians based on the
+    percentage for each politician, ranks the top k politicians based on the
     best alignment, and returns the resulting DataFrame.
 
     Args:
-        data_general (pd.DataFrame): The general data DataFrame, which includes
-        columns such as 'Total Invested Type'.
+        data_general (Union[Allocation_Matrix, pd.DataFrame]): The allocation
+        matrix of the politicians, or the general data DataFrame, which
+        includes columns such as 'Total Invested Type'.
         data_user (pd.DataFrame): The user data DataFrame, which includes
         columns such as 'Invested by User'.
         join (str): The column name used to join both DataFrames (e.g.,
-        'Politician').
+        'quoteType').
+        k (int): The number of politicians to return.
 
     Returns:
-        pd.DataFrame: A DataFrame containing the top 5 politicians based on the
+        pd.DataFrame: A DataFrame containing the top k politicians based on the
         best alignment score, with columns:
             - Politician (str): Name of the politician.
             - Alignment (%) (float): The alignment score as a percentage.
     """
-    # Merge data frames on 'type'
-    help_df = data_general.merge(data_user, how="right", on=join).fillna(0)
-
-    help_df = help_df.drop(columns="Total Invested")
-    help_df = help_df.rename(columns={"Total Invested Sector": "Total Invested", "Total Invested Type": "Total Invested"})
-
-    # Calculate the squared difference as a "score" (penalizing larger
-    # differences)
-    help_df["score"] = (help_df["Total Invested"] - help_df["Invested by User"]) ** 2
-
-    # Calculate alignment score based on the normalized difference, clip to
-    # avoid negatives
-    help_df["alignment"] = help_df.apply(
-        lambda row: 1 if row["Total Invested"] == row["Invested by User"]
-        else (
-            0 if row["Total Invested"] == 0 or abs(row["Total Invested"] - row["Invested by User"]) / row["Total Invested"] > 1
-            else 1 - abs(row["Total Invested"] - row["Invested by User"]) / row["Total Invested"]
-        ),
-        axis=1
-    )
-
-    # Group by Politician and calculate the average score and alignment
-    grouped_df_type = help_df.groupby("Politician", as_index=False)["score"].mean()
-    grouped_df_alignment = help_df.groupby("Politician", as_index=False)["alignment"].mean()
-    grouped_df_alignment["alignment"] = grouped_df_alignment["alignment"] * 100
-
-    # Merge the grouped data frames and output
-    top_5_politicians = (
-        grouped_df_type
-        .merge(grouped_df_alignment, how="left", on="Politician")
-        .sort_values(by=["alignment", "score"], ascending=[False, True])
-        .rename(columns={"score": "MSE score", "alignment": "Alignment (%)"})
-        .reset_index(drop=True)
-        .head(5)
-    )
-    top_5_politicians = top_5_politicians.drop(columns=["MSE score"])
-    top_5_politicians.index = top_5_politicians.index + 1
-
-    return top_5_politicians
+    if not isinstance(data_general, Allocation_Matrix):
+        data_general = Allocation_Matrix.from_table(data_general, join)
+
+    # Align the politicians' allocations with the categories of the user
+    user = data_user.drop_duplicates(subset=[join], keep="last")
+    allocations = data_general.align(user[join].tolist())
+
+    alignment, score = alignment_kernel(allocations, user["Invested by User"].to_numpy(dtype=np.float64))
+    best = top_k(alignment, score, k)
+
+    top_politicians = pd.DataFrame({
+        "Politician": np.asarray(data_general.politicians, dtype=object)[best],
+        "Alignment (%)": alignment[best]
+    })
+    top_politicians.index = top_politicians.index + 1
+
+    return top_politicians
+
+
+def squared_distances(points: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """
+    Compute the squared Euclidean distances of all points to all centroids
+    with one matrix product.
+
+    Args:
+        points (np.ndarray): The points in the rows.
+        centroids (np.ndarray): The centroids in the rows.
+
+    Returns:
+        np.ndarray: The points x centroids squared distances.
+    """
+    distances = (points ** 2).sum(axis=1)[:, np.newaxis] - 2 * points @ centroids.T \
+        + (centroids ** 2).sum(axis=1)
+
+    return np.maximum(distances, 0)
+
+
+def kmeans(points: np.ndarray, n_clusters: int, iterations: int = 100,
+           seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cluster points with k-means, seeded by k-means++ so that the clustering
+    is reproducible. Fewer clusters are returned if there are fewer distinct
+    points.
+
+    Args:
+        points (np.ndarray): The points in the rows.
+        n_clusters (int): The number of clusters.
+        iterations (int): The maximal number of iterations.
+        seed (int): The seed of the initial centroids.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The cluster of every point and the
+        centroids in the rows.
+    """
+    if len(points) == 0 or n_clusters < 1:
+        return np.zeros(len(points), dtype=np.int64), np.empty((0, points.shape[1]))
+
+    rng = np.random.default_rng(seed)
+    centroids = points[[rng.integers(len(points))]]
+    distances = squared_distances(points, centroids)[:, 0]
+    for _ in range(1, n_clusters):
+        if distances.sum() == 0:
+            break
+        centroid = points[[rng.choice(len(points), p=distances / distances.sum())]]
+        centroids = np.vstack([centroids, centroid])
+        distances = np.minimum(distances, squared_distances(points, centroid)[:, 0])
+
+    for _ in range(iterations):
+        labels = squared_distances(points, centroids).argmin(axis=1)
+        counts = np.bincount(labels, minlength=len(centroids))
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, points)
+        # Empty clusters keep their centroid
+        updated = np.where(counts[:, np.newaxis] > 0, sums / np.maximum(counts, 1)[:, np.newaxis], centroids)
+        if np.allclose(updated, centroids):
+            break
+        centroids = updated
+
+    return squared_distances(points, centroids).argmin(axis=1), centroids
+
+
+class Strategy_Clusters:
+    def __init__(self, join: str, politicians: List[str], categories: List[str],
+                 labels: np.ndarray, centroids: np.ndarray):
+        """
+        The labels follow the politicians of the allocation matrix the
+        clusters were built from, the centroids are allocations in percent of
+        its categories.
+        """
+        self.join = join
+        self.politicians = list(politicians)
+        self.categories = list(categories)
+        self.labels = np.asarray(labels, dtype=np.int64)
+        self.centroids = np.asarray(centroids, dtype=np.float64)
+
+    @classmethod
+    def from_allocations(cls, allocations: Allocation_Matrix,
+                         n_clusters: Optional[int] = None) -> "Strategy_Clusters":
+        """
+        Function that clusters the politicians by their allocations, by
+        default into about the square root of their number of clusters.
+        """
+        if n_clusters is None:
+            n_clusters = int(np.ceil(np.sqrt(len(allocations.politicians))))
+        labels, centroids = kmeans(allocations.matrix, n_clusters)
+
+        return cls(allocations.join, allocations.politicians, allocations.categories, labels, centroids)
+
+    def matches(self, allocations: Allocation_Matrix) -> bool:
+        """
+        Function that checks whether the clusters were built from the
+        allocations.
+        """
+        return (self.politicians, self.categories) == (allocations.politicians, allocations.categories)
+
+    def nearest(self, user: np.ndarray, categories: List[str]) -> int:
+        """
+        Function that returns the cluster whose centroid is the closest to a
+        user allocation of the categories, -1 if there are no clusters.
+        """
+        if len(self.centroids) == 0:
+            return -1
+        centroids = align_columns(self.centroids, self.categories, categories)
+
+        return int(squared_distances(user[np.newaxis, :], centroids)[0].argmin())
+
+    def member_rows(self, cluster: int) -> np.ndarray:
+        """
+        Function that returns the rows of the politicians of a cluster.
+        """
+        return np.flatnonzero(self.labels == cluster)
+
+    def members(self, cluster: int) -> List[str]:
+        """
+        Function that returns the politicians of a cluster.
+        """
+        return [self.politicians[row] for row in self.member_rows(cluster)]
+
+    def save(self, data_dir: str = "Data") -> None:
+        """
+        Function that stores the centroids and the index of politicians,
+        categories and labels, both files are replaced atomically.
+        """
+        centroids_path, index_path = cluster_paths(data_dir, self.join)
+        save_array(centroids_path, self.centroids)
+        save_json(index_path, {"politicians": self.politicians, "categories": self.categories,
+                               "labels": self.labels.tolist(), "source": allocation_sources(data_dir)})
+
+    @classmethod
+    def load(cls, data_dir: str, join: str) -> Optional["Strategy_Clusters"]:
+        """
+        Function that loads stored clusters, None if they are missing, do not
+        match their index or are older than the datasets.
+        """
+        centroids_path, index_path = cluster_paths(data_dir, join)
+        try:
+            with open(index_path) as index_file:
+                index = json.load(index_file)
+            if index["source"] != allocation_sources(data_dir):
+                raise ValueError("The strategy clusters are older than the datasets")
+            centroids = np.load(centroids_path)
+            if len(index["labels"]) != len(index["politicians"]) or centroids.shape[1:] != (len(index["categories"]),):
+                raise ValueError("The strategy clusters do not match their index")
+        except (OSError, ValueError, KeyError) as e:
+            if os.path.exists(index_path):
+                logging.info(f"Rebuilding the {join} strategy clusters: {e}")
+            return None
+
+        return cls(join, index["politicians"], index["categories"], index["labels"], centroids)
+
+
+def clustered_alignment(allocations: Allocation_Matrix, clusters: Strategy_Clusters, data_user: pd.DataFrame,
+                        join: str, k: int = 5) -> Tuple[pd.DataFrame, int]:
+    """
+    This function ranks the politicians like best_alignment, but only the
+    members of the strategy cluster whose centroid is the closest to the user
+    allocation. All politicians are ranked if the clusters were not built from
+    the allocations or the cluster has fewer than k members.
+
+    Args:
+        allocations (Allocation_Matrix): The allocations of the politicians.
+        clusters (Strategy_Clusters): The strategy clusters of the politicians.
+        data_user (pd.DataFrame): The user data DataFrame with the columns
+        join and 'Invested by User'.
+        join (str): The category column (e.g., 'quoteType').
+        k (int): The number of politicians to return.
+
+    Returns:
+        Tuple[pd.DataFrame, int]: The top k politicians as returned by
+        best_alignment and the nearest cluster, -1 if there is none.
+    """
+    cluster = -1
+    if clusters.matches(allocations):
+        user = data_user.drop_duplicates(subset=[join], keep="last")
+        cluster = clusters.nearest(user["Invested by User"].to_numpy(dtype=np.float64), user[join].tolist())
+    rows = clusters.member_rows(cluster) if cluster >= 0 else np.empty(0, dtype=np.intp)
+    candidates = allocations.subset(rows) if len(rows) >= k else allocations
+
+    return best_alignment(candidates, data_user, join, k), cluster
+
+
+def cluster_paths(data_dir: str, join: str) -> Tuple[str, str]:
+    """
+    Return the paths of the stored centroids of a category column and of
+    their index.
+    """
+    return (os.path.join(data_dir, f"clusters_{join}.npy"),
+            os.path.join(data_dir, f"clusters_{join}.json"))
+
+
+def refresh_strategy_clusters(data_dir: str, matrices: Dict[str, Allocation_Matrix]) -> Dict[str, Strategy_Clusters]:
+    """
+    Rebuild the stored strategy clusters from the allocation matrices.
+
+    Args:
+        data_dir (str): The directory with the datasets.
+        matrices (Dict[str, Allocation_Matrix]): The allocation matrices by
+        their category column.
+
+    Returns:
+        Dict[str, Strategy_Clusters]: The saved clusters.
+    """
+    clusters = {join: Strategy_Clusters.from_allocations(matrix) for join, matrix in matrices.items()}
+    for strategy_clusters in clusters.values():
+        strategy_clusters.save(data_dir)
+
+    return clusters
@@ -0,0 +1,158 @@
+"""
+This module contains the nearest-neighbour search over the strategies of the
+politicians. It is an exact, vectorized scan rather than a sublinear index:
+the allocation vectors are normalized to unit length once, so a
+k-nearest-politicians query by cosine similarity is one matrix-vector product
+over all politicians followed by a partial selection, for a user allocation as
+well as for an existing politician ("who trades like Senator X").
+"""
+import time
+from typing import Dict, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from Src.clustering.allocations import Allocation_Matrix
+from Src.clustering.cluster import alignment_kernel, top_k
+
+
+def unit_rows(matrix: np.ndarray) -> np.ndarray:
+    """
+    Scale the rows of a matrix to unit length, rows of zeros stay zeros.
+
+    Args:
+        matrix (np.ndarray): The vectors in the rows.
+
+    Returns:
+        np.ndarray: The normalized vectors.
+    """
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+
+    return np.divide(matrix, norms, out=np.zeros_like(matrix, dtype=np.float64), where=norms > 0)
+
+
+def brute_force_neighbours(allocations: Allocation_Matrix, vector: np.ndarray, k: int = 5) -> np.ndarray:
+    """
+    Rank all politicians by the cosine similarity of their raw allocations to
+    a vector and sort them fully, the reference the scan is checked against.
+
+    Args:
+        allocations (Allocation_Matrix): The allocations of the politicians.
+        vector (np.ndarray): The allocation of every category.
+        k (int): The number of politicians.
+
+    Returns:
+        np.ndarray: The similarities of the k most similar politicians.
+    """
+    norms = np.linalg.norm(allocations.matrix, axis=1) * np.linalg.norm(vector)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        similarity = np.nan_to_num(allocations.matrix @ vector / norms)
+
+    return np.sort(similarity)[::-1][:k]
+
+
+class Strategy_Scan:
+    def __init__(self, allocations: Allocation_Matrix):
+        """
+        The scan keeps the unit allocation vectors of the politicians, a
+        politician without allocations is similar to no one. Every query
+        scores all politicians, the cost grows linearly with their number.
+        """
+        self.allocations = allocations
+        self.vectors = unit_rows(allocations.matrix)
+
+    def vector(self, user: Union[Mapping[str, float], pd.Series, np.ndarray]) -> np.ndarray:
+        """
+        Function that converts a user allocation by category to a vector of
+        the categories of the scan, categories no politician invests in are
+        dropped.
+        """
+        if isinstance(user, np.ndarray):
+            return user.astype(np.float64)
+
+        return pd.Series(user, dtype=np.float64).reindex(self.allocations.categories).fillna(0).to_numpy()
+
+    def neighbours(self, vector: np.ndarray, k: int = 5,
+                   exclude: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Function that returns the rows and the similarities of the k
+        politicians most similar to a vector, ties in their order, optionally
+        without the politician of row exclude.
+        """
+        similarity = self.vectors @ unit_rows(vector)
+        if exclude is not None:
+            similarity[exclude] = -np.inf
+            k = min(k, len(similarity) - 1)
+        best = top_k(similarity, np.zeros_like(similarity), k)
+
+        return best, similarity[best]
+
+    def search(self, vector: np.ndarray, k: int = 5, exclude: Optional[int] = None) -> pd.DataFrame:
+        """
+        Function that returns the k politicians most similar to a vector with
+        their cosine similarity.
+        """
+        best, similarity = self.neighbours(vector, k, exclude)
+        neighbours = pd.DataFrame({
+            "Politician": np.asarray(self.allocations.politicians, dtype=object)[best],
+            "Similarity": similarity
+        })
+        neighbours.index = neighbours.index + 1
+
+        return neighbours
+
+    def query(self, user: Union[Mapping[str, float], pd.Series, np.ndarray], k: int = 5) -> pd.DataFrame:
+        """
+        Function that returns the k politicians whose strategy is the most
+        similar to a user allocation.
+        """
+        return self.search(self.vector(user), k)
+
+    def query_politician(self, politician: str, k: int = 5) -> pd.DataFrame:
+        """
+        Function that returns the k other politicians whose strategy is the
+        most similar to the strategy of a politician, empty for unknown
+        politicians.
+        """
+        if politician not in self.allocations.rows:
+            return pd.DataFrame(columns=["Politician", "Similarity"])
+
+        row = self.allocations.rows[politician]
+
+        return self.search(self.allocations.matrix[row], k, exclude=row)
+
+
+def benchmark(scan: Strategy_Scan, queries: np.ndarray, k: int = 5) -> Dict[str, float]:
+    """
+    Time the queries of the scan against the vectorized alignment scan of the
+    Align page (alignment_kernel and top_k over all politicians). Both score
+    every politician, the timings compare the two metrics, not an index.
+
+    Args:
+        scan (Strategy_Scan): The scan over the politicians.
+        queries (np.ndarray): The query vectors in the rows.
+        k (int): The number of politicians per query.
+
+    Returns:
+        Dict[str, float]: The number of queries, the mean scan_ms and
+        alignment_ms per query and whether the similarities of the scan agree
+        with the fully sorted reference (exact).
+    """
+    start = time.perf_counter()
+    results = [scan.neighbours(vector, k)[1] for vector in queries]
+    scan_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for vector in queries:
+        alignment, score = alignment_kernel(scan.allocations.matrix, vector)
+        top_k(alignment, score, k)
+    alignment_seconds = time.perf_counter() - start
+
+    expected = [brute_force_neighbours(scan.allocations, vector, k) for vector in queries]
+
+    return {
+        "queries": len(queries),
+        "scan_ms": scan_seconds * 1000 / max(1, len(queries)),
+        "alignment_ms": alignment_seconds * 1000 / max(1, len(queries)),
+        "exact": all(np.allclose(result, reference) for result, reference in zip(results, expected))
+    }
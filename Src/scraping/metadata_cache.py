@@ -0,0 +1,90 @@
+"""
+This module contains the cache of the financial instruments metadata. The
+fields of yfinance's info are split into groups with their own time to live,
+and the info of a ticker is fetched again only when one of its groups expired,
+independently of the monthly price refresh.
+"""
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+import pandas as pd
+
+from Src.scraping.scraper_utils import load_data
+
+FIELD_GROUPS: Dict[str, List[str]] = {
+    "identity": ["quoteType", "longName", "shortName", "currency", "financialCurrency"],
+    "classification": ["sectorKey", "industryKey"],
+    "profile": ["city", "country", "longBusinessSummary"]
+}
+# Time to live of the field groups in days
+DEFAULT_TTLS: Dict[str, float] = {
+    "identity": 365,
+    "classification": 180,
+    "profile": 90
+}
+
+
+class Metadata_Cache:
+    def __init__(self, data_dir: str = "Data", ttls: Optional[Dict[str, float]] = None,
+                 clock: Callable[[], pd.Timestamp] = pd.Timestamp.now):
+        """
+        The cache stores when every field group of a ticker was fetched, ttls
+        overrides the time to live (in days) of some groups.
+        """
+        self.path = os.path.join(data_dir, "financial_metadata_cache.csv")
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.clock = clock
+        self.fetched = self.load()
+
+    def load(self) -> pd.DataFrame:
+        """
+        Function that loads the fetch times, indexed by ticker.
+        """
+        columns = ["Ticker"] + list(FIELD_GROUPS)
+        fetched = load_data(self.path, columns=columns).reindex(columns=columns)
+        fetched = fetched.drop_duplicates(subset=["Ticker"], keep="last").set_index("Ticker")
+
+        return fetched.apply(pd.to_datetime, errors="coerce")
+
+    def expired_groups(self, ticker: str) -> List[str]:
+        """
+        Function that returns the field groups of a ticker that were never
+        fetched or whose time to live passed.
+        """
+        if ticker not in self.fetched.index:
+            return list(FIELD_GROUPS)
+
+        now = self.clock()
+        fetched = self.fetched.loc[ticker]
+
+        return [group for group in FIELD_GROUPS
+                if pd.isna(fetched[group]) or now - fetched[group] > pd.Timedelta(days=self.ttls[group])]
+
+    def fresh_tickers(self, tickers: Iterable[str]) -> Set[str]:
+        """
+        Function that returns the tickers whose metadata need no refresh.
+        """
+        return {ticker for ticker in tickers if not self.expired_groups(ticker)}
+
+    def mark_fetched(self, tickers: Iterable[str]) -> None:
+        """
+        Function that records that the info of the tickers was fetched now,
+        which refreshes all their field groups.
+        """
+        tickers = list(tickers)
+        if not tickers:
+            return None
+
+        now = self.clock()
+        fetched = pd.DataFrame({group: [now] * len(tickers) for group in FIELD_GROUPS},
+                               index=pd.Index(tickers, name="Ticker"))
+        kept = self.fetched[~self.fetched.index.isin(tickers)]
+        self.fetched = pd.concat([kept, fetched]) if not kept.empty else fetched
+
+        return None
+
+    def save(self) -> None:
+        """
+        Function that saves the fetch times.
+        """
+        self.fetched.reset_index().to_csv(self.path, index=False, date_format="%Y-%m-%dT%H:%M:%S")
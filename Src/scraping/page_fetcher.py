@@ -0,0 +1,72 @@
+"""
+This module contains the HTTP layer of the senators trading scraper. It keeps
+one pooled session with keep-alive connections, retries transient errors with
+backoff and downloads several table pages concurrently.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class Page_Fetcher:
+    def __init__(self, url: str, headers: Dict[str, str], workers: int = 4,
+                 retries: int = 3, backoff: float = 0.5, timeout: float = 120):
+        self.url = url
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+
+        # POST is not retried by default, the table endpoint is read-only
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=None
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.workers,
+                              max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @staticmethod
+    def page_payload(page: int) -> Dict[str, object]:
+        return {
+            'action': 'get_congresstrading_table',
+            'page': page,
+            'limit': 10000,
+            'politician': '',
+            'ticker': ''
+        }
+
+    def fetch_page(self, page: int) -> Optional[requests.Response]:
+        """
+        Function that downloads one page of the table, reusing the pooled
+        connections of the session.
+        """
+        try:
+            response = self.session.post(self.url, data=self.page_payload(page),
+                                         timeout=self.timeout)
+            response.raise_for_status()
+            return response
+        except requests.RequestException as e:
+            logging.error(
+                f"An error occurred while fetching data from the server: {e}"
+            )
+            return None
+
+    def fetch_pages(self, pages: Iterable[int]) -> Iterator[Tuple[int, Optional[requests.Response]]]:
+        """
+        Function that downloads the given pages concurrently and yields them in
+        the requested order.
+        """
+        pages = list(pages)
+        with ThreadPoolExecutor(max_workers=min(self.workers, max(1, len(pages)))) as executor:
+            yield from zip(pages, executor.map(self.fetch_page, pages))
+
+    def close(self) -> None:
+        self.session.close()
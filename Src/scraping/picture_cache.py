@@ -0,0 +1,89 @@
+"""
+This module contains the local cache of the politicians' profile pictures.
+Every picture is downloaded once, as a Wikimedia thumbnail when possible, and
+stored as a fixed-size compressed JPEG under Data/pictures, so the app serves
+the pictures from local files instead of the full-size originals.
+"""
+import os
+import re
+import logging
+from io import BytesIO
+from typing import Optional, Tuple
+
+import requests
+from PIL import Image
+
+PICTURES_DIR = "pictures"
+THUMBNAIL_SIZE = (300, 400)
+WIKIMEDIA_PATTERN = re.compile(
+    r"^(https?://upload\.wikimedia\.org/wikipedia/[^/]+)/(\w/\w\w)/([^/]+)$"
+)
+
+
+def thumbnail_path(politician: str, data_dir: str = "Data") -> str:
+    """
+    Return the path of the thumbnail of a politician, named after the
+    politician.
+    """
+    name = re.sub(r"[^A-Za-z0-9]+", "_", politician).strip("_")
+
+    return os.path.join(data_dir, PICTURES_DIR, f"{name}.jpg")
+
+
+def thumbnail_url(url: str, width: int = THUMBNAIL_SIZE[0]) -> str:
+    """
+    Return the URL of a Wikimedia thumbnail of an uploaded picture, which is
+    smaller than the original and rasterized for SVG files. Other URLs are
+    returned unchanged.
+
+    Args:
+        url (str): The URL of the original picture.
+        width (int): The width of the thumbnail in pixels.
+
+    Returns:
+        str: The URL to download.
+    """
+    match = WIKIMEDIA_PATTERN.match(url)
+    if match is None:
+        return url
+
+    base, hash_path, name = match.groups()
+    suffix = ".png" if name.lower().endswith(".svg") else ""
+
+    return f"{base}/thumb/{hash_path}/{name}/{width}px-{name}{suffix}"
+
+
+def save_thumbnail(url: str, path: str, size: Tuple[int, int] = THUMBNAIL_SIZE,
+                   quality: int = 85) -> Optional[str]:
+    """
+    Download a picture and store it as a compressed JPEG that fits into size.
+    The original is downloaded if the thumbnail is not available.
+
+    Args:
+        url (str): The URL of the picture.
+        path (str): The path of the thumbnail.
+        size (Tuple[int, int]): The maximal width and height of the thumbnail.
+        quality (int): The JPEG quality.
+
+    Returns:
+        Optional[str]: The path of the thumbnail, or None if the picture could
+        not be downloaded or decoded.
+    """
+    try:
+        source = thumbnail_url(url, size[0])
+        response = requests.get(source, headers={"User-Agent": "Senators-trading"}, timeout=30)
+        if not response.ok and source != url:
+            # Fall back to the original if the thumbnail is not available
+            response = requests.get(url, headers={"User-Agent": "Senators-trading"}, timeout=30)
+        response.raise_for_status()
+
+        with Image.open(BytesIO(response.content)) as image:
+            image = image.convert("RGB")
+            image.thumbnail(size)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            image.save(path, "JPEG", quality=quality, optimize=True)
+
+        return path
+    except Exception as e:
+        logging.error(f"Error creating the thumbnail of {url}: {e}")
+        return None
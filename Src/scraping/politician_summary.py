@@ -0,0 +1,178 @@
+"""
+This module contains the per-politician summary of the trading activity. The
+general information and the most traded instruments and sectors of every
+politician are aggregated in one pass over the trades, stored next to the
+datasets by the updaters, and looked up by the Politician Finder page.
+"""
+import os
+import json
+import logging
+from typing import List, Optional
+
+import pandas as pd
+
+from Src.scraping.price_store import source_version
+from Src.scraping.scraper_utils import save_json
+
+SUMMARY_COLUMNS = [
+    "Politician", "Party", "Chamber", "FirstTrade", "LastTrade", "Invested",
+    "Sold", "TopType", "TopTypeInvested", "TopSector", "TopSectorInvested",
+    "TopSoldSector", "TopSoldSectorInvested"
+]
+SUMMARY_SOURCES = ["senators_trading.csv", "financial_instruments.csv"]
+SUMMARY_INDEX_FILE = "politician_summary.json"
+
+
+def summary_sources(data_dir: str = "Data") -> List[List[int]]:
+    """
+    Return the versions of the datasets the summary is built from, recorded
+    with the stored summary to detect a summary older than the data.
+    """
+    return [source_version(os.path.join(data_dir, name)) for name in SUMMARY_SOURCES]
+
+
+def top_group(data: pd.DataFrame, key: str, largest: bool = True) -> pd.DataFrame:
+    """
+    Find the value of key with the largest (or smallest) total invested amount
+    of every politician.
+
+    Args:
+        data (pd.DataFrame): The trades with the columns Politician, key and
+        Invested.
+        key (str): The column to group the trades of a politician by.
+        largest (bool): Whether to pick the largest or the smallest total.
+
+    Returns:
+        pd.DataFrame: The value of key and its total indexed by politician.
+        Ties are broken like the page helpers did, by sorting the totals in
+        key order descending and taking the first (or last) row, so the first
+        tied key is the largest and the last tied key is the smallest.
+    """
+    totals = data.groupby(["Politician", key], observed=True)["Invested"].sum().reset_index()
+    totals = totals.sort_values("Invested", ascending=False, kind="stable")
+
+    return totals.drop_duplicates(subset=["Politician"], keep="first" if largest else "last")\
+        .set_index("Politician")
+
+
+def build_politician_summary(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aggregate the trades merged with the financial instruments to one row per
+    politician.
+
+    Args:
+        data (pd.DataFrame): The trades with the columns Politician, Party,
+        Chamber, Traded, Transaction, Invested, quoteType and sectorKey.
+
+    Returns:
+        pd.DataFrame: The summary with the SUMMARY_COLUMNS, the top columns
+        are NaN for politicians without such trades.
+    """
+    if data.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+    invested = pd.to_numeric(data["Invested"], errors="coerce")
+    purchases = data["Transaction"] == "Purchase"
+    sales = data["Transaction"] == "Sale"
+    trades = pd.DataFrame({
+        "Politician": data["Politician"].astype(str),
+        "Party": data["Party"],
+        "Chamber": data["Chamber"],
+        "Traded": data["Traded"],
+        "Invested": invested,
+        "Purchased": invested.where(purchases, 0),
+        "Sold": (-invested).where(sales, 0),
+        "quoteType": data["quoteType"],
+        "sectorKey": data["sectorKey"]
+    })
+
+    summary = trades.groupby("Politician").agg(
+        Party=("Party", "first"), Chamber=("Chamber", "first"),
+        FirstTrade=("Traded", "min"), LastTrade=("Traded", "max"),
+        Invested=("Purchased", "sum"), Sold=("Sold", "sum")
+    )
+    equity = trades["quoteType"] == "EQUITY"
+    groups = {
+        "Type": (trades[purchases], "quoteType", True),
+        "Sector": (trades[purchases & equity], "sectorKey", True),
+        "SoldSector": (trades[sales & equity], "sectorKey", False)
+    }
+    for name, (rows, key, largest) in groups.items():
+        top = top_group(rows, key, largest)
+        summary[f"Top{name}"] = top[key]
+        summary[f"Top{name}Invested"] = top["Invested"]
+
+    return summary.reset_index()[SUMMARY_COLUMNS]
+
+
+def load_trades(data_loader) -> pd.DataFrame:
+    """
+    Load the senators trading dataset merged with the type and the sector of
+    the financial instruments, "Unknown" for instruments without them.
+
+    Args:
+        data_loader (DataLoader): The data loader of the datasets.
+
+    Returns:
+        pd.DataFrame: The trades with the columns quoteType and sectorKey.
+    """
+    trading = data_loader.load_senators_trading()
+    instruments = data_loader.load_financial_instruments().reindex(
+        columns=["Ticker", "quoteType", "sectorKey"]
+    ).drop_duplicates(subset=["Ticker"])
+    data = trading.merge(instruments, how="left", on="Ticker")
+    data[["quoteType", "sectorKey"]] = data[["quoteType", "sectorKey"]].fillna("Unknown")
+
+    return data
+
+
+def refresh_politician_summary(data_loader, data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Rebuild the stored politician summary from the senators trading and the
+    financial instruments datasets.
+
+    Args:
+        data_loader (DataLoader): The data loader of the datasets.
+        data (Optional[pd.DataFrame]): The trades merged with the financial
+        instruments, loaded from the datasets if not given.
+
+    Returns:
+        pd.DataFrame: The saved summary.
+    """
+    sources = summary_sources(data_loader.data_dir)
+    if data is None:
+        data = load_trades(data_loader)
+
+    summary = build_politician_summary(data)
+    data_loader.save("politician_summary", summary)
+
+    # The versions are recorded after the summary, so a reader never pairs
+    # them with an older summary
+    index_path = os.path.join(data_loader.data_dir, SUMMARY_INDEX_FILE)
+    save_json(index_path, {"source": sources})
+
+    return summary
+
+
+def load_politician_summary(data_loader) -> Optional[pd.DataFrame]:
+    """
+    Load the stored politician summary.
+
+    Args:
+        data_loader (DataLoader): The data loader of the datasets.
+
+    Returns:
+        Optional[pd.DataFrame]: The summary, None if it is missing or older
+        than the senators trading or the financial instruments dataset.
+    """
+    index_path = os.path.join(data_loader.data_dir, SUMMARY_INDEX_FILE)
+    try:
+        with open(index_path) as index_file:
+            if json.load(index_file)["source"] != summary_sources(data_loader.data_dir):
+                raise ValueError("The politician summary is older than the datasets")
+    except (OSError, ValueError, KeyError) as e:
+        if os.path.exists(index_path):
+            logging.info(f"Rebuilding the politician summary: {e}")
+        return None
+
+    return data_loader.load("politician_summary", columns=SUMMARY_COLUMNS)
@@ -0,0 +1,384 @@
+"""
+This module contains the price store of the financial instruments. The monthly
+closes are kept in long format, one (Ticker, Date, Close) row per price, in a
+file separate from the instrument metadata. New prices are appended without
+rewriting the stored history, the file is compacted once the superseded rows
+pile up, e.g. after full reloads of adjusted histories, and the wide layout with one column per month
+is migrated on first use. For fast lookups the store is also exported to a
+dense float32 matrix of tickers x months, which readers memory-map.
+"""
+import os
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from Src.scraping.scraper_utils import load_data, replace_file, save_array, save_json
+from Src.scraping.storage import PRICE_COLUMN_PATTERN, get_storage
+
+PRICE_COLUMNS = ["Ticker", "Date", "Close"]
+MATRIX_FILE = "financial_prices.npy"
+MATRIX_INDEX_FILE = "financial_prices_index.json"
+# Superseded rows, relative to the live prices, at which the store is compacted
+COMPACTION_RATIO = 0.5
+
+
+def month_numbers(dates: Iterable[str]) -> np.ndarray:
+    """
+    Convert dates to the number of months since the year 0, so the column of a
+    month in the price matrix is a plain offset.
+
+    Args:
+        dates (Iterable[str]): Dates in the format 'YYYY-MM-DD'.
+
+    Returns:
+        np.ndarray: The month numbers as floats, NaN for malformed dates.
+    """
+    date_strings = pd.Series(dates, dtype=object).astype(str)
+    years = pd.to_numeric(date_strings.str[:4], errors="coerce")
+    months = pd.to_numeric(date_strings.str[5:7], errors="coerce")
+
+    return (years * 12 + months - 1).to_numpy(dtype=np.float64)
+
+
+def month_labels(first_month: int, count: int) -> List[str]:
+    """
+    Return the dates 'YYYY-MM-01' of count consecutive months starting with the
+    month number first_month.
+    """
+    return [f"{month // 12:04d}-{month % 12 + 1:02d}-01"
+            for month in range(first_month, first_month + count)]
+
+
+def long_to_matrix(prices: pd.DataFrame) -> Tuple[List[str], int, np.ndarray]:
+    """
+    Convert the long price layout to a dense matrix with one row per ticker and
+    one column per month, from the first to the last stored month.
+
+    Args:
+        prices (pd.DataFrame): The prices with the columns Ticker, Date and
+        Close.
+
+    Returns:
+        Tuple[List[str], int, np.ndarray]:
+            - The tickers in the order of the rows.
+            - The month number of the first column.
+            - The float32 matrix with NaN for missing prices.
+    """
+    numbers = month_numbers(prices["Date"])
+    valid = ~np.isnan(numbers)
+    if not valid.any():
+        return [], 0, np.empty((0, 0), dtype=np.float32)
+
+    ticker_codes, tickers = pd.factorize(prices["Ticker"].astype(str))
+    first_month = int(numbers[valid].min())
+    matrix = np.full((len(tickers), int(numbers[valid].max()) - first_month + 1),
+                     np.nan, dtype=np.float32)
+    closes = pd.to_numeric(prices["Close"], errors="coerce").to_numpy(dtype=np.float32)
+    matrix[ticker_codes[valid], numbers[valid].astype(int) - first_month] = closes[valid]
+
+    return list(tickers), first_month, matrix
+
+
+def current_month() -> str:
+    """
+    Return the date 'YYYY-MM-01' of the current month, the last month of an
+    up-to-date price history.
+    """
+    return pd.Timestamp.today().replace(day=1).strftime("%Y-%m-%d")
+
+
+def last_dates(prices: pd.DataFrame) -> Dict[str, str]:
+    """
+    Build the staleness index of price histories: the date of the last stored
+    month of every ticker.
+
+    Args:
+        prices (pd.DataFrame): The prices with the columns Ticker and Date.
+
+    Returns:
+        Dict[str, str]: The last date 'YYYY-MM-DD' of every ticker.
+    """
+    if prices.empty:
+        return {}
+
+    dates = prices.assign(Date=prices["Date"].astype(str)).groupby("Ticker")["Date"].max()
+
+    return dates.to_dict()
+
+
+def source_version(prices_path: str) -> List[int]:
+    """
+    Return the modification time and size of the price store file, recorded
+    in the matrix index to detect a matrix older than the store.
+    """
+    if not os.path.exists(prices_path):
+        return []
+    stat = os.stat(prices_path)
+
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def matches_refresh_point(history: pd.DataFrame, refresh_point: Tuple[str, float]) -> bool:
+    """
+    Check whether a downloaded history still contains the stored close of the
+    refresh point. A different close means that a split or an adjustment
+    changed the stored history.
+
+    Args:
+        history (pd.DataFrame): The downloaded prices of one ticker with the
+        columns Date and Close.
+        refresh_point (Tuple[str, float]): The date and the stored close of
+        the first requested month.
+
+    Returns:
+        bool: True if the stored history is still valid.
+    """
+    date, close = refresh_point
+    closes = history.loc[history["Date"] == date, "Close"]
+
+    return not closes.empty and bool(np.isclose(closes.iloc[0], close, rtol=1e-3, atol=0.01))
+
+
+def has_wide_prices(data_dir: str = "Data") -> bool:
+    """
+    Check whether the financial instruments dataset still holds price columns
+    of the wide layout. Only the header of the CSV file is read.
+    """
+    try:
+        columns = pd.read_csv(os.path.join(data_dir, "financial_instruments.csv"), nrows=0).columns
+    except (FileNotFoundError, pd.errors.EmptyDataError):
+        return False
+
+    return any(PRICE_COLUMN_PATTERN.match(str(column)) for column in columns)
+
+
+def open_price_matrix(data_dir: str = "Data") -> Tuple[List[str], int, np.ndarray]:
+    """
+    Memory-map the price matrix. The matrix is exported from the price store
+    first if it is missing or older than the store.
+
+    Args:
+        data_dir (str): The directory with the datasets.
+
+    Returns:
+        Tuple[List[str], int, np.ndarray]: The tickers, the month number of
+        the first column and the read-only float32 matrix.
+    """
+    matrix_path = os.path.join(data_dir, MATRIX_FILE)
+    index_path = os.path.join(data_dir, MATRIX_INDEX_FILE)
+    prices_path = os.path.join(data_dir, "financial_prices.csv")
+    try:
+        with open(index_path) as index_file:
+            index = json.load(index_file)
+        if index["source"] != source_version(prices_path):
+            raise ValueError("The price matrix is older than the price store")
+        matrix = np.load(matrix_path, mmap_mode="r")
+        if matrix.shape != (len(index["tickers"]), index["months"]):
+            raise ValueError("The price matrix does not match its index")
+    except (OSError, ValueError, KeyError) as e:
+        if os.path.exists(index_path):
+            logging.info(f"Rebuilding the price matrix: {e}")
+        Price_Store(data_dir).write_matrix()
+        with open(index_path) as index_file:
+            index = json.load(index_file)
+        matrix = np.load(matrix_path, mmap_mode="r")
+
+    return index["tickers"], index["first_month"], matrix
+
+
+def wide_to_long(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert the wide price layout, with one column per month, to the long
+    layout of the price store.
+
+    Args:
+        data (pd.DataFrame): The financial instruments dataset with a 'Ticker'
+        column and price columns named by their date.
+
+    Returns:
+        pd.DataFrame: The known prices with the columns Ticker, Date and Close.
+    """
+    date_columns = [column for column in data.columns
+                    if PRICE_COLUMN_PATTERN.match(str(column))]
+    if "Ticker" not in data.columns or not date_columns:
+        return pd.DataFrame(columns=PRICE_COLUMNS)
+
+    prices = data[["Ticker"] + date_columns].melt(
+        id_vars="Ticker", var_name="Date", value_name="Close"
+    )
+    prices["Close"] = pd.to_numeric(prices["Close"], errors="coerce")
+
+    return prices.dropna(subset=["Close"]).sort_values(["Ticker", "Date"])\
+        .reset_index(drop=True)
+
+
+class Price_Store:
+    def __init__(self, data_dir: str = "Data"):
+        self.data_dir = data_dir
+        self.prices_path = os.path.join(data_dir, "financial_prices.csv")
+        self.matrix_path = os.path.join(data_dir, MATRIX_FILE)
+        self.matrix_index_path = os.path.join(data_dir, MATRIX_INDEX_FILE)
+        self.storage = get_storage(None, data_dir)
+        self.stored_rows = 0
+        self.prices = self.load()
+        self._index: Optional[Dict[Tuple[str, str], float]] = None
+        self._last_dates: Optional[Dict[str, str]] = None
+        self.migrate()
+
+    def migrate(self) -> None:
+        """
+        Function that moves the price columns of the wide financial instruments
+        dataset to the price store, the dataset keeps only the metadata.
+        """
+        if not has_wide_prices(self.data_dir):
+            return None
+
+        data = self.storage.read("financial_instruments", ["Ticker"])
+        date_columns = [column for column in data.columns
+                        if PRICE_COLUMN_PATTERN.match(str(column))]
+        self.append(wide_to_long(data))
+        self.storage.write("financial_instruments", data.drop(columns=date_columns))
+        logging.info(f"Migrated {len(date_columns)} price columns to financial_prices.csv")
+
+        return None
+
+    def load(self) -> pd.DataFrame:
+        """
+        Function that loads the stored prices. A price appended later replaces
+        the earlier price of the same ticker and month.
+        """
+        prices = load_data(self.prices_path, columns=PRICE_COLUMNS)
+        self.stored_rows = len(prices)
+        if prices.empty:
+            return pd.DataFrame(columns=PRICE_COLUMNS)
+
+        prices["Ticker"] = prices["Ticker"].astype(str)
+        prices["Date"] = prices["Date"].astype(str)
+
+        return prices.drop_duplicates(subset=["Ticker", "Date"], keep="last")\
+            .reset_index(drop=True)
+
+    @property
+    def index(self) -> Dict[Tuple[str, str], float]:
+        """
+        The (Ticker, Date) -> Close lookup table, built on first use.
+        """
+        if self._index is None:
+            self._index = dict(zip(zip(self.prices["Ticker"], self.prices["Date"]),
+                                   self.prices["Close"].astype(float)))
+        return self._index
+
+    @property
+    def last_dates(self) -> Dict[str, str]:
+        """
+        The ticker -> last stored date staleness index, built on first use.
+        """
+        if self._last_dates is None:
+            self._last_dates = last_dates(self.prices)
+        return self._last_dates
+
+    def stale_tickers(self, tickers: Iterable[str], month: Optional[str] = None) -> List[str]:
+        """
+        Function that returns the tickers, in their order, whose stored prices
+        do not reach the month, by default the current month.
+        """
+        month = month or current_month()
+
+        return [ticker for ticker in tickers if self.last_dates.get(ticker) != month]
+
+    def price(self, ticker: str, date: str) -> Optional[float]:
+        """
+        Function that returns the close of a ticker in a month, e.g.
+        price("AAPL", "2024-01-01"), or None if it is not stored.
+        """
+        return self.index.get((ticker, date))
+
+    def history(self, ticker: str) -> pd.Series:
+        """
+        Function that returns the monthly closes of a ticker indexed by date.
+        """
+        prices = self.prices[self.prices["Ticker"] == ticker]
+
+        return prices.set_index("Date")["Close"].sort_index()
+
+    def refresh_points(self) -> Dict[str, Tuple[str, float]]:
+        """
+        Function that returns the month where an incremental refresh of every
+        stored ticker starts, with its stored close. It is the last complete
+        month, the one before the last stored month, whose close may have been
+        partial when it was stored.
+        """
+        if self.prices.empty:
+            return {}
+
+        prices = self.prices.sort_values(["Ticker", "Date"])
+        points = prices.groupby("Ticker").nth(-2)
+        single = prices.drop_duplicates(subset=["Ticker"], keep="last")
+        points = pd.concat([points, single[~single["Ticker"].isin(points["Ticker"])]])
+
+        return {ticker: (date, float(close)) for ticker, date, close
+                in points[PRICE_COLUMNS].itertuples(index=False)}
+
+    def append(self, new_prices: pd.DataFrame) -> int:
+        """
+        Function that appends the new or changed prices to the store without
+        rewriting the stored history. The store is compacted once the
+        superseded prices exceed the COMPACTION_RATIO of the live prices.
+
+        Returns:
+            int: The number of appended prices.
+        """
+        if new_prices.empty:
+            return 0
+
+        new_prices = new_prices[PRICE_COLUMNS].copy()
+        new_prices["Ticker"] = new_prices["Ticker"].astype(str)
+        new_prices["Date"] = new_prices["Date"].astype(str)
+        new_prices = new_prices.drop_duplicates(subset=["Ticker", "Date"], keep="last")
+        is_new = [self.price(ticker, date) != close for ticker, date, close
+                  in new_prices.itertuples(index=False)]
+        new_prices = new_prices[is_new]
+        if new_prices.empty:
+            return 0
+
+        write_header = not os.path.exists(self.prices_path) or os.path.getsize(self.prices_path) == 0
+        new_prices.to_csv(self.prices_path, mode="a", index=False, header=write_header)
+        self.stored_rows += len(new_prices)
+        self.index.update(zip(zip(new_prices["Ticker"], new_prices["Date"]),
+                              new_prices["Close"].astype(float)))
+        for ticker, date in last_dates(new_prices).items():
+            self.last_dates[ticker] = max(date, self.last_dates.get(ticker, date))
+        if self.prices.empty:
+            self.prices = new_prices.reset_index(drop=True)
+        else:
+            self.prices = pd.concat([self.prices, new_prices], ignore_index=True)\
+                .drop_duplicates(subset=["Ticker", "Date"], keep="last")\
+                .reset_index(drop=True)
+        if self.stored_rows - len(self.prices) > COMPACTION_RATIO * len(self.prices):
+            self.compact()
+
+        return len(new_prices)
+
+    def compact(self) -> None:
+        """
+        Function that rewrites the store atomically with only the live prices,
+        dropping the prices superseded by later appends.
+        """
+        prices = self.prices
+        replace_file(self.prices_path, lambda file: prices.to_csv(file, index=False))
+        self.stored_rows = len(prices)
+
+    def write_matrix(self) -> None:
+        """
+        Function that exports the prices to the memory-mapped matrix and its
+        index of tickers and months. Both files are replaced atomically, a
+        reader that finds them out of step rebuilds the matrix.
+        """
+        tickers, first_month, matrix = long_to_matrix(self.prices)
+        save_array(self.matrix_path, matrix)
+        save_json(self.matrix_index_path, {"tickers": tickers, "first_month": first_month,
+                                           "months": matrix.shape[1],
+                                           "source": source_version(self.prices_path)})
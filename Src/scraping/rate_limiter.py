@@ -0,0 +1,163 @@
+"""
+This module contains the rate limiter of the Yahoo Finance requests. One token
+bucket in shared memory paces the requests of all pool workers, and both the
+request rate and the number of requests in flight adapt to the observed
+latency and to throttled (HTTP 429 or empty) responses.
+"""
+import time
+import multiprocessing
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator
+
+# Slots of the shared state
+RATE, TOKENS, UPDATED, LIMIT, IN_FLIGHT, REQUESTS, THROTTLED, LATENCY, STARTED = range(9)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """
+    Check whether an exception raised by yfinance or requests reports that
+    the API throttled the request.
+
+    Args:
+        error (Exception): The raised exception.
+
+    Returns:
+        bool: True for rate limit errors (HTTP 429).
+    """
+    message = str(error)
+    markers = ["429" in message, "Too Many Requests" in message,
+               "RateLimit" in type(error).__name__]
+
+    return any(markers)
+
+
+class _Request:
+    """
+    Outcome of one request, the caller marks throttled responses.
+    """
+    __slots__ = ("throttled",)
+
+    def __init__(self):
+        self.throttled = False
+
+
+class Rate_Limiter:
+    def __init__(self, rate: float = 1.5, max_rate: float = 5.0,
+                 min_rate: float = 0.2, rate_step: float = 0.1,
+                 max_concurrency: int = 4, target_latency: float = 2.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        The limiter starts at rate requests per second with half of
+        max_concurrency requests in flight. Successful fast responses raise
+        both limits additively, slow responses lower the concurrency and
+        throttled responses halve both. The state lives in shared memory, so
+        the limiter must reach pool workers by inheritance, e.g. through the
+        pool initializer.
+        """
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.rate_step = rate_step
+        self.max_concurrency = max(1, max_concurrency)
+        self.target_latency = target_latency
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = multiprocessing.Lock()
+        self.state = multiprocessing.RawArray("d", 9)
+        self.state[RATE] = rate
+        self.state[TOKENS] = 1.0
+        self.state[UPDATED] = clock()
+        self.state[LIMIT] = max(1.0, self.max_concurrency / 2)
+        self.state[STARTED] = clock()
+
+    def refill(self, now: float) -> None:
+        """
+        Function that adds the tokens earned since the last refill, the bucket
+        holds at most one second of requests.
+        """
+        capacity = max(1.0, self.state[RATE])
+        elapsed = max(0.0, now - self.state[UPDATED])
+        self.state[TOKENS] = min(capacity, self.state[TOKENS] + elapsed * self.state[RATE])
+        self.state[UPDATED] = now
+
+    def acquire(self) -> None:
+        """
+        Function that blocks until a token and a concurrency slot are free.
+        """
+        while True:
+            with self.lock:
+                self.refill(self.clock())
+                has_slot = self.state[IN_FLIGHT] < int(self.state[LIMIT])
+                if has_slot and self.state[TOKENS] >= 1:
+                    self.state[TOKENS] -= 1
+                    self.state[IN_FLIGHT] += 1
+                    return None
+                wait = (1 - self.state[TOKENS]) / self.state[RATE] if has_slot else 0.05
+
+            self.sleep(max(wait, 0.01))
+
+    def release(self, latency: float, throttled: bool) -> None:
+        """
+        Function that frees the concurrency slot of a finished request and
+        adapts the limits to its outcome.
+        """
+        with self.lock:
+            self.state[IN_FLIGHT] = max(0.0, self.state[IN_FLIGHT] - 1)
+            self.state[REQUESTS] += 1
+            self.state[LATENCY] += latency
+            if throttled:
+                self.state[THROTTLED] += 1
+                self.state[RATE] = max(self.min_rate, self.state[RATE] / 2)
+                self.state[LIMIT] = max(1.0, self.state[LIMIT] / 2)
+                self.state[TOKENS] = min(self.state[TOKENS], 0.0)
+            elif latency > self.target_latency:
+                self.state[LIMIT] = max(1.0, self.state[LIMIT] - 1)
+            else:
+                self.state[RATE] = min(self.max_rate, self.state[RATE] + self.rate_step)
+                self.state[LIMIT] = min(self.max_concurrency,
+                                        self.state[LIMIT] + 1 / self.state[LIMIT])
+
+    @contextmanager
+    def request(self) -> Iterator[_Request]:
+        """
+        Function that wraps one remote call. The caller sets throttled on the
+        yielded request for empty responses, rate limit errors are detected
+        automatically.
+        """
+        self.acquire()
+        request = _Request()
+        started = self.clock()
+        try:
+            yield request
+        except Exception as e:
+            request.throttled = request.throttled or is_rate_limit_error(e)
+            raise
+        finally:
+            self.release(self.clock() - started, request.throttled)
+
+    def start_run(self) -> None:
+        """
+        Function that resets the metrics at the start of a run, the adapted
+        limits are kept.
+        """
+        with self.lock:
+            self.state[REQUESTS] = self.state[THROTTLED] = self.state[LATENCY] = 0.0
+            self.state[STARTED] = self.clock()
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Function that reports the requests of the run: their number, the
+        throttled ones, the achieved requests per second, the mean latency and
+        the current limits.
+        """
+        with self.lock:
+            requests = self.state[REQUESTS]
+            elapsed = self.clock() - self.state[STARTED]
+            return {
+                "requests": int(requests),
+                "throttled": int(self.state[THROTTLED]),
+                "requests_per_second": requests / elapsed if elapsed > 0 else 0.0,
+                "mean_latency": self.state[LATENCY] / requests if requests else 0.0,
+                "rate": self.state[RATE],
+                "concurrency": int(self.state[LIMIT])
+            }
@@ -0,0 +1,64 @@
+"""
+This module contains the journal of the financial instruments refresh. Every
+checkpoint of a run records its processed tickers, so a refresh restarted
+after a crash or a rate limit ban skips the tickers that were already
+processed in the same month. The journal is cleared when a run completes.
+"""
+import os
+from typing import Iterable, List, Set
+
+import pandas as pd
+
+from Src.scraping.scraper_utils import load_data
+
+JOURNAL_COLUMNS = ["Ticker", "Month"]
+
+
+class Refresh_Journal:
+    def __init__(self, data_dir: str = "Data", month: str = ""):
+        """
+        The journal keeps the tickers processed by the runs of the month, the
+        entries of other months are ignored.
+        """
+        self.path = os.path.join(data_dir, "financial_refresh_journal.csv")
+        self.month = month
+        self.done = self.load()
+
+    def load(self) -> Set[str]:
+        """
+        Function that loads the tickers processed in the month.
+        """
+        journal = load_data(self.path, columns=JOURNAL_COLUMNS).reindex(columns=JOURNAL_COLUMNS)
+
+        return set(journal.loc[journal["Month"].astype(str) == self.month, "Ticker"].astype(str))
+
+    def pending(self, tickers: Iterable[str]) -> List[str]:
+        """
+        Function that returns the tickers, in their order, that were not
+        processed in the month yet.
+        """
+        return [ticker for ticker in tickers if ticker not in self.done]
+
+    def record(self, tickers: Iterable[str]) -> None:
+        """
+        Function that appends processed tickers to the journal.
+        """
+        tickers = [ticker for ticker in tickers if ticker not in self.done]
+        if not tickers:
+            return None
+
+        write_header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        pd.DataFrame({"Ticker": tickers, "Month": self.month}).to_csv(
+            self.path, mode="a", index=False, header=write_header
+        )
+        self.done.update(tickers)
+
+        return None
+
+    def clear(self) -> None:
+        """
+        Function that removes the journal of a completed run.
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.done = set()
@@ -5,22 +5,33 @@ financial instruments, and senators' information.
 import os
 import time
 import logging
-from multiprocessing import Pool
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from multiprocessing import Pool, Value, TimeoutError as PoolTimeoutError
 
-import requests
 from requests.exceptions import RequestException
-import numpy as np
 import pandas as pd
 import wikipedia
 import yfinance as yf
 import streamlit as st
-from bs4 import BeautifulSoup
 
+from Src.clustering.allocations import refresh_allocation_matrices
+from Src.clustering.cluster import refresh_strategy_clusters
+from Src.scraping.page_fetcher import Page_Fetcher
+from Src.scraping.metadata_cache import Metadata_Cache
+from Src.scraping.picture_cache import save_thumbnail, thumbnail_path
+from Src.scraping.politician_summary import load_trades, refresh_politician_summary
+from Src.scraping.refresh_journal import Refresh_Journal
+from Src.scraping.price_store import (Price_Store, current_month, last_dates,
+                                      matches_refresh_point)
+from Src.scraping.rate_limiter import Rate_Limiter
+from Src.scraping.storage import get_storage, to_legacy
+from Src.scraping.table_parser import get_table_parser
+from Src.scraping.trading_sync import Trading_Sync
+from Src.scraping.wiki_cache import Wiki_Cache, fetch_revisions
 from Src.scraping.scraper_utils import (
-    load_data, get_last_current_data, delete_exclude_tickers,
     senators_data_preparation, fin_history_preparation,
     fin_info_preparation, fin_ticker_preparation,
-    is_data_up_to_date, add_to_exclude_tickers,
+    add_to_exclude_tickers,
     get_profile_picture
 )
 
@@ -29,126 +40,144 @@ logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context")\
     .setLevel(logging.ERROR)
 logging.getLogger("streamlit").setLevel(logging.CRITICAL)
 
+DATA_VERSION_FILE = "data_version"
+
 
 class DataLoader:
-    def __init__(self):
-        self.data_dir = "Data"
+    def __init__(self, data_dir="Data", backend=None, typed=False):
+        """
+        The datasets are read through a storage backend (Parquet if pyarrow is
+        installed, else CSV). With typed=True the datasets keep their explicit
+        schema (categorical, datetime and float32 columns), otherwise they are
+        returned in the representation of the CSV files. The legacy form is
+        needed by the pages, by the trade hashes of Trading_Sync and by the
+        derived data (the politician summary and the allocation matrices),
+        which compare plain strings and ISO dates. Readers that only need the
+        distinct tickers or politicians pass typed=True to skip the conversion.
+        """
+        self.data_dir = data_dir
         os.makedirs(self.data_dir, exist_ok=True)
+        self.storage = get_storage(backend, self.data_dir)
+        self.typed = typed
+
+    def load(self, name, columns, typed=None):
+        """
+        Function that loads a dataset by its name through the storage backend,
+        typed overrides the representation chosen for the loader
+        """
+        return self.storage.read(name, columns, typed=self.typed if typed is None else typed)
+
+    def save(self, name, data):
+        """
+        Function that saves a dataset by its name through the storage backend
+        """
+        self.storage.write(name, data)
+        self.publish_version()
 
-    def load_senators_trading(self):
+    def publish_version(self):
+        """
+        Function that publishes a new data version token, so the running app
+        drops its cached datasets
+        """
+        with open(os.path.join(self.data_dir, DATA_VERSION_FILE), "w") as version_file:
+            version_file.write(str(time.time_ns()))
+
+    def refresh_derived_data(self):
+        """
+        Function that rebuilds the data derived from the trades and the
+        financial instruments: the allocation matrices, the strategy clusters
+        and the politician summary, whose save publishes the new data version
+        """
+        data = load_trades(self)
+        matrices = refresh_allocation_matrices(self, data)
+        refresh_strategy_clusters(self.data_dir, matrices)
+        refresh_politician_summary(self, data)
+
+    def load_senators_trading(self, typed=None):
         """
         Function that loads the senators trading dataset
         """
-        filepath = os.path.join(self.data_dir, "senators_trading.csv")
-        return load_data(filepath, columns=["Ticker"])
+        return self.load("senators_trading", columns=["Ticker"], typed=typed)
 
     def load_financial_instruments(self):
         """
         Function that loads the financial instruments dataset
         """
-        filepath = os.path.join(self.data_dir, "financial_instruments.csv")
-        return load_data(filepath, columns=["Ticker"])
+        return self.load("financial_instruments", columns=["Ticker"])
 
     def load_senators_information(self):
         """
         Function that loads the senators information dataset
         """
-        filepath = os.path.join(self.data_dir, "senators_information.csv")
-        return load_data(filepath, columns=["Politician"])
+        return self.load("senators_information", columns=["Politician"])
 
     def load_exclude_tickers(self):
         """
         Function that loads the excluded tickers dataset
         """
-        filepath = os.path.join(self.data_dir, "exclude_tickers.csv")
-        return load_data(filepath, columns=["Ticker"])
+        return self.load("exclude_tickers", columns=["Ticker"])
 
 
 class Senators_Trading_Updater:
-    def __init__(self):
-        self.data_loader = DataLoader()
+    def __init__(self, workers=4, parser=None, data_dir="Data"):
+        """
+        The pages of the table are fetched by workers threads and parsed by
+        the table parser, the datasets are stored in data_dir.
+        """
+        self.data_loader = DataLoader(data_dir)
+        self.table_parser = get_table_parser(parser)
         self.url = "https://trendspider.com/markets/wp-admin/admin-ajax.php"
         self.headers = {'User-Agent': 'Mozilla/5.0'}
+        self.page_fetcher = Page_Fetcher(self.url, self.headers, workers=workers)
 
     def update_senators_trading(self):
         """
         Function that updates the senators trading dataset by iterating through
-        the pages of the table on the website.
+        the pages of the table on the website. Paging stops at the first page
+        that contains only trades we already have, and continues page by page
+        after the first page that contains any of them.
         """
         try:
-            current_data = self.data_loader.load_senators_trading()
             exclude_tickers = self.data_loader.load_exclude_tickers()
-            last_current_data = get_last_current_data(current_data)
-            page = 1
-            new_data = pd.DataFrame()
-            max_pages = 2
+            trading_sync = Trading_Sync(self.data_loader)
+            trading_sync.prune(exclude_tickers)
+            new_pages = []
             progress_bar = st.progress(0)
             status_text = st.empty()
 
-            if current_data.empty:
-                current_data = pd.DataFrame(columns=['Ticker'])
-
-            while page <= max_pages:
-                response = self.fetch_data(page)
-
-                if response is None or response.status_code != 200:
+            for page, max_pages, response_json in self.fetch_all_pages(trading_sync.has_known_records):
+                if response_json is None:
                     status_text.text(
-                        f"Failed to fetch data from table: "
-                        f"{response.status_code if response else 'No Response'}"
+                        f"Failed to fetch data from table on page {page}."
                     )
                     break
 
-                response_json = response.json()
-                html_content = response_json['table']
-                max_pages = response_json['total_pages']
-                soup = BeautifulSoup(html_content, 'html.parser')
-                rows = soup.find_all('tr', class_='data-table__row')
                 progress_bar.progress(min(page / max_pages, 1.0))
                 status_text.text(
                     f"Processing batch {page}/{max_pages}, each batch contains "
                     "10000 records."
                 )
 
-                for row in rows:
-                    row_data = self.extract_row_data(row, exclude_tickers)
-                    new_data = pd.concat([new_data, row_data], ignore_index=True)
-
-                    if np.array_equal(last_current_data.values, row_data.values):
-                        status_text.text(
-                            "Encountered record that we have already in the "
-                            "dataset."
-                        )
-                        progress_bar.progress(100)
-                        new_data = new_data.iloc[:-1]
-                        current_data = pd.concat(
-                            [new_data, current_data], ignore_index=True
-                        )
-                        current_data = delete_exclude_tickers(
-                            exclude_tickers, current_data
-                        )
-                        time.sleep(2)
-                        status_text.text(
-                            f"All {len(new_data)} new records from the internet "
-                            "loaded successfully and saved to senators_trading.csv"
-                        )
-                        current_data.to_csv(
-                            os.path.join("Data", "senators_trading.csv"),
-                            index=False
-                        )
-                        return None
+                page_data = self.extract_page_data(response_json['table'], exclude_tickers)
+                page_new_data, page_known = trading_sync.new_records(page_data)
+                new_pages.append(page_new_data)
 
-                page += 1
+                if page_known:
+                    status_text.text(
+                        "Encountered page with only records that we have "
+                        "already in the dataset."
+                    )
+                    break
 
-            current_data = pd.concat([new_data, current_data], ignore_index=True)
-            current_data = delete_exclude_tickers(exclude_tickers, current_data)
+            new_data = pd.concat(new_pages, ignore_index=True) if new_pages else pd.DataFrame()
+            trading_sync.commit(new_data)
+            if not new_data.empty:
+                self.data_loader.refresh_derived_data()
             progress_bar.progress(100)
             status_text.text(
                 f"All {len(new_data)} new records from the internet saved to "
                 "senators_trading.csv"
             )
-            current_data.to_csv(
-                os.path.join("Data", "senators_trading.csv"), index=False
-            )
 
         except Exception as e:
             logging.error(
@@ -156,77 +185,135 @@ class Senators_Trading_Updater:
             )
 
     def fetch_data(self, page):
-        data = {
-            'action': 'get_congresstrading_table',
-            'page': page,
-            'limit': 10000,
-            'politician': '',
-            'ticker': ''
-        }
+        return self.page_fetcher.fetch_page(page)
 
-        try:
-            response = requests.post(self.url, data=data, headers=self.headers)
-            response.raise_for_status()
-            return response
-        except requests.RequestException as e:
-            logging.error(
-                f"An error occurred while fetching data from the server: {e}"
-            )
-            return None
+    def fetch_all_pages(self, reached_known=lambda: False):
+        """
+        Function that yields the parsed pages of the table in order. The first
+        page reports the number of pages, the following pages are downloaded
+        concurrently in windows of the worker count while they contain only
+        new trades. Once the consumer reports through reached_known that a page
+        contained stored trades, the pages are downloaded one at a time, so an
+        incremental update does not download a whole window of old pages.
+        """
+        response = self.fetch_data(1)
+        if response is None or response.status_code != 200:
+            yield 1, 1, None
+            return
+
+        response_json = response.json()
+        max_pages = response_json['total_pages']
+        yield 1, max_pages, response_json
+
+        page = 2
+        while page <= max_pages:
+            window_size = 1 if reached_known() else self.page_fetcher.workers
+            window = range(page, min(page + window_size, max_pages + 1))
+            for page, response in self.page_fetcher.fetch_pages(window):
+                if response is None or response.status_code != 200:
+                    yield page, max_pages, None
+                    return
 
-    def extract_row_data(self, row, exclude_tickers):
-        try:
-            ticker = row.select_one('td[data-title="Stock"]').contents[0].strip()
-            politician = row.select_one('td[data-title="Politician"] a').text.strip()
-            party = row.select_one('td[data-title="Politician"] abbr').text.strip()
-            chamber = row.select_one('td[data-title="Politician"] div small')\
-                .contents[-1].strip()
-            transaction = row.select_one('td[data-title="Transaction"] span')\
-                .text.strip().split()[0]
-            amount = row.select_one('td[data-title="Transaction"] div small')\
-                .text.strip()
-            traded_date = row.select_one('td[data-title="Traded"] div').text.strip()
-            filed_date = row.select_one('td[data-title="Filed"] div').text.strip()
-            row_data = pd.DataFrame([{
-                'Ticker': ticker,
-                'Politician': politician,
-                'Party': party,
-                'Chamber': chamber,
-                'Transaction': transaction,
-                'Amount': amount,
-                'Traded Date': traded_date,
-                'Filed Date': filed_date
-            }])
+                yield page, max_pages, response.json()
+            page = window.stop
 
-            return senators_data_preparation(row_data, exclude_tickers)
+    def extract_page_data(self, html_content, exclude_tickers):
+        """
+        Function that parses the table of one page with the selected parser
+        backend and cleans all its rows at once.
+        """
+        return self.prepare_page_data(self.table_parser(html_content), exclude_tickers)
 
-        except AttributeError as e:
-            logging.error(f"An error occurred while extracting data row: {e}")
+    def prepare_page_data(self, row_records, exclude_tickers):
+        row_records = [record for record in row_records if record is not None]
+        if not row_records:
             return pd.DataFrame()
 
+        page_data = senators_data_preparation(pd.DataFrame(row_records), exclude_tickers)
+
+        return page_data.reset_index(drop=True)
+
+
+# State of a Financial_Instruments_Updater pool worker, set once per process
+_instrument_worker = {}
+# Seconds between the progress updates while the pool works on a batch
+PROGRESS_INTERVAL = 0.5
+
+
+def init_instrument_worker(updater, processed=None):
+    """
+    Pool initializer that hands the updater to a worker process once, so the
+    tasks carry only the ticker. The workers count the processed tickers in
+    the shared processed value, which drives the progress bar.
+    """
+    _instrument_worker["updater"] = updater
+    _instrument_worker["processed"] = processed
+
+
+def count_processed(count=1):
+    """
+    Add processed tickers to the shared counter of the pool, if any.
+    """
+    processed = _instrument_worker.get("processed")
+    if processed is not None:
+        with processed.get_lock():
+            processed.value += count
 
-class Financial_Instruments_Updater:
-    def __init__(self):
-        self.data_loader = DataLoader()
 
-    def update_financial_instruments(self):
+def process_ticker_task(args):
+    """
+    Pool task that processes one ticker with the updater of the worker.
+    """
+    return _instrument_worker["updater"].process_ticker(args)
+
+
+def process_batch_task(args):
+    """
+    Pool task that processes one batch of tickers with the updater of the
+    worker. The tickers of the batch are returned with the results, as the
+    batches complete out of order.
+    """
+    return args[2], _instrument_worker["updater"].process_ticker_batch(args)
+
+
+class Financial_Instruments_Updater:
+    def __init__(self, rate_limiter=None, batch_size=50, metadata_ttls=None, data_dir="Data"):
+        """
+        All Yahoo Finance requests of the pool workers go through one shared
+        rate limiter, which also sizes the pool. The price histories are
+        downloaded for batch_size tickers per request. The info of a ticker is
+        fetched only when its metadata expired, metadata_ttls overrides the
+        time to live (in days) of the field groups. The datasets are stored in
+        data_dir.
+        """
+        self.data_loader = DataLoader(data_dir)
+        self.rate_limiter = rate_limiter or Rate_Limiter()
+        self.batch_size = max(1, batch_size)
+        self.metadata_ttls = metadata_ttls
+        self.refresh_points = {}
+        self.fresh_metadata = set()
+
+    def update_financial_instruments(self, checkpoint_size=250):
         """
         Function that updates the financial instruments dataset with a progress
-        bar using pooling.
+        bar using pooling. The results are saved every checkpoint_size tickers
+        and recorded in the run journal, so a restarted run skips the tickers
+        already processed this month.
         """
+        price_store = Price_Store(self.data_loader.data_dir)
         current_data = self.data_loader.load_financial_instruments()
-        senators_data = self.data_loader.load_senators_trading()
+        senators_data = self.data_loader.load_senators_trading(typed=True)
         exclude_tickers = self.data_loader.load_exclude_tickers()
 
         if current_data.empty:
             current_data = pd.DataFrame(columns=['Ticker'])
 
-        tickers = senators_data.Ticker.drop_duplicates()
+        tickers = to_legacy(senators_data[['Ticker']].drop_duplicates()).Ticker
         tickers = pd.concat([tickers, pd.Series(["^GSPC"])], ignore_index=True)
         tickers = fin_ticker_preparation(tickers, exclude_tickers)
-        tickers = [ticker for ticker in tickers if not is_data_up_to_date(
-            current_data, ticker
-        )]
+        month = current_month()
+        journal = Refresh_Journal(self.data_loader.data_dir, month)
+        tickers = journal.pending(price_store.stale_tickers(tickers, month))
         progress_bar = st.progress(0)
         status_text = st.empty()
         status_text.text(
@@ -236,79 +323,201 @@ class Financial_Instruments_Updater:
         )
 
         try:
-            with Pool(processes=2) as pool:
-                results = pool.map(self.process_ticker, [
-                    (index, len(tickers), ticker, current_data, exclude_tickers)
-                    for index, ticker in enumerate(tickers)
+            metadata_cache = Metadata_Cache(self.data_loader.data_dir, self.metadata_ttls)
+            known_tickers = set(current_data['Ticker'])
+            self.fresh_metadata = metadata_cache.fresh_tickers(
+                ticker for ticker in tickers if ticker in known_tickers
+            )
+            self.refresh_points = price_store.refresh_points()
+            self.rate_limiter.start_run()
+            batches = [tickers[start:start + self.batch_size]
+                       for start in range(0, len(tickers), self.batch_size)]
+            saved = 0
+            pending_results, pending_tickers = [], []
+            processed = Value("i", 0)
+            with Pool(processes=self.rate_limiter.max_concurrency,
+                      initializer=init_instrument_worker, initargs=(self, processed)) as pool:
+                batch_results = pool.imap_unordered(process_batch_task, [
+                    (index, len(batches), batch) for index, batch in enumerate(batches)
                 ])
-            if results:
-                valid_results, excluded_ticker_results = zip(*results)
-                valid_results = [
-                    result for result in valid_results if result is not None and not result.empty and is_data_up_to_date(result, result['Ticker'].values[0])
-                ]
-                progress_bar.progress(100)
-                excluded_ticker_dfs = [
-                    ex for ex in excluded_ticker_results if ex is not None and not ex.empty
-                ]
-                if excluded_ticker_dfs:
-                    new_excluded_tickers = pd.concat(
-                        excluded_ticker_dfs, ignore_index=True
-                    )
-                    new_excluded_tickers = new_excluded_tickers.drop_duplicates(
-                        subset=['Ticker']
-                    )
-                    new_excluded_tickers.to_csv(
-                        os.path.join("Data", "exclude_tickers.csv"), index=False
-                    )
+                while True:
+                    # The workers count every ticker, the progress advances
+                    # while a batch is still running
+                    try:
+                        batch, results = batch_results.next(timeout=PROGRESS_INTERVAL)
+                    except PoolTimeoutError:
+                        self.show_progress(progress_bar, status_text, processed.value, len(tickers))
+                        continue
+                    except StopIteration:
+                        break
+                    self.show_progress(progress_bar, status_text, processed.value, len(tickers))
+                    # A failed batch is left for the next run
+                    if results:
+                        pending_results.extend(results)
+                        pending_tickers.extend(batch)
+                    if len(pending_tickers) >= checkpoint_size:
+                        current_data, exclude_tickers, count = self.save_results(
+                            pending_results, month, price_store, metadata_cache,
+                            current_data, exclude_tickers
+                        )
+                        journal.record(pending_tickers)
+                        saved += count
+                        pending_results, pending_tickers = [], []
 
-                if valid_results:
-                    update_data = pd.concat(valid_results, ignore_index=True)
-                    current_data = pd.concat(
-                        [current_data, update_data], ignore_index=True, join='outer'
-                    )
-                    current_data = current_data.drop_duplicates(subset=['Ticker'])
-                    status_text.text(
-                        f"All {len(update_data)} new records from the internet "
-                        "loaded successfully and saved to financial_instruments.csv"
-                    )
-                    current_data.to_csv(
-                        os.path.join("Data", "financial_instruments.csv"),
-                        index=False
-                    )
-                else:
-                    status_text.text(
-                        f"All {len(valid_results)} new records from the internet "
-                        "loaded successfully and saved to financial_instruments.csv"
-                    )
+            current_data, exclude_tickers, count = self.save_results(
+                pending_results, month, price_store, metadata_cache, current_data, exclude_tickers
+            )
+            saved += count
+            if saved:
+                price_store.write_matrix()
+                self.data_loader.refresh_derived_data()
+            journal.clear()
+            progress_bar.progress(100)
+            if saved:
+                status_text.text(
+                    f"All {saved} new records from the internet "
+                    "loaded successfully and saved to financial_instruments.csv"
+                )
             else:
                 status_text.text("No new records were found.")
+            metrics = self.rate_limiter.metrics()
+            report = (
+                f"Yahoo Finance requests: {metrics['requests']} "
+                f"({metrics['throttled']} throttled) at "
+                f"{metrics['requests_per_second']:.2f} requests per second"
+            )
+            logging.info(report)
+            st.caption(report)
         except Exception as e:
             logging.error(f"An error occurred while updating financial instruments data, plaese repeat: {e}")
 
+    @staticmethod
+    def show_progress(progress_bar, status_text, processed, tickers):
+        """
+        Function that shows the number of processed tickers of the run.
+        """
+        progress_bar.progress(min(processed / tickers, 1.0))
+        status_text.text(f"Processed {processed}/{tickers} tickers")
+
+    def save_results(self, results, month, price_store, metadata_cache, current_data, exclude_tickers):
+        """
+        Function that saves a checkpoint of processed tickers: the new excluded
+        tickers, the price histories that reach the month and the refreshed
+        information of the instruments.
+
+        Returns:
+            tuple: The updated financial instruments and excluded tickers, and
+            the number of saved price histories.
+        """
+        if not results:
+            return current_data, exclude_tickers, 0
+
+        info_results, history_results, excluded_ticker_results = zip(*results)
+        histories = [history for history in history_results if not history.empty]
+        fetched_dates = last_dates(pd.concat(histories)) if histories else {}
+        valid_results = [
+            (info, history) for info, history in zip(info_results, history_results)
+            if not history.empty and fetched_dates.get(history['Ticker'].values[0]) == month
+        ]
+        excluded_ticker_dfs = [
+            ex for ex in excluded_ticker_results if ex is not None and not ex.empty
+        ]
+        if excluded_ticker_dfs:
+            exclude_tickers = pd.concat(
+                [exclude_tickers] + excluded_ticker_dfs, ignore_index=True
+            )
+            exclude_tickers = exclude_tickers.drop_duplicates(subset=['Ticker'])
+            self.data_loader.save("exclude_tickers", exclude_tickers)
+
+        if valid_results:
+            price_store.append(pd.concat([history for _, history in valid_results],
+                                         ignore_index=True))
+            # Tickers with fresh metadata come without info
+            update_data = pd.DataFrame(columns=['Ticker'])
+            info_results = [info for info, _ in valid_results if not info.empty]
+            if info_results:
+                update_data = pd.concat(info_results, ignore_index=True)
+            metadata_cache.mark_fetched(update_data['Ticker'])
+            metadata_cache.save()
+            current_data = pd.concat(
+                [current_data, update_data], ignore_index=True, join='outer'
+            )
+            current_data = current_data.drop_duplicates(subset=['Ticker'], keep='last')
+            self.data_loader.save("financial_instruments", current_data)
+
+        return current_data, exclude_tickers, len(valid_results)
+
     def process_ticker(self, args):
-        index, tickers, ticker, current_data, exclude_tickers = args
+        """
+        Function that downloads the information and the price history of one
+        ticker. The staleness of the ticker is decided by the caller. A ticker
+        without data is returned as a new excluded ticker.
+        """
+        index, tickers, ticker = args
         print(f"Processing ticker: {ticker} - {index + 1}/{tickers}")
-        if is_data_up_to_date(current_data, ticker):
-            return pd.DataFrame(), pd.DataFrame()
 
-        symbol_info = self.get_symbol_info(ticker)
+        symbol = yf.Ticker(ticker)
+        if ticker in self.fresh_metadata:
+            symbol_info = pd.DataFrame()
+        else:
+            symbol_info = self.get_symbol_info(ticker, symbol)
         if symbol_info is None:
-            exclude_tickers = add_to_exclude_tickers(ticker, exclude_tickers)
-            return pd.DataFrame(), exclude_tickers
+            return pd.DataFrame(), pd.DataFrame(), add_to_exclude_tickers(ticker, pd.DataFrame(columns=['Ticker']))
 
-        history = self.get_symbol_history(ticker)
+        history = self.get_symbol_history(ticker, symbol)
         if history is None:
-            exclude_tickers = add_to_exclude_tickers(ticker, exclude_tickers)
-            return pd.DataFrame(), exclude_tickers
+            return pd.DataFrame(), pd.DataFrame(), add_to_exclude_tickers(ticker, pd.DataFrame(columns=['Ticker']))
 
-        time.sleep(1.4)
+        return symbol_info, history, pd.DataFrame()
+
+    def process_ticker_batch(self, args):
+        """
+        Function that downloads the price histories of a batch of tickers in
+        one request, and then the information of the tickers with prices. If
+        the batch request fails, its tickers are left for the next run instead
+        of being excluded.
+        """
+        index, batches, tickers = args
+        if len(tickers) == 1:
+            result = self.process_ticker((index, batches, tickers[0]))
+            count_processed()
+            return [result]
+
+        print(f"Processing batch: {len(tickers)} tickers - {index + 1}/{batches}")
+        points = [self.refresh_points.get(ticker) for ticker in tickers]
+        start = min(point[0] for point in points) if all(points) else None
+        histories = self.get_batch_history(tickers, start)
+        if histories is None:
+            count_processed(len(tickers))
+            return []
+
+        results = []
+        for ticker, point in zip(tickers, points):
+            history = histories.get(ticker)
+            if start is not None and (history is None or not matches_refresh_point(history, point)):
+                history = self.get_symbol_history(ticker, full=True)
+            if history is None:
+                symbol_info = None
+            elif ticker in self.fresh_metadata:
+                symbol_info = pd.DataFrame()
+            else:
+                symbol_info = self.get_symbol_info(ticker)
+            if symbol_info is None:
+                results.append((pd.DataFrame(), pd.DataFrame(),
+                                add_to_exclude_tickers(ticker, pd.DataFrame(columns=['Ticker']))))
+            else:
+                results.append((symbol_info, history, pd.DataFrame()))
+            count_processed()
 
-        return pd.concat([symbol_info, history], axis=1), pd.DataFrame()
+        return results
 
-    def get_symbol_info(self, ticker):
+    def get_symbol_info(self, ticker, symbol=None):
         try:
-            symbol = yf.Ticker(ticker)
-            symbol_info = pd.json_normalize(symbol.info).dropna(how='all', axis=1)
+            symbol = symbol or yf.Ticker(ticker)
+            with self.rate_limiter.request() as request:
+                info = symbol.info
+                request.throttled = not info
+            symbol_info = pd.json_normalize(info).dropna(how='all', axis=1)
             symbol_info.insert(0, 'Ticker', ticker)
             symbol_info = fin_info_preparation(symbol_info)
 
@@ -324,15 +533,21 @@ class Financial_Instruments_Updater:
             logging.error(f"Unexpected error for {ticker}: {e}")
             return None
 
-    def get_symbol_history(self, ticker):
+    def get_symbol_history(self, ticker, symbol=None, full=False):
+        """
+        Function that downloads the monthly closes of a ticker. A stored
+        ticker gets only the months since its refresh point, the whole history
+        is downloaded for new tickers, with full=True, or when the refresh
+        point shows that a split or an adjustment changed the stored closes.
+        """
         try:
-            symbol = yf.Ticker(ticker)
-            history = symbol.history(period="max", interval="1mo").reset_index()
-
-            if history.empty:
-                return None
+            symbol = symbol or yf.Ticker(ticker)
+            refresh_point = None if full else self.refresh_points.get(ticker)
+            history = self.fetch_history(ticker, symbol, refresh_point[0] if refresh_point else None)
+            if refresh_point and (history is None or not matches_refresh_point(history, refresh_point)):
+                history = self.fetch_history(ticker, symbol)
 
-            return fin_history_preparation(history).set_index('Date').T.reset_index(drop=True)
+            return history
 
         except RequestException as e:
             logging.error(f"Error fetching history for {ticker}: {e}")
@@ -341,24 +556,112 @@ class Financial_Instruments_Updater:
             logging.error(f"Unexpected error for {ticker}: {e}")
             return None
 
+    def fetch_history(self, ticker, symbol, start=None):
+        """
+        Function that downloads the monthly closes of a ticker from the start
+        date, or the whole history, as long rows.
+        """
+        with self.rate_limiter.request() as request:
+            if start is None:
+                history = symbol.history(period="max", interval="1mo").reset_index()
+            else:
+                history = symbol.history(start=start, interval="1mo").reset_index()
+            request.throttled = history.empty
+
+        if history.empty:
+            return None
+
+        history = fin_history_preparation(history)
+        history.insert(0, 'Ticker', ticker)
+
+        return history[['Ticker', 'Date', 'Close']].reset_index(drop=True)
+
+    def get_batch_history(self, tickers, start=None):
+        """
+        Function that downloads the monthly closes of several tickers in one
+        request, from the start date or the whole history, and splits them
+        into the long rows of every ticker. Tickers without prices are missing
+        from the result, None means the request failed.
+        """
+        try:
+            period = {"period": "max"} if start is None else {"start": start}
+            with self.rate_limiter.request() as request:
+                data = yf.download(list(tickers), interval="1mo", auto_adjust=True,
+                                   progress=False, threads=False, **period)
+                request.throttled = data is None or data.empty
+            if data is None or data.empty:
+                return None
+
+            closes = data["Close"]
+            if isinstance(closes, pd.Series):
+                closes = closes.to_frame(tickers[0])
+
+            histories = {}
+            for ticker in closes.columns:
+                history = closes[ticker].dropna().rename("Close").rename_axis("Date").reset_index()
+                if history.empty:
+                    continue
+                history = fin_history_preparation(history)
+                history.insert(0, 'Ticker', ticker)
+                histories[ticker] = history[['Ticker', 'Date', 'Close']].reset_index(drop=True)
+
+            return histories
+
+        except Exception as e:
+            logging.error(f"Error fetching the history batch {', '.join(tickers)}: {e}")
+            return None
+
 
 class Senators_Information_Updater:
-    def __init__(self):
-        self.data_loader = DataLoader()
+    def __init__(self, max_workers=8, cache_ttl=30, data_dir="Data"):
+        """
+        The Wikipedia pages are fetched by max_workers threads. A resolved
+        politician is checked for a new page revision cache_ttl days after it
+        was fetched. The datasets are stored in data_dir.
+        """
+        self.data_loader = DataLoader(data_dir)
+        self.max_workers = max_workers
+        self.cache_ttl = cache_ttl
 
     def update_senators_information(self):
         """
-        Function that updates the senators' information dataset with
-        multiprocessing.
+        Function that updates the senators' information dataset with a thread
+        pool. Only new politicians, failed politicians with an expired cache
+        entry and pages with a new revision are fetched. Politicians with
+        stored information but no cache entry are seeded from their stored
+        link instead of being fetched again.
         """
-        senators_data = self.data_loader.load_senators_trading()
-        senators = senators_data.drop_duplicates(subset=['Politician'])[
+        senators_data = self.data_loader.load_senators_trading(typed=True)
+        senators = to_legacy(senators_data.drop_duplicates(subset=['Politician'])[
             ['Politician', 'Chamber']
-        ].reset_index(drop=True)
-        senator_info_args = [
-            (index, len(senators), row['Politician'], row['Chamber'])
-            for index, row in senators.iterrows()
-        ]
+        ]).reset_index(drop=True)
+        current_data = self.data_loader.load_senators_information()
+        cache = Wiki_Cache(self.data_loader.data_dir, self.cache_ttl)
+        cache.keep(current_data['Politician'])
+
+        politicians = senators['Politician'].tolist()
+        seeds = cache.seed_titles(current_data[current_data['Politician'].isin(politicians)])
+        expired = cache.expired(politicians)
+        titles = {politician: cache.title(politician) for politician in expired}
+        try:
+            revisions = fetch_revisions(
+                title for title in list(titles.values()) + list(seeds.values()) if title
+            )
+        except RequestException as e:
+            logging.error(f"Error fetching the revisions of the Wikipedia pages: {e}")
+            revisions = {}
+        # Stored politicians whose page still exists count as fetched now
+        for politician, title in seeds.items():
+            if title in revisions:
+                cache.record(politician, title, revisions[title])
+        unchanged = [politician for politician, title in titles.items()
+                     if title and revisions.get(title) == cache.entries.at[politician, 'Revision']]
+        cache.touch(unchanged)
+        fetch = set(cache.missing(politicians) + [
+            politician for politician in expired if politician not in unchanged
+        ])
+        senators = senators[senators['Politician'].isin(fetch)].reset_index(drop=True)
+
         progress_bar = st.progress(0)
         status_text = st.empty()
         status_text.text(
@@ -366,16 +669,61 @@ class Senators_Information_Updater:
             "Please wait..."
         )
 
-        with Pool(os.cpu_count() // 2) as pool:
-            results = pool.map(self.process_senator, senator_info_args)
-
-        current_data = pd.concat(results, ignore_index=True)
+        results = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self.process_senator, (index, len(senators), politician, chamber)): politician
+                for index, politician, chamber in senators[['Politician', 'Chamber']].itertuples()
+            }
+            for processed, future in enumerate(as_completed(futures), start=1):
+                result = future.result()
+                if result is None:
+                    cache.record(futures[future])
+                else:
+                    cache.record(futures[future], result['Title'].iloc[0], result['Revision'].iloc[0])
+                    results.append(result.drop(columns=['Title', 'Revision']))
+                progress_bar.progress(processed / len(senators))
+
+        if results:
+            new_data = pd.concat(results, ignore_index=True)
+            current_data = current_data[~current_data['Politician'].isin(new_data['Politician'])]
+            if not current_data.empty:
+                new_data = pd.concat([current_data, new_data], ignore_index=True)
+            current_data = new_data
+        if self.add_thumbnails(current_data) or results:
+            self.data_loader.save("senators_information", current_data)
+        cache.save()
         progress_bar.progress(100)
         status_text.text(f"All {len(results)} new records saved to senators_information.csv.")
-        current_data.to_csv(os.path.join("Data", "senators_information.csv"), index=False)
 
         return None
 
+    def add_thumbnails(self, data):
+        """
+        Function that creates the missing thumbnails of the profile pictures
+        with the thread pool and stores their paths in the Thumbnail column.
+        Returns the number of created thumbnails.
+        """
+        if 'Picture' not in data.columns:
+            return 0
+        if 'Thumbnail' not in data.columns:
+            data['Thumbnail'] = None
+
+        missing = [
+            (index, politician, picture) for index, politician, picture, thumbnail
+            in data[['Politician', 'Picture', 'Thumbnail']].itertuples()
+            if isinstance(picture, str) and not (isinstance(thumbnail, str) and os.path.exists(thumbnail))
+        ]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            thumbnails = list(executor.map(
+                lambda item: save_thumbnail(item[2], thumbnail_path(item[1], self.data_loader.data_dir)),
+                missing
+            ))
+        for (index, _, _), thumbnail in zip(missing, thumbnails):
+            data.at[index, 'Thumbnail'] = thumbnail
+
+        return sum(thumbnail is not None for thumbnail in thumbnails)
+
     def process_senator(self, args):
         index, senators, politician, chamber = args
         print(f"Processing senator: {politician} - {index + 1}/{senators}")
@@ -384,12 +732,18 @@ class Senators_Information_Updater:
             senator_page = wikipedia.page(f"{politician} (US {chamber} politician)")
             images = [img for img in senator_page.images if img.endswith(('png', 'jpg', 'svg'))]
             picture = get_profile_picture(images)
+            thumbnail = save_thumbnail(
+                picture, thumbnail_path(politician, self.data_loader.data_dir)
+            ) if picture else None
 
             return pd.DataFrame([{
                 "Politician": politician,
                 "Information": senator_page.summary,
                 "Link": senator_page.url,
-                "Picture": picture
+                "Picture": picture,
+                "Thumbnail": thumbnail,
+                "Title": senator_page.title,
+                "Revision": senator_page.revision_id
             }])
 
         except wikipedia.exceptions.DisambiguationError:
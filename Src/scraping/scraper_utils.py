@@ -2,10 +2,15 @@
 This module contains the help functions for scraper.py module
 """
 import os
+import json
+import tempfile
 import pandas as pd
 import numpy as np
 import logging
-from typing import List, Optional
+from typing import IO, TYPE_CHECKING, Any, Callable, List, Optional, Union
+
+if TYPE_CHECKING:
+    from Src.scraping.price_store import Price_Store
 
 
 def load_data(filepath: str, columns: List[str]) -> pd.DataFrame:
@@ -33,6 +38,44 @@ def load_data(filepath: str, columns: List[str]) -> pd.DataFrame:
         return pd.DataFrame(columns=columns)
 
 
+def replace_file(path: str, write: Callable[[IO[bytes]], object]) -> None:
+    """
+    Helper function to write a file atomically. The content is written to a
+    temporary file with a unique name in the same directory, which then
+    replaces the file, so concurrent writers never share a temporary file.
+
+    Args:
+        path (str): The path of the file.
+        write (Callable[[IO[bytes]], object]): Writes the content to the open
+        temporary file.
+    """
+    temporary = tempfile.NamedTemporaryFile(dir=os.path.dirname(path) or ".",
+                                            prefix=f"{os.path.basename(path)}.", suffix=".tmp",
+                                            delete=False)
+    try:
+        with temporary:
+            write(temporary)
+        os.replace(temporary.name, path)
+    except BaseException:
+        if os.path.exists(temporary.name):
+            os.remove(temporary.name)
+        raise
+
+
+def save_array(path: str, array: np.ndarray) -> None:
+    """
+    Helper function to replace a .npy file atomically with an array.
+    """
+    replace_file(path, lambda file: np.save(file, array))
+
+
+def save_json(path: str, data: Any) -> None:
+    """
+    Helper function to replace a JSON file atomically with data.
+    """
+    replace_file(path, lambda file: file.write(json.dumps(data).encode()))
+
+
 def get_last_current_data(current_data: pd.DataFrame) -> pd.DataFrame:
     """
     Retrieve the last row of the current data if it exists.
@@ -186,25 +229,33 @@ def fin_ticker_preparation(data: pd.DataFrame, exclude_tickers: pd.DataFrame) ->
     return data
 
 
-def is_data_up_to_date(current_data: pd.DataFrame, ticker: str) -> bool:
+def is_data_up_to_date(current_data: Union[pd.DataFrame, "Price_Store"], ticker: str) -> bool:
     """
     Check if the data for a given ticker is up-to-date.
 
     Parameters:
-    - current_data: A pandas DataFrame containing current financial instrument
-    data.
+    - current_data: The Price_Store of the financial instruments, whose
+    staleness index answers in constant time, or a pandas DataFrame containing
+    current financial instrument prices, either in the long layout (Ticker,
+    Date, Close) or in the wide layout with one column per month.
     - ticker: A string representing the stock ticker.
 
     Returns:
     - A boolean indicating whether the data is up-to-date.
     """
     try:
+        if not isinstance(current_data, pd.DataFrame):
+            return not current_data.stale_tickers([ticker])
+
         today = pd.Timestamp.today()
         first_day_current_month = today.replace(day=1)
         ticker_data = current_data[current_data["Ticker"] == ticker]
 
         if not ticker_data.empty:
-            last_date = ticker_data.columns[-1]
+            if "Date" in ticker_data.columns:
+                last_date = str(ticker_data["Date"].max())
+            else:
+                last_date = ticker_data.columns[-1]
             return last_date == first_day_current_month.strftime('%Y-%m-%d')
 
         return False
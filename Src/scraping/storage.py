@@ -0,0 +1,218 @@
+"""
+This module contains the storage backends of the DataLoader. The CSV files stay
+the import and export format, the Parquet backend keeps a columnar copy of every
+dataset with an explicit schema, so loading skips the CSV parsing and the dtype
+inference.
+"""
+import os
+import re
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from Src.scraping.scraper_utils import load_data, replace_file
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:  # pragma: no cover - pyarrow is an optional dependency
+    PARQUET_AVAILABLE = False
+
+STORAGE_ENV_VARIABLE = "SENATORS_STORAGE"
+PRICE_COLUMN_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# Explicit schema of the datasets, the columns not listed keep their dtype
+SCHEMAS: Dict[str, Dict[str, str]] = {
+    "senators_trading": {
+        "Ticker": "category",
+        "Politician": "category",
+        "Party": "category",
+        "Chamber": "category",
+        "Transaction": "category",
+        "Traded": "datetime64[ns]",
+        "Filed": "datetime64[ns]",
+        "Invested": "float64"
+    },
+    "financial_instruments": {
+        "Ticker": "category",
+        "quoteType": "category",
+        "sectorKey": "category",
+        "industryKey": "category",
+        "currency": "category",
+        "financialCurrency": "category"
+    },
+    "senators_information": {
+        "Politician": "category"
+    },
+    "politician_summary": {
+        "Politician": "category"
+    },
+    "exclude_tickers": {}
+}
+
+
+def apply_schema(data: pd.DataFrame, name: str) -> pd.DataFrame:
+    """
+    Cast the dataset to its explicit schema. Monthly price columns (named by
+    their date) are stored as float32.
+
+    Args:
+        data (pd.DataFrame): The dataset as loaded from the CSV file.
+        name (str): The name of the dataset, e.g. 'senators_trading'.
+
+    Returns:
+        pd.DataFrame: The dataset with categorical, datetime and float32
+        columns.
+    """
+    schema = SCHEMAS.get(name, {})
+    columns = {}
+    for column in data.columns:
+        dtype = schema.get(column)
+        if dtype == "datetime64[ns]":
+            columns[column] = pd.to_datetime(data[column], format="%Y-%m-%d", errors="coerce")
+        elif dtype is not None:
+            columns[column] = data[column].astype(dtype)
+        elif PRICE_COLUMN_PATTERN.match(str(column)):
+            columns[column] = pd.to_numeric(data[column], errors="coerce").astype(np.float32)
+        else:
+            columns[column] = data[column]
+
+    return pd.DataFrame(columns, index=data.index)
+
+
+def to_legacy(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a typed dataset to the representation of the CSV files, which the
+    pages and helpers work with: plain strings and ISO dates. The float32
+    prices are kept, since widening them would expose their rounding error.
+    """
+    columns = {}
+    for column in data.columns:
+        values = data[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            columns[column] = values.astype(values.cat.categories.dtype)
+        elif pd.api.types.is_datetime64_any_dtype(values):
+            # Format only the distinct dates, trades share few trading days
+            codes, dates = pd.factorize(values)
+            formatted = np.append(dates.strftime("%Y-%m-%d").to_numpy(dtype=object), np.nan)
+            columns[column] = pd.Series(formatted[codes], index=data.index, name=column)
+        else:
+            columns[column] = values
+
+    return pd.DataFrame(columns, index=data.index)
+
+
+class CSV_Storage:
+    extension = ".csv"
+
+    def __init__(self, data_dir: str):
+        self.data_dir = data_dir
+
+    def csv_path(self, name: str) -> str:
+        return os.path.join(self.data_dir, f"{name}.csv")
+
+    def read(self, name: str, columns: List[str], typed: bool = False) -> pd.DataFrame:
+        """
+        Function that loads a dataset from its CSV file.
+        """
+        data = load_data(self.csv_path(name), columns=columns)
+
+        return apply_schema(data, name) if typed else data
+
+    def write(self, name: str, data: pd.DataFrame) -> None:
+        """
+        Function that saves a dataset to its CSV file, which is replaced
+        atomically.
+        """
+        legacy_data = to_legacy(data)
+        replace_file(self.csv_path(name), lambda file: legacy_data.to_csv(file, index=False))
+
+
+class Parquet_Storage(CSV_Storage):
+    extension = ".parquet"
+
+    def parquet_path(self, name: str) -> str:
+        return os.path.join(self.data_dir, f"{name}.parquet")
+
+    def is_up_to_date(self, name: str) -> bool:
+        """
+        Function that checks whether the Parquet copy is at least as new as the
+        CSV file, which the updaters may have written in the meantime.
+        """
+        parquet_path = self.parquet_path(name)
+        csv_path = self.csv_path(name)
+        if not os.path.exists(parquet_path):
+            return False
+        if not os.path.exists(csv_path):
+            return True
+
+        return os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)
+
+    def read(self, name: str, columns: List[str], typed: bool = False) -> pd.DataFrame:
+        """
+        Function that loads a dataset from its Parquet copy. The copy is
+        (re)imported from the CSV file if it is missing or outdated.
+        """
+        try:
+            if self.is_up_to_date(name):
+                data = pd.read_parquet(self.parquet_path(name))
+            else:
+                data = self.import_csv(name, columns)
+        except Exception as e:
+            logging.error(f"Error loading {name}{self.extension}: {e}")
+            data = super().read(name, columns, typed=True)
+
+        return data if typed else to_legacy(data)
+
+    def import_csv(self, name: str, columns: List[str]) -> pd.DataFrame:
+        """
+        Function that imports the CSV file of a dataset into its Parquet copy.
+        """
+        data = super().read(name, columns, typed=True)
+        data.to_parquet(self.parquet_path(name), index=False)
+
+        return data
+
+    def write(self, name: str, data: pd.DataFrame) -> None:
+        """
+        Function that saves a dataset to its Parquet copy and exports it to the
+        CSV file.
+        """
+        super().write(name, data)
+        typed_data = apply_schema(data, name)
+        replace_file(self.parquet_path(name), lambda file: typed_data.to_parquet(file, index=False))
+
+
+STORAGE_BACKENDS = {
+    "csv": CSV_Storage,
+    "parquet": Parquet_Storage
+}
+
+
+def get_storage(name: Optional[str], data_dir: str) -> CSV_Storage:
+    """
+    Choose the storage backend of the DataLoader.
+
+    Args:
+        name (Optional[str]): The name of the backend ("csv" or "parquet"). If
+        not given, the SENATORS_STORAGE environment variable is used, and then
+        Parquet if pyarrow is installed.
+        data_dir (str): The directory with the datasets.
+
+    Returns:
+        CSV_Storage: The storage backend.
+    """
+    name = name or os.environ.get(STORAGE_ENV_VARIABLE)
+    if name is None:
+        name = "parquet" if PARQUET_AVAILABLE else "csv"
+    if name not in STORAGE_BACKENDS:
+        raise ValueError(
+            f"Unknown storage backend '{name}', choose one of {', '.join(STORAGE_BACKENDS)}."
+        )
+    if name == "parquet" and not PARQUET_AVAILABLE:
+        logging.error("The pyarrow package is not installed, using the CSV storage.")
+        name = "csv"
+
+    return STORAGE_BACKENDS[name](data_dir)
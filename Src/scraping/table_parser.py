@@ -0,0 +1,304 @@
+"""
+This module contains the parser backends for the senators trading table. Every
+backend turns the HTML payload of one page into plain records with the eight
+raw fields of a trade. The backend is chosen at runtime, the C-backed lxml
+backend is preferred and the streaming tokenizer is used when lxml is missing.
+"""
+import os
+import logging
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+except ImportError:  # pragma: no cover - lxml is an optional dependency
+    lxml = None
+
+ROW_CLASS = "data-table__row"
+RECORD_FIELDS = ["Ticker", "Politician", "Party", "Chamber", "Transaction",
+                 "Amount", "Traded Date", "Filed Date"]
+PARSER_ENV_VARIABLE = "SENATORS_TABLE_PARSER"
+
+Record = Dict[str, str]
+
+
+def bs4_row_record(row) -> Optional[Record]:
+    """
+    Extract the raw fields of one BeautifulSoup table row.
+
+    Args:
+        row (bs4.element.Tag): The <tr> element of one trade.
+
+    Returns:
+        Optional[Record]: The raw fields of the trade, or None if the row does
+        not contain all of them.
+    """
+    try:
+        return {
+            'Ticker': row.select_one('td[data-title="Stock"]').contents[0].strip(),
+            'Politician': row.select_one('td[data-title="Politician"] a').text.strip(),
+            'Party': row.select_one('td[data-title="Politician"] abbr').text.strip(),
+            'Chamber': row.select_one('td[data-title="Politician"] div small')
+            .contents[-1].strip(),
+            'Transaction': row.select_one('td[data-title="Transaction"] span')
+            .text.strip().split()[0],
+            'Amount': row.select_one('td[data-title="Transaction"] div small')
+            .text.strip(),
+            'Traded Date': row.select_one('td[data-title="Traded"] div').text.strip(),
+            'Filed Date': row.select_one('td[data-title="Filed"] div').text.strip()
+        }
+
+    except (AttributeError, IndexError, TypeError) as e:
+        logging.error(f"An error occurred while extracting data row: {e}")
+        return None
+
+
+def parse_table_bs4(html_content: str) -> List[Record]:
+    """
+    Parse the table with BeautifulSoup and CSS selectors. This is the reference
+    backend, the other backends must return the same records.
+    """
+    soup = BeautifulSoup(html_content, 'html.parser')
+    records = [bs4_row_record(row) for row in soup.find_all('tr', class_=ROW_CLASS)]
+
+    return [record for record in records if record is not None]
+
+
+def lxml_row_record(row) -> Optional[Record]:
+    """
+    Extract the raw fields of one lxml table row with the same semantics as
+    bs4_row_record.
+    """
+    try:
+        stock = row.xpath('.//td[@data-title="Stock"]')[0]
+        politician = row.xpath('.//td[@data-title="Politician"]')[0]
+        transaction = row.xpath('.//td[@data-title="Transaction"]')[0]
+        chamber = politician.xpath('.//div//small')[0]
+        chamber_text = chamber[-1].tail if len(chamber) else chamber.text
+        if chamber_text is None:
+            raise AttributeError("chamber does not end with text")
+
+        return {
+            'Ticker': stock.text.strip(),
+            'Politician': politician.xpath('.//a')[0].text_content().strip(),
+            'Party': politician.xpath('.//abbr')[0].text_content().strip(),
+            'Chamber': chamber_text.strip(),
+            'Transaction': transaction.xpath('.//span')[0].text_content().strip().split()[0],
+            'Amount': transaction.xpath('.//div//small')[0].text_content().strip(),
+            'Traded Date': row.xpath('.//td[@data-title="Traded"]//div')[0].text_content().strip(),
+            'Filed Date': row.xpath('.//td[@data-title="Filed"]//div')[0].text_content().strip()
+        }
+
+    except (AttributeError, IndexError) as e:
+        logging.error(f"An error occurred while extracting data row: {e}")
+        return None
+
+
+def parse_table_lxml(html_content: str) -> List[Record]:
+    """
+    Parse the table with the C-backed lxml parser and XPath queries.
+    """
+    if lxml is None:
+        raise ImportError("The lxml parser backend requires the lxml package.")
+
+    document = lxml.html.fromstring(f"<html><body>{html_content}</body></html>")
+    rows = document.xpath(
+        f'//tr[contains(concat(" ", normalize-space(@class), " "), " {ROW_CLASS} ")]'
+    )
+    records = [lxml_row_record(row) for row in rows]
+
+    return [record for record in records if record is not None]
+
+
+class _Node:
+    """
+    Minimal element of the streaming tokenizer, built only inside the cells of
+    the trading rows.
+    """
+    __slots__ = ("tag", "children")
+
+    def __init__(self, tag: str):
+        self.tag = tag
+        self.children: List[Union["_Node", str]] = []
+
+    def text(self) -> str:
+        return "".join(child if isinstance(child, str) else child.text()
+                       for child in self.children)
+
+    def find(self, *tags: str) -> "_Node":
+        """
+        Find the first descendant matching the chain of tags, e.g. find("div",
+        "small") behaves like the CSS selector "div small".
+        """
+        for child in self.children:
+            if isinstance(child, str):
+                continue
+            if child.tag == tags[0]:
+                if len(tags) == 1:
+                    return child
+                try:
+                    return child.find(*tags[1:])
+                except AttributeError:
+                    pass
+            try:
+                return child.find(*tags)
+            except AttributeError:
+                pass
+
+        raise AttributeError(f"No element matching {' '.join(tags)}")
+
+
+class _Table_Tokenizer(HTMLParser):
+    """
+    Streaming tokenizer that keeps only the cells of the trading rows and emits
+    one record per row. Malformed markup is handled like the html.parser tree
+    builder of BeautifulSoup: an end tag closes the most recent open element
+    with its name and the elements opened inside it, a stray end tag is
+    ignored, and an unclosed row ends at the next row or at the end.
+    """
+    VOID_TAGS = {"br", "img", "input", "hr", "meta", "link", "wbr", "source"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.records: List[Record] = []
+        self.row_depth: Optional[int] = None
+        self.open: List[Tuple[str, Optional[_Node]]] = []
+        self.cells: Dict[str, _Node] = {}
+        self.stack: List[_Node] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.VOID_TAGS:
+            return self.handle_startendtag(tag, attrs)
+
+        node = None
+        classes = (dict(attrs).get("class") or "").split() if tag == "tr" else []
+        if ROW_CLASS in classes:
+            if self.row_depth is not None:
+                self.emit_record()
+            self.row_depth = len(self.open)
+            self.cells = {}
+        elif self.row_depth is not None:
+            title = dict(attrs).get("data-title") if tag == "td" else None
+            if (title is not None and title not in self.cells) or self.stack:
+                node = _Node(tag)
+            if self.stack and node is not None:
+                self.stack[-1].children.append(node)
+            if title is not None and title not in self.cells:
+                self.cells[title] = node
+
+        self.open.append((tag, node))
+        if node is not None:
+            self.stack.append(node)
+
+        return None
+
+    def handle_startendtag(self, tag, attrs):
+        if self.stack:
+            self.stack[-1].children.append(_Node(tag))
+
+    def handle_endtag(self, tag):
+        if tag in self.VOID_TAGS:
+            return None
+
+        # Well-formed markup closes the innermost element
+        index = len(self.open) - 1
+        if index < 0 or self.open[index][0] != tag:
+            for index in range(len(self.open) - 2, -1, -1):
+                if self.open[index][0] == tag:
+                    break
+            else:
+                return None
+
+        while len(self.open) > index:
+            _, node = self.open.pop()
+            if node is not None:
+                self.stack.pop()
+        if self.row_depth is not None and len(self.open) <= self.row_depth:
+            self.emit_record()
+            self.row_depth = None
+
+        return None
+
+    def close(self):
+        super().close()
+        if self.row_depth is not None:
+            self.emit_record()
+            self.row_depth = None
+
+    def handle_data(self, data):
+        if self.stack:
+            children = self.stack[-1].children
+            if children and isinstance(children[-1], str):
+                children[-1] += data
+            else:
+                children.append(data)
+
+    def emit_record(self):
+        try:
+            stock = self.cells["Stock"]
+            politician = self.cells["Politician"]
+            transaction = self.cells["Transaction"]
+            chamber = politician.find("div", "small").children[-1]
+            if not isinstance(stock.children[0], str) or not isinstance(chamber, str):
+                raise AttributeError("cell does not start or end with text")
+
+            self.records.append({
+                'Ticker': stock.children[0].strip(),
+                'Politician': politician.find("a").text().strip(),
+                'Party': politician.find("abbr").text().strip(),
+                'Chamber': chamber.strip(),
+                'Transaction': transaction.find("span").text().strip().split()[0],
+                'Amount': transaction.find("div", "small").text().strip(),
+                'Traded Date': self.cells["Traded"].find("div").text().strip(),
+                'Filed Date': self.cells["Filed"].find("div").text().strip()
+            })
+
+        except (AttributeError, IndexError, KeyError) as e:
+            logging.error(f"An error occurred while extracting data row: {e}")
+
+
+def parse_table_stream(html_content: str) -> List[Record]:
+    """
+    Parse the table with a streaming tokenizer that ignores everything except
+    the cells of the trading rows. It needs only the standard library.
+    """
+    tokenizer = _Table_Tokenizer()
+    tokenizer.feed(html_content)
+    tokenizer.close()
+
+    return tokenizer.records
+
+
+TABLE_PARSERS: Dict[str, Callable[[str], List[Record]]] = {
+    "bs4": parse_table_bs4,
+    "lxml": parse_table_lxml,
+    "stream": parse_table_stream
+}
+
+
+def get_table_parser(name: Optional[str] = None) -> Callable[[str], List[Record]]:
+    """
+    Choose the parser backend for the trading table.
+
+    Args:
+        name (Optional[str]): The name of the backend ("bs4", "lxml" or
+        "stream"). If not given, the SENATORS_TABLE_PARSER environment variable
+        is used, and then the fastest available backend.
+
+    Returns:
+        Callable[[str], List[Record]]: The parser function.
+    """
+    name = name or os.environ.get(PARSER_ENV_VARIABLE)
+    if name is None:
+        name = "lxml" if lxml is not None else "stream"
+    if name not in TABLE_PARSERS:
+        raise ValueError(
+            f"Unknown table parser '{name}', choose one of {', '.join(TABLE_PARSERS)}."
+        )
+    if name == "lxml" and lxml is None:
+        logging.error("The lxml package is not installed, using the stream parser.")
+        name = "stream"
+
+    return TABLE_PARSERS[name]
@@ -0,0 +1,178 @@
+"""
+This module contains the incremental synchronization of the senators trading
+dataset. Every trade gets a stable content hash, the hashes of the stored
+trades are kept on disk, and only unseen trades are added to the dataset.
+The dataset is saved through the DataLoader before the hash store is replaced,
+so a hash store older than the dataset is rebuilt on the next run.
+Identical trades may be reported more than once, so the hashes are counted:
+the n-th occurrence of a trade in the scraped listing is new if fewer than n
+copies of it are stored.
+"""
+import os
+import logging
+from collections import Counter
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from Src.scraping.scraper_utils import delete_exclude_tickers, replace_file
+
+HASH_COLUMNS = ["Ticker", "Politician", "Traded", "Filed", "Transaction",
+                "Invested"]
+
+
+def trade_hashes(data: pd.DataFrame) -> np.ndarray:
+    """
+    Compute a stable content hash for every trade in the dataset.
+
+    Args:
+        data (pd.DataFrame): The senators trading data, containing at least the
+        HASH_COLUMNS.
+
+    Returns:
+        np.ndarray: An array of uint64 hashes, one per row.
+    """
+    if data.empty:
+        return np.array([], dtype=np.uint64)
+
+    # Normalize the dtypes, so the hash of a scraped row equals the hash of the
+    # same row loaded from the CSV file
+    key_data = data[HASH_COLUMNS].astype(str)
+    key_data["Invested"] = data["Invested"].astype(float)
+
+    return pd.util.hash_pandas_object(key_data, index=False).to_numpy(dtype=np.uint64)
+
+
+class Trading_Sync:
+    def __init__(self, data_loader):
+        data_dir = data_loader.data_dir
+        self.data_loader = data_loader
+        self.data_path = os.path.join(data_dir, "senators_trading.csv")
+        self.hash_path = os.path.join(data_dir, "senators_trading_hashes.bin")
+        self.exclude_path = os.path.join(data_dir, "exclude_tickers.csv")
+        self.known_hashes = self.load_hashes()
+        self.seen_hashes: Counter[int] = Counter()
+        self.found_known = False
+
+    @staticmethod
+    def is_newer(path: str, other_path: str) -> bool:
+        """
+        Function that checks whether a file was modified after another file.
+        """
+        if not os.path.exists(path) or not os.path.exists(other_path):
+            return os.path.exists(path)
+        return os.path.getmtime(path) > os.path.getmtime(other_path)
+
+    def load_hashes(self) -> Counter[int]:
+        """
+        Function that loads the number of stored copies of every trade hash.
+        The hash store is rebuilt from the dataset if it is missing or older
+        than the dataset.
+        """
+        if os.path.exists(self.hash_path) and not self.is_newer(self.data_path, self.hash_path):
+            return Counter(map(int, np.fromfile(self.hash_path, dtype=np.uint64)))
+
+        return self.rebuild_hashes(self.data_loader.load_senators_trading())
+
+    def rebuild_hashes(self, current_data: pd.DataFrame) -> Counter[int]:
+        """
+        Function that rewrites the hash store from the given dataset.
+        """
+        if not set(HASH_COLUMNS).issubset(current_data.columns):
+            current_data = pd.DataFrame(columns=HASH_COLUMNS)
+
+        hashes = trade_hashes(current_data)
+        self.save_hashes(hashes)
+
+        return Counter(map(int, hashes))
+
+    def save_hashes(self, hashes: np.ndarray) -> None:
+        """
+        Function that replaces the hash store atomically with the given hashes.
+        """
+        replace_file(self.hash_path, lambda file: hashes.tofile(file))
+
+    def prune(self, exclude_tickers: pd.DataFrame) -> None:
+        """
+        Function that removes the trades of excluded tickers from the dataset.
+        The dataset is rewritten only if the exclusion list changed since the
+        last write of the dataset.
+        """
+        if not os.path.exists(self.data_path) or not self.is_newer(self.exclude_path, self.data_path):
+            return None
+
+        current_data = self.data_loader.load_senators_trading()
+        pruned_data = delete_exclude_tickers(exclude_tickers, current_data)
+        if len(pruned_data) != len(current_data):
+            self.data_loader.save("senators_trading", pruned_data)
+            self.known_hashes = self.rebuild_hashes(pruned_data)
+        else:
+            # Mark the dataset as checked against the current exclusion list
+            os.utime(self.data_path)
+            os.utime(self.hash_path)
+
+        return None
+
+    def new_records(self, page_data: pd.DataFrame) -> Tuple[pd.DataFrame, bool]:
+        """
+        Function that selects the trades of a page that are not stored yet.
+        The pages must be passed in the order of the listing, a trade is new
+        if it occurs more often in the pages so far than in the dataset.
+
+        Args:
+            page_data (pd.DataFrame): The cleaned trades of one page.
+
+        Returns:
+            Tuple[pd.DataFrame, bool]:
+                - The unseen trades of the page.
+                - Whether the page contained only already known trades.
+        """
+        if page_data.empty:
+            return page_data, False
+
+        hashes = pd.Series(trade_hashes(page_data))
+        occurrence = hashes.groupby(hashes).cumcount().to_numpy()
+        occurrence += np.fromiter((self.seen_hashes[h] for h in map(int, hashes)),
+                                  dtype=np.int64, count=len(hashes))
+        stored = np.fromiter((self.known_hashes[h] for h in map(int, hashes)),
+                             dtype=np.int64, count=len(hashes))
+        is_new = occurrence >= stored
+
+        self.seen_hashes.update(map(int, hashes))
+        self.found_known = self.found_known or not is_new.all()
+
+        return page_data[is_new], not is_new.any()
+
+    def has_known_records(self) -> bool:
+        """
+        Function that checks whether any page so far contained stored trades,
+        the following pages of the newest first listing are then likely known.
+        """
+        return self.found_known
+
+    def commit(self, new_data: pd.DataFrame) -> None:
+        """
+        Function that adds the new trades on top of the dataset, which is kept
+        newest first, and adds their hashes to the hash store once the dataset
+        is saved.
+        """
+        if new_data.empty:
+            return None
+
+        current_data = self.data_loader.load_senators_trading()
+        if not current_data.empty and set(new_data.columns) != set(current_data.columns):
+            logging.error(
+                "Stored senators trading columns do not match, rewriting "
+                "senators_trading.csv"
+            )
+        self.data_loader.save("senators_trading",
+                              pd.concat([new_data, current_data], ignore_index=True))
+
+        hashes = trade_hashes(new_data)
+        self.known_hashes.update(map(int, hashes))
+        self.save_hashes(np.fromiter(self.known_hashes.elements(), dtype=np.uint64))
+        self.seen_hashes = Counter()
+        self.found_known = False
+
+        return None
@@ -0,0 +1,163 @@
+"""
+This module contains the cache of the politicians' Wikipedia pages. For every
+politician it stores the resolved page title and its revision, so resolved
+politicians cost no request until their entry expires, and an expired entry
+is fetched again only when the page has a new revision. Politicians whose
+information is already stored are seeded from their stored page link, so the
+first run with the cache does not fetch every page again.
+"""
+import os
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import unquote, urlparse
+
+import pandas as pd
+import requests
+
+from Src.scraping.scraper_utils import load_data
+
+WIKI_API_URL = "https://en.wikipedia.org/w/api.php"
+WIKI_PAGE_PATH = "/wiki/"
+CACHE_COLUMNS = ["Politician", "Title", "Revision", "Fetched"]
+
+
+def link_title(link: object) -> Optional[str]:
+    """
+    Extract the page title from the link of a Wikipedia page, e.g.
+    'https://en.wikipedia.org/wiki/John_Doe' -> 'John Doe'.
+
+    Args:
+        link (object): The stored link, NaN if it is missing.
+
+    Returns:
+        Optional[str]: The page title, None if the link is not a Wikipedia
+        page link.
+    """
+    if not isinstance(link, str):
+        return None
+
+    path = urlparse(link).path
+    if not path.startswith(WIKI_PAGE_PATH) or len(path) == len(WIKI_PAGE_PATH):
+        return None
+
+    return unquote(path[len(WIKI_PAGE_PATH):]).replace("_", " ")
+
+
+def fetch_revisions(titles: Iterable[str], batch_size: int = 50) -> Dict[str, int]:
+    """
+    Look up the current revisions of Wikipedia pages, with one request per
+    batch_size titles.
+
+    Args:
+        titles (Iterable[str]): The page titles.
+        batch_size (int): The number of titles per request, at most 50 for
+        the MediaWiki API.
+
+    Returns:
+        Dict[str, int]: The revision of every existing page by its title.
+    """
+    titles = list(titles)
+    revisions = {}
+    for start in range(0, len(titles), batch_size):
+        response = requests.get(WIKI_API_URL, params={
+            "action": "query", "prop": "revisions", "rvprop": "ids", "format": "json",
+            "formatversion": 2, "titles": "|".join(titles[start:start + batch_size])
+        }, headers={"User-Agent": "Senators-trading"}, timeout=30)
+        response.raise_for_status()
+        for page in response.json().get("query", {}).get("pages", []):
+            if page.get("revisions"):
+                revisions[page["title"]] = page["revisions"][0]["revid"]
+
+    return revisions
+
+
+class Wiki_Cache:
+    def __init__(self, data_dir: str = "Data", ttl: float = 30,
+                 clock: Callable[[], pd.Timestamp] = pd.Timestamp.now):
+        """
+        An entry expires ttl days after it was fetched or confirmed. An entry
+        without a title records a politician whose page was not found.
+        """
+        self.path = os.path.join(data_dir, "senators_information_cache.csv")
+        self.ttl = pd.Timedelta(days=ttl)
+        self.clock = clock
+        self.entries = self.load()
+
+    def load(self) -> pd.DataFrame:
+        """
+        Function that loads the cache entries, indexed by politician.
+        """
+        entries = load_data(self.path, columns=CACHE_COLUMNS).reindex(columns=CACHE_COLUMNS)
+        entries = entries.drop_duplicates(subset=["Politician"], keep="last").set_index("Politician")
+        entries["Fetched"] = pd.to_datetime(entries["Fetched"], errors="coerce")
+
+        return entries
+
+    def missing(self, politicians: Iterable[str]) -> List[str]:
+        """
+        Function that returns the politicians without a cache entry.
+        """
+        return [politician for politician in politicians if politician not in self.entries.index]
+
+    def expired(self, politicians: Iterable[str]) -> List[str]:
+        """
+        Function that returns the politicians whose cache entry expired.
+        """
+        fresh = set(self.entries.index[self.clock() - self.entries["Fetched"] <= self.ttl])
+
+        return [politician for politician in politicians
+                if politician in self.entries.index and politician not in fresh]
+
+    def seed_titles(self, information: pd.DataFrame) -> Dict[str, str]:
+        """
+        Function that returns the page titles, taken from the stored links, of
+        the politicians whose information is stored complete but who have no
+        cache entry. They are recorded once the revisions of the pages are
+        known.
+        """
+        if not {"Information", "Link"}.issubset(information.columns):
+            return {}
+
+        complete = information[information["Information"].notna()]
+        titles = {politician: link_title(link) for politician, link
+                  in complete[["Politician", "Link"]].itertuples(index=False)}
+
+        return {politician: title for politician, title in titles.items()
+                if title and politician not in self.entries.index}
+
+    def title(self, politician: str) -> Optional[str]:
+        """
+        Function that returns the page title of a politician, None if the
+        page was not found.
+        """
+        title = self.entries.at[politician, "Title"]
+
+        return None if pd.isna(title) else str(title)
+
+    def keep(self, politicians: Iterable[str]) -> None:
+        """
+        Function that drops the entries of resolved politicians that are not
+        among the politicians, e.g. when their information was not stored.
+        """
+        politicians = set(politicians)
+        resolved = self.entries["Title"].notna()
+        self.entries = self.entries[~resolved | self.entries.index.isin(politicians)]
+
+    def record(self, politician: str, title: Optional[str] = None,
+               revision: Optional[int] = None) -> None:
+        """
+        Function that records the fetched page of a politician, or a missing
+        page without title.
+        """
+        self.entries.loc[politician, ["Title", "Revision", "Fetched"]] = [title, revision, self.clock()]
+
+    def touch(self, politicians: Iterable[str]) -> None:
+        """
+        Function that renews the entries whose page has not changed.
+        """
+        self.entries.loc[list(politicians), "Fetched"] = self.clock()
+
+    def save(self) -> None:
+        """
+        Function that saves the cache entries.
+        """
+        self.entries.reset_index().to_csv(self.path, index=False, date_format="%Y-%m-%dT%H:%M:%S")
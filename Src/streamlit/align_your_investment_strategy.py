@@ -4,12 +4,12 @@ Investment Strategy page.
 """
 import streamlit as st
 import pandas as pd
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
-from Src.scraping.scraper import DataLoader
+from Src.clustering.allocations import Allocation_Matrix
+from Src.clustering.cluster import Strategy_Clusters
+from Src.streamlit.data_layer import get_data_layer
 from Src.visualization.graphs_align_investment import Pie_Chart_Align_Investment
-from Src.visualization.tables import data_for_strategy_align_type, \
-    data_for_strategy_align_sector
 
 
 def load_and_merge_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
@@ -25,31 +25,28 @@ def load_and_merge_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
             - DataFrame with instruments excluding 'Unknown'
             (`data_instruments`).
     """
-    data_senators = DataLoader().load_senators_trading()
-    data_instruments = DataLoader().load_financial_instruments()
-    columns_to_keep = [
-        "Ticker",
-        "city",
-        "country",
-        "industryKey",
-        "sectorKey",
-        "longBusinessSummary",
-        "currency",
-        "quoteType",
-        "shortName",
-        "longName",
-        "financialCurrency"
-    ]
-
-    data_instruments = data_instruments[columns_to_keep]
-    data = data_senators.merge(data_instruments, how="left", on="Ticker")
-    data = data.fillna("Unknown")
+    data = get_data_layer().merged_data()
     data_sector = data[data["sectorKey"] != "Unknown"]
     data_instruments = data[data["quoteType"] != "Unknown"]
 
     return data_sector, data_instruments
 
 
+def load_allocation_matrices() -> Tuple[Allocation_Matrix, Allocation_Matrix]:
+    """
+    This function loads the allocation matrices of the politicians, stored by
+    the updaters or built once per data version by the shared data layer.
+
+    Returns:
+        Tuple[Allocation_Matrix, Allocation_Matrix]:
+            - The allocations in the instrument types (`strategy_type`).
+            - The allocations in the equity sectors (`strategy_sector`).
+    """
+    data_layer = get_data_layer()
+
+    return data_layer.allocation_matrix("quoteType"), data_layer.allocation_matrix("sectorKey")
+
+
 def get_unique_sectors_and_instruments(data_instruments: pd.DataFrame,
                                        data_sector: pd.DataFrame) -> Tuple[List[str], List[str]]:
     """
@@ -66,24 +63,10 @@ def get_unique_sectors_and_instruments(data_instruments: pd.DataFrame,
             - List of unique sectors in the data (`list_of_unique_sectors`).
             - List of unique instruments in the data (`list_of_unique_instruments`).
     """
-    strategy_type = data_for_strategy_align_type(data_instruments)
-    strategy_sector = data_for_strategy_align_sector(data_sector)
-
-    list_of_unique_sectors = (
-        strategy_sector[strategy_sector["sectorKey"] != "Unknown"]["sectorKey"]
-        .dropna()
-        .unique()
-    )
-    list_of_unique_sectors = list(list_of_unique_sectors)
+    strategy_type = Allocation_Matrix.from_trades(data_instruments, "quoteType")
+    strategy_sector = Allocation_Matrix.from_trades(data_sector, "sectorKey")
 
-    list_of_unique_instruments = (
-        strategy_type[strategy_type["quoteType"] != "Unknown"]["quoteType"]
-        .dropna()
-        .unique()
-    )
-    list_of_unique_instruments = list(list_of_unique_instruments)
-
-    return list_of_unique_sectors, list_of_unique_instruments
+    return strategy_sector.categories, strategy_type.categories
 
 
 def chunk_list(lst: List[str], n: int):
@@ -101,8 +84,35 @@ def chunk_list(lst: List[str], n: int):
         yield lst[i: i + n]
 
 
+def strategy_style_message(clusters: Strategy_Clusters, cluster: int) -> str:
+    """
+    This function describes the trading style of the politicians of the
+    cluster whose centroid is the closest to the user's allocation.
+
+    Args:
+        clusters (Strategy_Clusters): The strategy clusters of the politicians.
+        cluster (int): The nearest cluster as returned by clustered_alignment.
+
+    Returns:
+        str: The message, empty if there is no cluster.
+    """
+    members = clusters.members(cluster) if cluster >= 0 else []
+    if not members:
+        return ""
+
+    centroid = pd.Series(clusters.centroids[cluster], index=clusters.categories)
+    if len(members) == 1:
+        style = f"the trading style of {members[0]}, who puts"
+    else:
+        style = (f"a trading style shared by {len(members)} politicians "
+                 f"(e.g. {', '.join(members[:3])}), who put on average")
+
+    return f"Your strategy is the closest to {style} {centroid.max():.1f} % into {centroid.idxmax()}."
+
+
 def equity_alignment_politician_sector(list_of_politicians, list_of_unique_sectors,
-                                       data_general, data_user):
+                                       data_general, data_user,
+                                       strategy_sector: Optional[Allocation_Matrix] = None):
     """
     Compare the investment strategies of a user and multiple politicians based
     on sector allocation. It evaluates the alignment of investments between the
@@ -117,23 +127,26 @@ def equity_alignment_politician_sector(list_of_politicians, list_of_unique_secto
     - data_general (pd.DataFrame): The general investment data of politicians,
     sector-wise.
     - data_user (pd.DataFrame): The user's investment data by sector.
+    - strategy_sector (Optional[Allocation_Matrix]): The sector allocations of
+    the politicians, built from data_general if not given.
 
     Returns:
     - None: Displays pie charts and textual information using Streamlit.
     """
     pie_chart_creator = Pie_Chart_Align_Investment(list_of_unique_sectors)
-    strategy_data = data_for_strategy_align_sector(data_general)
-    help_df = strategy_data.merge(data_user, how="left", on="sectorKey")
-    help_df["alignment"] = (
-        (1 - abs(help_df["Total Invested Sector"] - help_df["Invested by User"]) / help_df["Total Invested Sector"].replace(0, 1)).clip(lower=0)
-    )
+    if strategy_sector is None:
+        strategy_sector = Allocation_Matrix.from_trades(data_general, "sectorKey")
+    user = data_user.drop_duplicates(subset=["sectorKey"], keep="last")\
+        .set_index("sectorKey")["Invested by User"]
     tabs = st.tabs(list_of_politicians)
     for i, tab in enumerate(tabs):
         with tab:
             st.header(f"Comparison with {list_of_politicians[i]}")
 
-            info_table = help_df[help_df["Politician"] == list_of_politicians[i]]\
-                .sort_values(by="alignment", ascending=False)
+            allocation = strategy_sector.allocation(list_of_politicians[i])
+            info_table = (
+                (1 - abs(allocation - user.reindex(allocation.index)) / allocation.replace(0, 1)).clip(lower=0)
+            ).sort_values(ascending=False).rename("alignment").rename_axis("sectorKey").reset_index()
 
             # Display textual information about the most and least aligned sectors
             if not info_table.empty:
@@ -0,0 +1,282 @@
+"""
+This file contains the shared data layer of the Streamlit app. The datasets are
+loaded and merged once per process and kept in memory for all pages and
+reruns. The cache is dropped when a dataset file changes or when an updater
+publishes a new data version token.
+"""
+import os
+import time
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+import numpy as np
+import pandas as pd
+
+from Src.clustering.allocations import Allocation_Matrix
+from Src.clustering.cluster import Strategy_Clusters
+from Src.clustering.strategy_scan import Strategy_Scan
+from Src.scraping.scraper import DataLoader, DATA_VERSION_FILE
+from Src.scraping.politician_summary import build_politician_summary, load_politician_summary
+from Src.scraping.price_store import Price_Store, has_wide_prices
+from Src.streamlit.gain_engine import Price_Matrix
+
+DATASETS = ["senators_trading", "financial_instruments", "financial_prices",
+            "senators_information", "politician_summary"]
+T = TypeVar("T")
+INSTRUMENT_COLUMNS = [
+    "Ticker", "quoteType", "longName", "shortName", "city", "country",
+    "industryKey", "sectorKey", "longBusinessSummary", "financialCurrency",
+    "currency"
+]
+
+
+def row_ranges(values: pd.Series) -> Dict[Hashable, Tuple[int, int]]:
+    """
+    Map every value of a sorted column to the range of its rows.
+
+    Args:
+        values (pd.Series): The column, sorted so that equal values are
+        contiguous.
+
+    Returns:
+        Dict[Hashable, Tuple[int, int]]: The start and stop row of every value.
+    """
+    values = values.to_numpy()
+    if len(values) == 0:
+        return {}
+
+    starts = np.flatnonzero(np.concatenate([[True], values[1:] != values[:-1]]))
+    stops = np.append(starts[1:], len(values))
+
+    return {values[start]: (int(start), int(stop)) for start, stop in zip(starts, stops)}
+
+
+class Data_Layer:
+    def __init__(self, data_dir: str = "Data", check_interval: float = 1.0):
+        """
+        The cached frames are shared by all sessions, they must be treated as
+        read-only. The data files are checked for changes at most once per
+        check_interval seconds.
+        """
+        self.data_dir = data_dir
+        self.check_interval = check_interval
+        self.lock = threading.RLock()
+        self.frames: Dict[str, Any] = {}
+        self.version: Optional[Tuple] = None
+        self.checked_at = float("-inf")
+
+    def current_version(self) -> Tuple:
+        """
+        Function that returns the version of the data on disk: the
+        modification times of the dataset files and of the version token.
+        """
+        paths = [os.path.join(self.data_dir, f"{name}.csv") for name in DATASETS]
+        paths.append(os.path.join(self.data_dir, DATA_VERSION_FILE))
+
+        return tuple(os.stat(path).st_mtime_ns if os.path.exists(path) else None
+                     for path in paths)
+
+    def clear(self) -> None:
+        """
+        Function that drops all cached frames.
+        """
+        with self.lock:
+            self.frames = {}
+            self.version = None
+            self.checked_at = float("-inf")
+
+    def cached(self, key: str, build: Callable[[], T]) -> T:
+        """
+        Function that returns a cached frame, building it on the first access
+        after the data changed.
+        """
+        with self.lock:
+            now = time.monotonic()
+            if now - self.checked_at >= self.check_interval:
+                version = self.current_version()
+                if version != self.version:
+                    self.frames = {}
+                    self.version = version
+                self.checked_at = now
+
+            if key not in self.frames:
+                self.frames[key] = build()
+
+            return self.frames[key]
+
+    def senators_trading(self) -> pd.DataFrame:
+        return self.cached("senators_trading", lambda: DataLoader(self.data_dir).load_senators_trading())
+
+    def financial_instruments(self) -> pd.DataFrame:
+        def build():
+            if has_wide_prices(self.data_dir):
+                # The price store moves the legacy price columns out of the dataset
+                Price_Store(self.data_dir)
+            return DataLoader(self.data_dir).load_financial_instruments()
+
+        return self.cached("financial_instruments", build)
+
+    def senators_information(self) -> pd.DataFrame:
+        return self.cached("senators_information", lambda: DataLoader(self.data_dir).load_senators_information())
+
+    def price_matrix(self) -> Price_Matrix:
+        """
+        Function that returns the monthly prices of all instruments as a
+        memory-mapped matrix for the gain engine.
+        """
+        return self.cached("price_matrix", lambda: Price_Matrix.from_store(self.data_dir))
+
+    def merged_data(self) -> pd.DataFrame:
+        """
+        Function that returns the senators trading data merged with the
+        descriptive columns of the financial instruments, missing values are
+        filled with "Unknown". The rows are sorted by politician and trade
+        date, so the trades of a politician are a contiguous slice.
+        """
+        def build():
+            data_instruments = self.financial_instruments().reindex(columns=INSTRUMENT_COLUMNS)
+            data = self.senators_trading().merge(data_instruments, how="left", on="Ticker")
+            data = data.fillna("Unknown")
+            order = [column for column in ["Politician", "Traded"] if column in data.columns]
+            return data.sort_values(order, kind="stable").reset_index(drop=True) if order else data
+
+        return self.cached("merged_data", build)
+
+    def politician_rows(self, data: pd.DataFrame, selected_politician: str) -> pd.DataFrame:
+        """
+        Function that returns the trades of a politician. The cached merged
+        data is sliced by its politician -> row range index, which is built on
+        first use, other frames are filtered by a mask.
+        """
+        with self.lock:
+            if data is self.frames.get("merged_data") and "Politician" in data.columns:
+                if "politician_ranges" not in self.frames:
+                    self.frames["politician_ranges"] = row_ranges(data["Politician"])
+                start, stop = self.frames["politician_ranges"].get(selected_politician, (0, 0))
+                return data.iloc[start:stop]
+
+        return data[data["Politician"] == selected_politician]
+
+    def purchase_data(self) -> pd.DataFrame:
+        """
+        Function that returns the purchases merged with all columns of the
+        financial instruments and named by "Ticker - shortName".
+        """
+        def build():
+            data_senators = self.senators_trading()
+            data_senators = data_senators[data_senators['Transaction'] == 'Purchase'].reset_index(drop=True)
+            data_instruments = self.financial_instruments()
+            if "shortName" not in data_instruments.columns:
+                data_instruments = data_instruments.reindex(columns=INSTRUMENT_COLUMNS)
+            data = data_senators.merge(data_instruments, how="left", on="Ticker")
+            data = data.fillna("Unknown")
+            data["Name"] = data["Ticker"] + " - " + data["shortName"]
+            return data
+
+        return self.cached("purchase_data", build)
+
+    def politician_summary(self) -> pd.DataFrame:
+        """
+        Function that returns the per-politician summary indexed by
+        politician. The summary stored by the updaters is used if it was
+        built from the current datasets, else it is built from the merged
+        data.
+        """
+        def build():
+            summary = load_politician_summary(DataLoader(self.data_dir))
+            if summary is None:
+                summary = build_politician_summary(self.merged_data())
+            return summary.set_index("Politician")
+
+        return self.cached("politician_summary", build)
+
+    def allocation_matrix(self, join: str) -> Allocation_Matrix:
+        """
+        Function that returns the allocations of the politicians in the
+        categories of join ('quoteType' or 'sectorKey'). The matrix stored by
+        the updaters is used if it is as new as the datasets, else it is built
+        from the merged data.
+        """
+        def build():
+            matrix = Allocation_Matrix.load(self.data_dir, join)
+            return matrix if matrix is not None else Allocation_Matrix.from_trades(self.merged_data(), join)
+
+        return self.cached(f"allocation_{join}", build)
+
+    def strategy_clusters(self, join: str) -> Strategy_Clusters:
+        """
+        Function that returns the strategy clusters of the politicians in the
+        categories of join. The clusters stored by the updaters are used if
+        they were built from the current allocation matrix, else they are
+        built from it.
+        """
+        def build():
+            allocations = self.allocation_matrix(join)
+            clusters = Strategy_Clusters.load(self.data_dir, join)
+            if clusters is None or not clusters.matches(allocations):
+                clusters = Strategy_Clusters.from_allocations(allocations)
+            return clusters
+
+        return self.cached(f"strategy_clusters_{join}", build)
+
+    def strategy_scan(self, join: str) -> Strategy_Scan:
+        """
+        Function that returns the exact nearest-neighbour scan over the
+        allocations of the politicians in the categories of join.
+        """
+        return self.cached(f"strategy_scan_{join}", lambda: Strategy_Scan(self.allocation_matrix(join)))
+
+    def politician_information(self, selected_politician: str) -> Tuple:
+        """
+        Function that returns the information, Wikipedia link and picture of a
+        politician from an in-memory lookup table. The picture is the local
+        thumbnail if it exists, else the remote URL.
+        """
+        def build():
+            data = self.senators_information().reindex(
+                columns=["Politician", "Information", "Link", "Picture", "Thumbnail"]
+            )
+            data = data.drop_duplicates(subset=["Politician"])
+            return {
+                politician: (information, link,
+                             thumbnail if isinstance(thumbnail, str) and os.path.exists(thumbnail) else picture)
+                for politician, information, link, picture, thumbnail in data.itertuples(index=False)
+            }
+
+        return self.cached("politician_information", build).get(
+            selected_politician, (None, None, None)
+        )
+
+
+_data_layer: Optional[Data_Layer] = None
+_data_layer_lock = threading.Lock()
+
+
+def get_data_layer() -> Data_Layer:
+    """
+    Return the data layer shared by all pages and sessions of the process.
+
+    Returns:
+        Data_Layer: The process-wide data layer.
+    """
+    global _data_layer
+    with _data_layer_lock:
+        if _data_layer is None:
+            _data_layer = Data_Layer()
+
+    return _data_layer
+
+
+def politician_rows(data: pd.DataFrame, selected_politician: str) -> pd.DataFrame:
+    """
+    Return the trades of a politician, a slice of the rows for the merged
+    data of the shared data layer.
+
+    Args:
+        data (pd.DataFrame): The trades with a 'Politician' column.
+        selected_politician (str): The name of the politician.
+
+    Returns:
+        pd.DataFrame: The trades of the politician.
+    """
+    return get_data_layer().politician_rows(data, selected_politician)
@@ -0,0 +1,125 @@
+"""
+This file contains the vectorized gain engine of the Instrument Finder page.
+The monthly prices of all instruments are held in one NumPy matrix, and the
+gains of many trades are computed in a single pass over arrays of (ticker,
+traded month) pairs. The matrix is memory-mapped from the price store, so it
+is read without parsing and shared by processes through the OS cache.
+"""
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from Src.scraping.price_store import (long_to_matrix, month_labels,
+                                      month_numbers, open_price_matrix)
+
+BENCHMARK_TICKER = "^GSPC"
+
+
+class Price_Matrix:
+    def __init__(self, tickers: Iterable[str], first_month: int, prices: np.ndarray):
+        """
+        The prices are a (tickers x months) matrix with NaN for missing months.
+        The columns are consecutive months starting with the month number
+        first_month (months since the year 0).
+        """
+        self.tickers = list(tickers)
+        self.rows = {ticker: row for row, ticker in enumerate(self.tickers)}
+        self.first_month = first_month
+        self.prices = prices
+        self._last_prices: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_long(cls, prices: pd.DataFrame) -> "Price_Matrix":
+        """
+        Function that builds the matrix in memory from the (Ticker, Date,
+        Close) rows of the price store.
+        """
+        return cls(*long_to_matrix(prices))
+
+    @classmethod
+    def from_store(cls, data_dir: str = "Data") -> "Price_Matrix":
+        """
+        Function that memory-maps the matrix exported by the price store.
+        """
+        return cls(*open_price_matrix(data_dir))
+
+    @property
+    def months(self) -> pd.Index:
+        return pd.Index(month_labels(self.first_month, self.prices.shape[1]))
+
+    @property
+    def last_prices(self) -> np.ndarray:
+        """
+        The most recent known price of every ticker, computed on first use.
+        """
+        if self._last_prices is None:
+            self._last_prices = self.last_valid_prices()
+        return self._last_prices
+
+    def last_valid_prices(self) -> np.ndarray:
+        """
+        Function that returns the most recent known price of every ticker.
+        """
+        if self.prices.size == 0:
+            return np.full(len(self.tickers), np.nan)
+
+        known = ~np.isnan(self.prices)
+        last_month = self.prices.shape[1] - 1 - known[:, ::-1].argmax(axis=1)
+        last_prices = self.prices[np.arange(len(self.tickers)), last_month]
+
+        return np.where(known.any(axis=1), last_prices, np.nan).astype(np.float64)
+
+    def row_indices(self, tickers: Iterable[str]) -> np.ndarray:
+        """
+        Function that returns the rows of the tickers, -1 for unknown tickers.
+        """
+        return np.array([self.rows.get(ticker, -1) for ticker in tickers], dtype=np.int64)
+
+    def column_indices(self, traded: Iterable[str]) -> np.ndarray:
+        """
+        Function that returns the columns of the months of the trade dates,
+        -1 for dates outside of the matrix.
+        """
+        columns = month_numbers(traded) - self.first_month
+        valid = (columns >= 0) & (columns < self.prices.shape[1])
+
+        return np.where(valid, np.nan_to_num(columns), -1).astype(np.int64)
+
+    def history(self, ticker: str) -> pd.Series:
+        """
+        Function that returns the known monthly prices of a ticker indexed by
+        month.
+        """
+        row = self.rows.get(ticker)
+        if row is None:
+            return pd.Series(dtype=np.float64)
+
+        return pd.Series(np.asarray(self.prices[row], dtype=np.float64), index=self.months).dropna()
+
+    def gains(self, tickers: Iterable[str], traded: Iterable[str]) -> np.ndarray:
+        """
+        Function that computes the gain in percent from the month of every
+        trade to the last known price. Unknown tickers or months give NaN.
+        """
+        rows = self.row_indices(tickers)
+        columns = self.column_indices(traded)
+        valid = (rows >= 0) & (columns >= 0)
+
+        buy_prices = np.full(len(rows), np.nan)
+        current_prices = np.full(len(rows), np.nan)
+        buy_prices[valid] = self.prices[rows[valid], columns[valid]]
+        current_prices[valid] = self.last_prices[rows[valid]]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.round(100 * ((current_prices / buy_prices) - 1), 2)
+
+    def trade_gains(self, tickers: Iterable[str], traded: Iterable[str],
+                    benchmark: str = BENCHMARK_TICKER) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Function that computes the gains of the traded instruments and of the
+        benchmark over the same periods.
+        """
+        traded = list(traded)
+
+        return self.gains(tickers, traded), self.gains([benchmark] * len(traded), traded)
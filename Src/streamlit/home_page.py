@@ -3,7 +3,7 @@ This file contains the helper code for the Streamlit app's Home page.
 """
 import pandas as pd
 
-from Src.scraping.scraper import DataLoader
+from Src.streamlit.data_layer import get_data_layer
 
 
 def general_information() -> tuple:
@@ -20,8 +20,8 @@ def general_information() -> tuple:
         first_transaction)
     """
     # Load the data
-    data_senators = DataLoader().load_senators_trading()
-    data_financial = DataLoader().load_financial_instruments()
+    data_senators = get_data_layer().senators_trading()
+    price_months = get_data_layer().price_matrix().months
 
     # Check if data is empty
     if data_senators.empty:
@@ -37,7 +37,7 @@ def general_information() -> tuple:
             data_senators['Transaction'] == 'Purchase']['Invested'].sum()
         first_transaction = data_senators['Traded'].astype(
             'datetime64[ns]').min().strftime('%Y')
-        last_update_fin = data_financial.columns[-1]
+        last_update_fin = price_months[-1] if len(price_months) else ""
         last_update_sen = pd.to_datetime(
             data_senators['Filed'], errors='coerce').max().strftime('%Y-%m-%d')
         last_update = max(last_update_fin, last_update_sen)
@@ -1,10 +1,10 @@
 """
 This file contains the helper code for the Instrument Finder page.
 """
-import streamlit as st
+import numpy as np
 import pandas as pd
 
-from Src.scraping.scraper import DataLoader
+from Src.streamlit.data_layer import get_data_layer
 
 
 def instrument_information(data, selected_instrument):
@@ -66,26 +66,14 @@ def market_gain(date, instrument):
 
     Returns:
         float or str: The percentage gain from the specified date to the current
-                      date. If an error occurs, returns "!unknown".
+                      date. If the price is not known, returns "Unknown".
     """
-    try:
-        financial_data = DataLoader().load_financial_instruments()
-        financial_data = financial_data[financial_data['Ticker'] == instrument]
-        start_date = f"{date[:-2]}01"
-        if start_date not in financial_data.columns:
-            return "Unknown"
-
-        buy_price = financial_data[start_date].values[0]
-        current_price = financial_data[financial_data.columns[financial_data.notna().iloc[0]].tolist()[-1]].values[0]
-
-        gain = round(100 * ((current_price / buy_price) - 1), 2)
-
-        return gain
-
-    except Exception as e:
-        st.error(f"Error processing {instrument}: {e}")
+    gain = get_data_layer().price_matrix().gains([instrument], [date])[0]
+    if np.isnan(gain):
         return "Unknown"
 
+    return gain
+
 
 def transform_data():
     """
@@ -94,12 +82,7 @@ def transform_data():
         list_of_instruments (numpy.ndarray): Sorted unique list of instrument names.
         data (pd.DataFrame): Transformed data containing merged information.
     """
-    data_senators = DataLoader().load_senators_trading()
-    data_instruments = DataLoader().load_financial_instruments()
-    data_senators = data_senators[data_senators['Transaction'] == 'Purchase'].reset_index(drop=True)
-    data = data_senators.merge(data_instruments, how="left", on="Ticker")
-    data = data.fillna("Unknown")
-    data["Name"] = data["Ticker"] + " - " + data["shortName"]
+    data = get_data_layer().purchase_data()
     list_of_instruments = data.Name.unique()
     list_of_instruments.sort()
 
@@ -119,8 +102,11 @@ def process_politician_data(instrument_data, politician):
     - politician_data (pd.DataFrame): The original unprocessed data for the politician.
     """
     politician_data = instrument_data[instrument_data['Politician'] == politician].reset_index(drop=True)
-    politician_data["Gain"] = politician_data.apply(lambda row: market_gain(row['Traded'], row['Ticker']), axis=1)
-    politician_data['S&P 500'] = politician_data.apply(lambda row: market_gain(row['Traded'], "^GSPC"), axis=1)
+    gains, benchmark_gains = get_data_layer().price_matrix().trade_gains(
+        politician_data['Ticker'], politician_data['Traded']
+    )
+    politician_data["Gain"] = gains
+    politician_data['S&P 500'] = benchmark_gains
     politician_data['Profit'] = (((politician_data['Gain'] / 100) + 1) * politician_data['Invested']).round(1)
 
     # Optimize DataFrame operations to avoid fragmentation
@@ -1,12 +1,15 @@
 """
 This file contains the helper code for the Streamlit app's Politician Finder.
 """
+from typing import Optional
+
 import pandas as pd
 import streamlit as st
 
 from Src.visualization.tables import top_five_purchased_stocks
 from Src.visualization.tables import top_five_sold_stocks
-from Src.scraping.scraper import DataLoader
+from Src.scraping.politician_summary import top_group
+from Src.streamlit.data_layer import get_data_layer, politician_rows
 
 
 def party_politician(data: pd.DataFrame, selected_politician: str) -> str:
@@ -26,18 +29,28 @@ def party_politician(data: pd.DataFrame, selected_politician: str) -> str:
     - Error handling should be added for invalid or missing politician names.
     """
     # Get information for interactive text
-    party_politician = data[data["Politician"] == selected_politician][
+    party_politician = politician_rows(data, selected_politician)[
         "Party"].unique()
 
+    return party_name(party_politician[0] if len(party_politician) else None)
+
+
+def party_name(party: Optional[str]) -> str:
+    """
+    Returns the name of the political party of a 'Party' value: 'Republican
+    Party' for 'R', 'Democratic Party' for 'D' and 'Third Party' otherwise,
+    including a missing value.
+    """
+    if party is None:
+        return "Third Party"
+
     # Determine the party based on the value in the 'Party' column
-    if party_politician == "R":
-        party_politician = "Republican Party"
-    elif party_politician == "D":
-        party_politician = "Democratic Party"
-    else:
-        party_politician = "Third Party"
+    if party == "R":
+        return "Republican Party"
+    elif party == "D":
+        return "Democratic Party"
 
-    return party_politician
+    return "Third Party"
 
 
 def first_trade_politician(data: pd.DataFrame, selected_politician: str) -> str:
@@ -57,7 +70,7 @@ def first_trade_politician(data: pd.DataFrame, selected_politician: str) -> str:
     """
     # Get the date of the first trade by filtering the data for the selected
     # politician
-    first_trade_politician = data[data["Politician"] == selected_politician][
+    first_trade_politician = politician_rows(data, selected_politician)[
         "Traded"].min()
 
     return first_trade_politician
@@ -80,7 +93,7 @@ def last_trade_politician(data: pd.DataFrame, selected_politician: str) -> str:
     """
     # Get the date of the last trade by filtering the data for the selected
     # politician
-    last_trade_politician = data[data["Politician"] == selected_politician][
+    last_trade_politician = politician_rows(data, selected_politician)[
         "Traded"].max()
 
     return last_trade_politician
@@ -105,9 +118,8 @@ def total_invested_politician(data: pd.DataFrame, selected_politician: str) -> s
     """
     # Calculate total invested by the selected politician on purchase
     # transactions
-    total_invested_politician = data[
-        (data["Politician"] == selected_politician) & (data["Transaction"] == "Purchase")
-    ]["Invested"].sum()
+    trades = politician_rows(data, selected_politician)
+    total_invested_politician = trades[trades["Transaction"] == "Purchase"]["Invested"].sum()
 
     # Format the result for readability
     total_invested_politician = f"{total_invested_politician:,.0f}"
@@ -130,16 +142,11 @@ def total_sold_politician(data: pd.DataFrame, selected_politician: str) -> str:
     Note:
     - Error handling should be added for missing or incorrect politician names.
     """
-    help_df = data.copy()
-
-    # Reverse the 'Invested' value for sale transactions to ensure a negative
-    # total
-    help_df["Invested"] = -help_df["Invested"]
+    trades = politician_rows(data, selected_politician)
 
-    # Calculate total sold by the selected politician on sale transactions
-    total_sold_politician = help_df[
-        (help_df["Politician"] == selected_politician) & (help_df["Transaction"] == "Sale")
-    ]["Invested"].sum()
+    # Calculate total sold by the selected politician on sale transactions,
+    # the 'Invested' value is reversed to ensure a negative total
+    total_sold_politician = (-trades[trades["Transaction"] == "Sale"]["Invested"]).sum()
 
     # Format the result for readability
     total_sold_politician = f"{total_sold_politician:,.0f}"
@@ -164,25 +171,28 @@ def most_trade_type_politician(data: pd.DataFrame, selected_politician: str) ->
     - Returns a message about purchases if they exist; otherwise, indicates no
     purchases.
     """
-    try:
-        most_trade_type_politician = (data[
-            (data["Politician"] == selected_politician) & (data["Transaction"] == "Purchase")
-        ]
-            .groupby("quoteType", as_index=False)["Invested"]
-            .sum()
-            .sort_values(by="Invested", ascending=False)
-            .iloc[0]["quoteType"]
-        )
+    trades = politician_rows(data, selected_politician)
+    top_type = top_group(trades[trades["Transaction"] == "Purchase"], "quoteType")
 
-        message_1 = (
-            f"{selected_politician} invests the most often into "
-            f"{most_trade_type_politician}"
-        )
-    except Exception:
-        message_1 = (f"{selected_politician} has not performed any purchases "
-                     "during documented time period.")
+    return trade_type_message(
+        selected_politician, top_type["quoteType"].iloc[0] if not top_type.empty else None
+    )
+
+
+def trade_type_message(selected_politician: str, quote_type: Optional[str]) -> str:
+    """
+    Returns the message about the trade type the politician invests the most
+    in, quote_type is None (or NaN in the stored summary) for politicians
+    without purchases.
+    """
+    if quote_type is None or pd.isna(quote_type):
+        return (f"{selected_politician} has not performed any purchases "
+                "during documented time period.")
 
-    return message_1
+    return (
+        f"{selected_politician} invests the most often into "
+        f"{quote_type}"
+    )
 
 
 def most_traded_volume_politician(data: pd.DataFrame, selected_politician: str) -> str:
@@ -202,25 +212,24 @@ def most_traded_volume_politician(data: pd.DataFrame, selected_politician: str)
     - Returns the amount purchased for the most traded instrument or an empty
     string if no data is available.
     """
-    try:
-        most_traded_volume_politician = (data[
-            (data["Politician"] == selected_politician) & (data["Transaction"] == "Purchase")
-        ]
-            .groupby("quoteType", as_index=False)["Invested"]
-            .sum()
-            .sort_values(by="Invested", ascending=False)
-            .iloc[0]["Invested"]
-        )
-        most_traded_volume_politician = f"{most_traded_volume_politician:,.0f}"
+    trades = politician_rows(data, selected_politician)
+    top_type = top_group(trades[trades["Transaction"] == "Purchase"], "quoteType")
 
-        message_2 = (
-            f"with the total average amount purchased of "
-            f"{most_traded_volume_politician} USD."
-        )
-    except Exception:
-        message_2 = ""
+    return trade_volume_message(top_type["Invested"].iloc[0] if not top_type.empty else None)
 
-    return message_2
+
+def trade_volume_message(volume: Optional[float]) -> str:
+    """
+    Returns the message about the amount purchased in the most traded
+    instrument, or an empty string if the volume is None or NaN.
+    """
+    if volume is None or pd.isna(volume):
+        return ""
+
+    return (
+        f"with the total average amount purchased of "
+        f"{volume:,.0f} USD."
+    )
 
 
 def most_traded_sector_politician(data: pd.DataFrame, selected_politician: str) -> str:
@@ -240,42 +249,30 @@ def most_traded_sector_politician(data: pd.DataFrame, selected_politician: str)
     - Returns a message about equity investments in a sector if available;
     otherwise, indicates no data.
     """
-    try:
-        most_traded_sector_politician = (data[
-            (data["Politician"] == selected_politician) & (data["Transaction"] == "Purchase") & (data["quoteType"] == "EQUITY")
-        ]
-            .groupby("sectorKey", as_index=False)["Invested"]
-            .sum()
-            .sort_values(by="Invested", ascending=False)
-            .iloc[0]["sectorKey"]
-        )
-    except Exception:
-        most_traded_sector_politician = "Empty"
-
-    try:
-        most_traded_sector_volume = (data[
-            (data["Politician"] == selected_politician) & (data["Transaction"] == "Purchase") & (data["quoteType"] == "EQUITY")
-        ]
-            .groupby("sectorKey", as_index=False)["Invested"]
-            .sum()
-            .sort_values(by="Invested", ascending=False)
-            .iloc[0]["Invested"]
-        )
-        most_traded_sector_volume = f"{most_traded_sector_volume:,.0f}"
-
-    except Exception:
-        most_traded_sector_volume = "Empty"
-
-    if most_traded_sector_politician == "Empty":
-        message_3 = "They have not invested in EQUITY either."
-    else:
-        message_3 = (
-            f"When it comes to EQUITY, this politician mostly invests in "
-            f"{most_traded_sector_politician} with the total average volume "
-            f"invested of {most_traded_sector_volume} USD."
-        )
+    trades = politician_rows(data, selected_politician)
+    top_sector = top_group(trades[
+        (trades["Transaction"] == "Purchase") & (trades["quoteType"] == "EQUITY")
+    ], "sectorKey")
+    if top_sector.empty:
+        return traded_sector_message(None, None)
 
-    return message_3
+    return traded_sector_message(top_sector["sectorKey"].iloc[0], top_sector["Invested"].iloc[0])
+
+
+def traded_sector_message(sector: Optional[str], volume: Optional[float]) -> str:
+    """
+    Returns the message about the most traded sector of the equity purchases
+    and its volume, both are None (or NaN in the stored summary) for
+    politicians without them.
+    """
+    if sector is None or volume is None or pd.isna(sector):
+        return "They have not invested in EQUITY either."
+
+    return (
+        f"When it comes to EQUITY, this politician mostly invests in "
+        f"{sector} with the total average volume "
+        f"invested of {volume:,.0f} USD."
+    )
 
 
 def most_sold_sector_politician(data: pd.DataFrame, selected_politician: str) -> str:
@@ -295,45 +292,36 @@ def most_sold_sector_politician(data: pd.DataFrame, selected_politician: str) ->
     - Returns a message about equity sales in a sector if available; otherwise,
     indicates no data.
     """
-    try:
-        most_sold_sector_politician = (data[
-            (data["Politician"] == selected_politician) & (data["Transaction"] == "Sale") & (data["quoteType"] == "EQUITY")
-        ]
-            .groupby("sectorKey", as_index=False)["Invested"]
-            .sum()
-            .sort_values(by="Invested", ascending=False)
-            .iloc[-1]["sectorKey"]
-        )
-    except Exception:
-        most_sold_sector_politician = "Empty"
-
-    try:
-        most_sold_sector_volume = (data[
-            (data["Politician"] == selected_politician) & (data["Transaction"] == "Sale") & (data["quoteType"] == "EQUITY")
-        ]
-            .groupby("sectorKey", as_index=False)["Invested"]
-            .sum()
-            .sort_values(by="Invested", ascending=False)
-            .iloc[-1]["Invested"]
-        )
+    trades = politician_rows(data, selected_politician)
+    top_sector = top_group(trades[
+        (trades["Transaction"] == "Sale") & (trades["quoteType"] == "EQUITY")
+    ], "sectorKey", largest=False)
+    if top_sector.empty:
+        return sold_sector_message(selected_politician, None, None)
+
+    return sold_sector_message(
+        selected_politician, top_sector["sectorKey"].iloc[0], top_sector["Invested"].iloc[0]
+    )
 
-        most_sold_sector_volume = f"{-most_sold_sector_volume:,.0f}"
-    except Exception:
-        most_sold_sector_volume = "Empty"
 
-    if most_sold_sector_politician == "Empty":
-        message_4 = (
+def sold_sector_message(selected_politician: str, sector: Optional[str],
+                        volume: Optional[float]) -> str:
+    """
+    Returns the message about the most sold sector of the equity sales and its
+    (negative) volume, both are None (or NaN in the stored summary) for
+    politicians without them.
+    """
+    if sector is None or volume is None or pd.isna(sector):
+        return (
             "They did not perform any sales of EQUITY during the documented "
             "time period."
         )
-    else:
-        message_4 = (
-            f"{selected_politician} sold EQUITY mostly in "
-            f"{most_sold_sector_politician} sector with the total average "
-            f"volume sold of {most_sold_sector_volume} USD."
-        )
 
-    return message_4
+    return (
+        f"{selected_politician} sold EQUITY mostly in "
+        f"{sector} sector with the total average "
+        f"volume sold of {-volume:,.0f} USD."
+    )
 
 
 def wikipedia_information(selected_politician: str) -> tuple:
@@ -355,17 +343,7 @@ def wikipedia_information(selected_politician: str) -> tuple:
       3. A string with the file path or URL of the politician's picture (or a
       default message if not available).
     """
-    data = DataLoader().load_senators_information()
-    data = data[data["Politician"] == selected_politician]
-
-    if data.empty:
-        return None, None, None
-
-    information = data["Information"].values[0]
-    link = data["Link"].values[0]
-    picture = data["Picture"].values[0]
-
-    return information, link, picture
+    return get_data_layer().politician_information(selected_politician)
 
 
 def chamber_politician(data: pd.DataFrame, selected_politician: str) -> str:
@@ -388,16 +366,71 @@ def chamber_politician(data: pd.DataFrame, selected_politician: str) -> str:
         - 'Senate' if the politician belongs to the Senate.
         - 'Unknown Chamber' if the chamber is not identified or found.
     """
-    chamber_politician = data[data["Politician"] == selected_politician][
+    chamber_politician = politician_rows(data, selected_politician)[
         "Chamber"].unique()
-    if chamber_politician == "House":
-        chamber_politician = "House of Representatives"
-    elif chamber_politician == "Senate":
-        chamber_politician = "Senate"
-    else:
-        chamber_politician = "Unknown Chamber"
 
-    return chamber_politician
+    return chamber_name(chamber_politician[0] if len(chamber_politician) else None)
+
+
+def chamber_name(chamber: Optional[str]) -> str:
+    """
+    Returns the full name of a 'Chamber' value, 'Unknown Chamber' if it is
+    missing or not known.
+    """
+    if chamber is None:
+        return "Unknown Chamber"
+
+    if chamber == "House":
+        return "House of Representatives"
+    elif chamber == "Senate":
+        return "Senate"
+
+    return "Unknown Chamber"
+
+
+def politician_summary(selected_politician: str) -> Optional[pd.Series]:
+    """
+    This function looks up the precomputed summary of a politician: party,
+    chamber, first and last trade, the totals purchased and sold and the most
+    traded instrument types and sectors.
+
+    Args:
+    - selected_politician (str): The name of the politician.
+
+    Returns:
+    - pd.Series: The summary row of the politician, or None if the politician
+    has no trades.
+    """
+    summary = get_data_layer().politician_summary()
+    if selected_politician not in summary.index:
+        return None
+
+    return summary.loc[selected_politician]
+
+
+def similar_politicians(selected_politician: str, join: str, k: int = 5) -> pd.DataFrame:
+    """
+    This function finds the politicians whose strategy is the most similar to
+    the strategy of a selected politician with the exact nearest-neighbour
+    scan over their allocations.
+
+    Args:
+    - selected_politician (str): The name of the politician.
+    - join (str): The categories of the allocations, 'quoteType' or
+    'sectorKey'.
+    - k (int): The maximal number of politicians.
+
+    Returns:
+    - pd.DataFrame: The politicians with their similarity in percent, the most
+    similar first. Politicians sharing no category are left out.
+    """
+    neighbours = get_data_layer().strategy_scan(join).query_politician(selected_politician, k)
+    neighbours = neighbours[neighbours["Similarity"] > 0]
+
+    return pd.DataFrame({
+        "Politician": neighbours["Politician"],
+        "Similarity (%)": (neighbours["Similarity"] * 100).round(1)
+    })
 
 
 def individual_invest_politician(data: pd.DataFrame, list: list,
@@ -457,7 +490,7 @@ def individual_sell_politician(data: pd.DataFrame, list: list,
     """
     message = []
 
-    if selected_politician not in data['Politician'].values:
+    if politician_rows(data, selected_politician).empty:
         raise ValueError(
             f"Politician '{selected_politician}' not found in the data."
         )
@@ -590,12 +623,9 @@ def five_days(data: pd.DataFrame, selected_politician: str) -> pd.DataFrame:
     - pandas.DataFrame: A DataFrame containing the top 5 most invested and the
     5 least invested stock trades, sorted by investment amount.
     """
-    help_df_purchase = data[
-        (data["Politician"] == selected_politician) & (data["Transaction"] == "Purchase")
-    ].copy()
-    help_df_sale = data[
-        (data["Politician"] == selected_politician) & (data["Transaction"] == "Sale")
-    ].copy()
+    trades = politician_rows(data, selected_politician)
+    help_df_purchase = trades[trades["Transaction"] == "Purchase"]
+    help_df_sale = trades[trades["Transaction"] == "Sale"]
 
     top_five = (
         help_df_purchase.groupby("Traded", as_index=False)["Invested"]
@@ -659,8 +689,9 @@ def most_active_purchase(data: pd.DataFrame, selected_politician: str) -> str:
 
         try:
             # Filter data for the most active purchase
-            help_df1 = data[
-                (data["Politician"] == selected_politician) & (data["Traded"] == most_active_purchase) & (data["Transaction"] == "Purchase")].copy()
+            trades = politician_rows(data, selected_politician)
+            help_df1 = trades[
+                (trades["Traded"] == most_active_purchase) & (trades["Transaction"] == "Purchase")]
 
             top_five_purchases = help_df1.groupby(
                 "quoteType", as_index=False
@@ -721,8 +752,9 @@ def most_active_sell(data: pd.DataFrame, selected_politician: str) -> str:
 
         try:
             # Filter data for the most active sale
-            help_df1 = data[
-                (data["Politician"] == selected_politician) & (data["Traded"] == most_active_sell) & (data["Transaction"] == "Sale")
+            trades = politician_rows(data, selected_politician)
+            help_df1 = trades[
+                (trades["Traded"] == most_active_sell) & (trades["Transaction"] == "Sale")
             ].copy()
 
             help_df1["Invested"] = -help_df1["Invested"]
@@ -741,8 +773,8 @@ def most_active_sell(data: pd.DataFrame, selected_politician: str) -> str:
 
             # Additional sector-specific message for EQUITY
             if "EQUITY" in grouped_df1["quoteType"].unique():
-                help_df2 = data[
-                    (data["Politician"] == selected_politician) & (data["Traded"] == most_active_sell) & (data["Transaction"] == "Sale") & (data["quoteType"] == "EQUITY")
+                help_df2 = trades[
+                    (trades["Traded"] == most_active_sell) & (trades["Transaction"] == "Sale") & (trades["quoteType"] == "EQUITY")
                 ].copy()
 
                 help_df2["Invested"] = -help_df2["Invested"]
@@ -6,20 +6,26 @@ import plotly.graph_objects as go
 
 
 class PoliticianGraph:
-    def __init__(self, politician_data, selected_instrument):
+    def __init__(self, politician_data, selected_instrument, price_history=None):
         self.politician_data = politician_data
         self.selected_instrument = selected_instrument
+        self.price_history = price_history
 
     def generate_graph(self):
         """
         Generate a price graph for the selected instrument and the politician's trades.
+        The prices are taken from price_history (a Series indexed by date) if
+        given, else from the date columns of the politician data.
 
         Returns:
         - fig (plotly.graph_objects.Figure): The figure object to be displayed in Streamlit.
         """
-        graph_data = pd.DataFrame(self.politician_data.loc[0]).T
-        date_columns = [col for col in graph_data.columns if '-' in col]
-        graph_values = graph_data[date_columns].T.reset_index()
+        if self.price_history is not None:
+            graph_values = self.price_history.rename_axis('Date').reset_index()
+        else:
+            graph_data = pd.DataFrame(self.politician_data.loc[0]).T
+            date_columns = [col for col in graph_data.columns if '-' in col]
+            graph_values = graph_data[date_columns].T.reset_index()
         graph_values.columns = ['Date', 'Price']
         fig = go.Figure()
         fig.add_trace(go.Scatter(x=graph_values['Date'], y=graph_values['Price'], mode='lines', name='Price'))
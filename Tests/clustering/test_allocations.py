@@ -0,0 +1,81 @@
+"""
+This file contains the test functions for the allocations.py module.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from Src.clustering.allocations import Allocation_Matrix, refresh_allocation_matrices
+from Src.scraping.scraper import DataLoader
+
+
+def sample_trades():
+    return pd.DataFrame({
+        "Ticker": ["AAPL", "TLT", "MSFT", "XOM", "SPY", "AAPL"],
+        "Politician": ["John Doe", "John Doe", "John Doe", "Jane Smith", "Jane Smith", "Jane Smith"],
+        "Transaction": ["Purchase", "Purchase", "Purchase", "Purchase", "Sale", "Purchase"],
+        "Invested": [1000.0, 2000.0, 1000.0, 300.0, -500.0, 100.0],
+        "quoteType": ["EQUITY", "BOND", "EQUITY", "EQUITY", "ETF", "EQUITY"],
+        "sectorKey": ["Tech", "Unknown", "Tech", "Energy", "Unknown", "Tech"]
+    })
+
+
+def test_from_trades():
+    # Test function
+    strategy_type = Allocation_Matrix.from_trades(sample_trades(), "quoteType")
+    assert strategy_type.politicians == ["Jane Smith", "John Doe"]
+    assert strategy_type.categories == ["BOND", "EQUITY"]
+    np.testing.assert_allclose(strategy_type.matrix, [[0.0, 100.0], [50.0, 50.0]])
+
+    strategy_sector = Allocation_Matrix.from_trades(sample_trades(), "sectorKey")
+    assert strategy_sector.categories == ["Energy", "Tech"]
+    np.testing.assert_allclose(strategy_sector.matrix, [[75.0, 25.0], [0.0, 100.0]])
+    assert strategy_sector.allocation("Jane Smith").to_dict() == {"Energy": 75.0, "Tech": 25.0}
+    assert strategy_sector.allocation("Nobody").empty
+
+
+def test_from_table():
+    data_general = pd.DataFrame({
+        "Politician": ["A", "A", "B"],
+        "sectorKey": ["Tech", "Energy", "Tech"],
+        "Total Invested Sector": [40.0, 60.0, 100.0]
+    })
+
+    # Test function
+    strategy_sector = Allocation_Matrix.from_table(data_general, "sectorKey")
+    assert (strategy_sector.politicians, strategy_sector.categories) == (["A", "B"], ["Energy", "Tech"])
+    np.testing.assert_allclose(strategy_sector.matrix, [[60.0, 40.0], [0.0, 100.0]])
+
+
+def test_save_and_load(tmp_path):
+    data_dir = str(tmp_path)
+    sample_trades().to_csv(tmp_path / "senators_trading.csv", index=False)
+    strategy_type = Allocation_Matrix.from_trades(sample_trades(), "quoteType")
+
+    # Test function
+    assert Allocation_Matrix.load(data_dir, "quoteType") is None
+    strategy_type.save(data_dir)
+    loaded = Allocation_Matrix.load(data_dir, "quoteType")
+    assert (loaded.politicians, loaded.categories) == (strategy_type.politicians, strategy_type.categories)
+    np.testing.assert_array_equal(loaded.matrix, strategy_type.matrix)
+
+    # A matrix older than the datasets is not used
+    sample_trades().head(2).to_csv(tmp_path / "senators_trading.csv", index=False)
+    assert Allocation_Matrix.load(data_dir, "quoteType") is None
+
+
+def test_refresh_allocation_matrices(tmp_path):
+    data_loader = DataLoader(str(tmp_path), backend="csv")
+    sample_trades().drop(columns=["quoteType", "sectorKey"]).to_csv(tmp_path / "senators_trading.csv", index=False)
+    pd.DataFrame({
+        "Ticker": ["AAPL", "MSFT", "XOM"], "quoteType": ["EQUITY"] * 3,
+        "sectorKey": ["Tech", "Tech", "Energy"]
+    }).to_csv(tmp_path / "financial_instruments.csv", index=False)
+
+    # Test function
+    refresh_allocation_matrices(data_loader)
+    assert os.path.exists(tmp_path / "allocation_sectorKey.npy")
+    strategy_type = Allocation_Matrix.load(str(tmp_path), "quoteType")
+    assert strategy_type.categories == ["EQUITY"]
+    np.testing.assert_allclose(strategy_type.matrix, [[100.0], [100.0]])
@@ -0,0 +1,62 @@
+"""
+This file contains the test functions for the batch_alignment.py module.
+"""
+import numpy as np
+import pandas as pd
+
+from Src.clustering.allocations import Allocation_Matrix
+from Src.clustering.batch_alignment import batch_alignment, chunk_top_k, read_user_allocations
+from Src.clustering.cluster import best_alignment, top_k
+
+allocations = Allocation_Matrix("quoteType", ["A", "B", "C"], ["EQUITY", "ETF"],
+                                np.array([[100.0, 0.0], [50.0, 50.0], [80.0, 20.0]]))
+users = pd.DataFrame({
+    "Client": ["X", "Y", "Z"],
+    "EQUITY": [80.0, 50.0, 100.0],
+    "ETF": [20.0, 50.0, 0.0]
+})
+
+
+def test_read_user_allocations():
+    long_users = users.melt(id_vars="Client", var_name="quoteType", value_name="Invested by User")
+
+    # Test function
+    clients, categories, matrix = read_user_allocations(long_users, "quoteType")
+    assert (clients, categories) == (["X", "Y", "Z"], ["EQUITY", "ETF"])
+    np.testing.assert_array_equal(matrix, users[["EQUITY", "ETF"]].to_numpy())
+
+
+def test_chunk_top_k_matches_top_k():
+    rng = np.random.default_rng(0)
+    # Few distinct values, so ties across the k-th alignment are frequent
+    alignment = rng.integers(0, 4, size=(50, 20)).astype(float)
+    score = rng.integers(0, 3, size=(50, 20)).astype(float)
+
+    # Test function
+    for k in [0, 1, 5, 20, 30]:
+        best = chunk_top_k(alignment, score, k)
+        expected = [top_k(alignment[row], score[row], k) for row in range(len(alignment))]
+        np.testing.assert_array_equal(best, np.array(expected).reshape(best.shape))
+
+
+def test_batch_alignment_matches_best_alignment(tmp_path):
+    users.to_csv(tmp_path / "clients.csv", index=False)
+
+    # Test function
+    result, metrics = batch_alignment(allocations, str(tmp_path / "clients.csv"), k=2, chunk_size=2)
+    assert result.columns.tolist() == ["Client", "Rank", "Politician", "Alignment (%)"]
+    assert (metrics["clients"], metrics["politicians"]) == (3, 3)
+    for client, row in users.set_index("Client").iterrows():
+        data_user = pd.DataFrame({"quoteType": row.index, "Invested by User": row.to_numpy()})
+        expected = best_alignment(allocations, data_user, "quoteType", k=2)
+        ranked = result[result["Client"] == client]
+        assert ranked["Rank"].tolist() == [1, 2]
+        assert ranked["Politician"].tolist() == expected["Politician"].tolist()
+        np.testing.assert_allclose(ranked["Alignment (%)"], expected["Alignment (%)"])
+
+
+def test_batch_alignment_unknown_category():
+    # Test function
+    result, _ = batch_alignment(allocations, pd.DataFrame({"Client": ["X"], "EQUITY": [60.0], "BOND": [40.0]}), k=1)
+    assert result["Politician"].tolist() == ["B"]
+    assert result["Alignment (%)"].iloc[0] == 100 * (0.8 + 0) / 2
@@ -4,7 +4,13 @@ This file contains the test functions for the cluster.py module.
 import pytest
 import pandas as pd
 
-from Src.clustering.cluster import best_alignment
+import numpy as np
+
+from Src.clustering.allocations import Allocation_Matrix
+from Src.clustering.cluster import (
+    Strategy_Clusters, alignment_kernel, best_alignment, clustered_alignment, kmeans,
+    refresh_strategy_clusters, top_k
+)
 
 
 # Test Data
@@ -26,3 +32,100 @@ def test_best_alignment_invalid_join_column():
     """
     with pytest.raises(KeyError):
         best_alignment(data_general, data_user, join="NonExistentColumn")
+
+
+def test_best_alignment():
+    data_general = pd.DataFrame({
+        "Politician": ["A", "A", "B", "B", "C", "C"],
+        "quoteType": ["EQUITY", "ETF"] * 3,
+        "Total Invested Type": [100.0, 0.0, 50.0, 50.0, 80.0, 20.0],
+        "Total Invested": [1000.0] * 6
+    })
+    data_user = pd.DataFrame({"quoteType": ["EQUITY", "ETF"], "Invested by User": [80.0, 20.0]})
+
+    # Test function
+    result = best_alignment(data_general, data_user, join="quoteType", k=2)
+    assert result.columns.tolist() == ["Politician", "Alignment (%)"]
+    assert result.index.tolist() == [1, 2]
+    assert result["Politician"].tolist() == ["C", "A"]
+    assert result["Alignment (%)"].tolist() == [100.0, 40.0]
+
+
+def test_alignment_kernel():
+    allocations = np.array([[100.0, 0.0], [50.0, 50.0], [10.0, 90.0]])
+
+    # Test function
+    alignment, score = alignment_kernel(allocations, np.array([80.0, 20.0]))
+    np.testing.assert_allclose(alignment, [40.0, 40.0, 100 * (1 - 70 / 90) / 2])
+    np.testing.assert_allclose(score, [400.0, 900.0, 4900.0])
+
+
+def test_top_k_keeps_ties_in_order():
+    alignment = np.array([50.0, 90.0, 90.0, 10.0, 90.0])
+    score = np.array([1.0, 5.0, 2.0, 0.0, 2.0])
+
+    # Test function
+    assert top_k(alignment, score, k=2).tolist() == [2, 4]
+    assert top_k(alignment, score, k=10).tolist() == [2, 4, 1, 0, 3]
+
+
+def test_best_alignment_with_allocation_matrix():
+    allocations = Allocation_Matrix("quoteType", ["A", "B", "C"], ["EQUITY", "ETF"],
+                                    np.array([[100.0, 0.0], [50.0, 50.0], [80.0, 20.0]]))
+    data_user = pd.DataFrame({"quoteType": ["ETF", "EQUITY", "BOND"], "Invested by User": [20.0, 80.0, 0.0]})
+
+    # Test function
+    result = best_alignment(allocations, data_user, join="quoteType", k=1)
+    assert result["Politician"].tolist() == ["C"]
+    assert result["Alignment (%)"].iloc[0] == 100.0
+
+
+def test_kmeans_separates_styles():
+    points = np.array([[100.0, 0.0], [95.0, 5.0], [0.0, 100.0], [10.0, 90.0], [98.0, 2.0]])
+
+    # Test function
+    labels, centroids = kmeans(points, 2)
+    assert labels[0] == labels[1] == labels[4] != labels[2] == labels[3]
+    np.testing.assert_allclose(centroids[labels[2]], [5.0, 95.0])
+    np.testing.assert_array_equal(kmeans(points, 2)[0], labels)
+    assert len(kmeans(points[:1], 3)[1]) == 1
+
+
+def test_strategy_clusters(tmp_path):
+    allocations = Allocation_Matrix("quoteType", ["A", "B", "C", "D"], ["EQUITY", "ETF"],
+                                    np.array([[100.0, 0.0], [90.0, 10.0], [0.0, 100.0], [20.0, 80.0]]))
+    pd.DataFrame({"Ticker": ["AAPL"]}).to_csv(tmp_path / "senators_trading.csv", index=False)
+
+    # Test function
+    clusters = refresh_strategy_clusters(str(tmp_path), {"quoteType": allocations})["quoteType"]
+    cluster = clusters.nearest(np.array([15.0, 85.0]), ["EQUITY", "ETF"])
+    assert clusters.members(cluster) == ["C", "D"]
+    assert clusters.nearest(np.array([100.0]), ["EQUITY"]) == clusters.labels[0]
+
+    loaded = Strategy_Clusters.load(str(tmp_path), "quoteType")
+    assert loaded.matches(allocations)
+    np.testing.assert_array_equal(loaded.labels, clusters.labels)
+    np.testing.assert_array_equal(loaded.centroids, clusters.centroids)
+
+    pd.DataFrame({"Ticker": ["MSFT"]}).to_csv(tmp_path / "senators_trading.csv", index=False)
+    assert Strategy_Clusters.load(str(tmp_path), "quoteType") is None
+
+
+def test_clustered_alignment_matches_full_scan():
+    rng = np.random.default_rng(0)
+    styles = np.array([[90.0, 5.0, 5.0], [5.0, 90.0, 5.0], [5.0, 5.0, 90.0]])
+    matrix = np.repeat(styles, 6, axis=0) + rng.uniform(-3, 3, size=(18, 3))
+    allocations = Allocation_Matrix("quoteType", [f"P{i}" for i in range(18)], ["BOND", "EQUITY", "ETF"], matrix)
+    clusters = Strategy_Clusters.from_allocations(allocations, n_clusters=3)
+
+    # Test function
+    for style in styles:
+        data_user = pd.DataFrame({"quoteType": ["BOND", "EQUITY", "ETF"], "Invested by User": style + 1})
+        pruned, cluster = clustered_alignment(allocations, clusters, data_user, "quoteType", k=5)
+        assert len(clusters.members(cluster)) == 6
+        pd.testing.assert_frame_equal(pruned, best_alignment(allocations, data_user, "quoteType", k=5))
+
+    # Clusters with fewer than k members fall back to all politicians
+    data_user = pd.DataFrame({"quoteType": ["BOND", "EQUITY", "ETF"], "Invested by User": styles[0]})
+    full, _ = clustered_alignment(allocations, clusters, data_user, "quoteType", k=10)
+    pd.testing.assert_frame_equal(full, best_alignment(allocations, data_user, "quoteType", k=10))
@@ -0,0 +1,49 @@
+"""
+This file contains the test functions for the strategy_scan.py module.
+"""
+import numpy as np
+
+from Src.clustering.allocations import Allocation_Matrix
+from Src.clustering.strategy_scan import Strategy_Scan, benchmark, unit_rows
+
+allocations = Allocation_Matrix(
+    "sectorKey", ["A", "B", "C", "D", "E"], ["Energy", "Health", "Tech"],
+    np.array([[100.0, 0.0, 0.0], [0.0, 50.0, 50.0], [0.0, 40.0, 60.0], [10.0, 0.0, 90.0], [0.0, 0.0, 0.0]])
+)
+
+
+def test_unit_rows():
+    # Test function
+    vectors = unit_rows(np.array([[3.0, 4.0], [0.0, 0.0]]))
+    np.testing.assert_allclose(vectors, [[0.6, 0.8], [0.0, 0.0]])
+
+
+def test_query():
+    scan = Strategy_Scan(allocations)
+
+    # Test function
+    neighbours = scan.query({"Tech": 60.0, "Health": 40.0, "Bond": 100.0}, k=2)
+    assert neighbours.index.tolist() == [1, 2]
+    assert neighbours["Politician"].tolist() == ["C", "B"]
+    assert np.isclose(neighbours["Similarity"].iloc[0], 1.0)
+
+
+def test_query_politician():
+    scan = Strategy_Scan(allocations)
+
+    # Test function
+    neighbours = scan.query_politician("B", k=10)
+    assert neighbours["Politician"].tolist() == ["C", "D", "A", "E"]
+    assert scan.query_politician("Nobody").empty
+
+
+def test_benchmark_is_exact():
+    rng = np.random.default_rng(0)
+    scan = Strategy_Scan(Allocation_Matrix("industryKey", [f"P{i}" for i in range(200)],
+                                           [f"I{i}" for i in range(50)], rng.random((200, 50))))
+
+    # Test function
+    metrics = benchmark(scan, rng.random((10, 50)), k=5)
+    assert metrics["queries"] == 10
+    assert metrics["exact"]
+    assert metrics["scan_ms"] > 0 and metrics["alignment_ms"] > 0
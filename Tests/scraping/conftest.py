@@ -0,0 +1,38 @@
+"""
+Shared fixtures of the scraping tests.
+"""
+import pytest
+import pandas as pd
+
+
+class FakeClock:
+    """
+    Clock that only moves when a test advances its now attribute or sleeps.
+    """
+    def __init__(self, now):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    """
+    A monotonic clock in seconds with its sleep function, e.g. for the rate
+    limiter.
+    """
+    return FakeClock(100.0)
+
+
+@pytest.fixture
+def date_clock():
+    """
+    A clock of timestamps, e.g. for the expiry of the cache entries.
+    """
+    return FakeClock(pd.Timestamp('2024-01-01'))
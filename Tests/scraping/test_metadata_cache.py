@@ -0,0 +1,44 @@
+"""
+This is a test file for the metadata_cache.py file.
+"""
+import pandas as pd
+
+from Src.scraping.metadata_cache import FIELD_GROUPS, Metadata_Cache
+
+
+def test_expired_groups(tmp_path, date_clock):
+    cache = Metadata_Cache(str(tmp_path), clock=date_clock)
+    assert cache.expired_groups('AAPL') == list(FIELD_GROUPS)
+
+    # Test function
+    cache.mark_fetched(['AAPL'])
+    assert cache.expired_groups('AAPL') == []
+    date_clock.now += pd.Timedelta(days=120)
+    assert cache.expired_groups('AAPL') == ['profile']
+    date_clock.now += pd.Timedelta(days=300)
+    assert cache.expired_groups('AAPL') == list(FIELD_GROUPS)
+
+
+def test_fresh_tickers_with_ttl_override(tmp_path, date_clock):
+    cache = Metadata_Cache(str(tmp_path), ttls={'profile': 7}, clock=date_clock)
+    cache.mark_fetched(['AAPL'])
+    date_clock.now += pd.Timedelta(days=3)
+    cache.mark_fetched(['MSFT'])
+    date_clock.now += pd.Timedelta(days=5)
+
+    # Test function
+    assert cache.fresh_tickers(['AAPL', 'MSFT', 'TSLA']) == {'MSFT'}
+
+
+def test_save_and_load(tmp_path, date_clock):
+    cache = Metadata_Cache(str(tmp_path), clock=date_clock)
+    cache.mark_fetched(['AAPL', 'MSFT'])
+    date_clock.now += pd.Timedelta(days=1)
+    cache.mark_fetched(['MSFT'])
+    cache.save()
+
+    # Test function
+    loaded = Metadata_Cache(str(tmp_path), clock=date_clock)
+    assert loaded.fetched.index.tolist() == ['AAPL', 'MSFT']
+    assert loaded.fetched.loc['MSFT', 'profile'] == pd.Timestamp('2024-01-02')
+    assert loaded.fresh_tickers(['AAPL', 'MSFT']) == {'AAPL', 'MSFT'}
@@ -0,0 +1,114 @@
+"""
+This is a test file for the page_fetcher.py file, using a local stub HTTP
+server instead of the website.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+from Src.scraping.page_fetcher import Page_Fetcher
+from Src.scraping.scraper import Senators_Trading_Updater
+
+
+class StubTableHandler(BaseHTTPRequestHandler):
+    total_pages = 5
+    requests_per_page: dict = {}
+    failing_attempts: dict = {}
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        page = int(parse_qs(self.rfile.read(length).decode())["page"][0])
+        attempts = self.requests_per_page.get(page, 0) + 1
+        self.requests_per_page[page] = attempts
+
+        # The first attempts of a failing page return a transient error
+        if attempts <= self.failing_attempts.get(page, 0):
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = json.dumps({"table": f"<table>{page}</table>", "total_pages": self.total_pages}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    StubTableHandler.requests_per_page = {}
+    StubTableHandler.failing_attempts = {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubTableHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_pages_keeps_order(stub_server):
+    fetcher = Page_Fetcher(stub_server, {'User-Agent': 'test'}, workers=3, backoff=0)
+
+    # Test function
+    results = list(fetcher.fetch_pages(range(1, 6)))
+    assert [page for page, _ in results] == [1, 2, 3, 4, 5]
+    assert [response.json()["table"] for _, response in results] == [f"<table>{page}</table>" for page in range(1, 6)]
+
+
+def test_fetch_page_retries_transient_errors(stub_server):
+    StubTableHandler.failing_attempts = {2: 1}
+    fetcher = Page_Fetcher(stub_server, {'User-Agent': 'test'}, backoff=0)
+
+    # Test function
+    response = fetcher.fetch_page(2)
+    assert response.status_code == 200
+    assert StubTableHandler.requests_per_page[2] == 2
+
+
+def test_fetch_page_gives_up_after_retries(stub_server):
+    StubTableHandler.failing_attempts = {3: 10}
+    fetcher = Page_Fetcher(stub_server, {'User-Agent': 'test'}, retries=1, backoff=0)
+
+    # Test function
+    assert fetcher.fetch_page(3) is None
+    assert StubTableHandler.requests_per_page[3] == 2
+
+
+def test_fetch_all_pages_stops_early(stub_server):
+    updater = Senators_Trading_Updater(workers=2)
+    updater.page_fetcher = Page_Fetcher(stub_server, updater.headers, workers=2, backoff=0)
+
+    # Test function
+    pages = []
+    for page, max_pages, response_json in updater.fetch_all_pages():
+        assert max_pages == 5
+        assert response_json["table"] == f"<table>{page}</table>"
+        pages.append(page)
+        if page == 2:
+            break
+
+    assert pages == [1, 2]
+    assert 4 not in StubTableHandler.requests_per_page
+
+
+def test_fetch_all_pages_fetches_single_pages_after_known_trades(stub_server):
+    updater = Senators_Trading_Updater(workers=3)
+    updater.page_fetcher = Page_Fetcher(stub_server, updater.headers, workers=3, backoff=0)
+
+    # Test function
+    pages = []
+    for page, _, _ in updater.fetch_all_pages(lambda: True):
+        pages.append(page)
+        if page == 2:
+            break
+
+    assert pages == [1, 2]
+    assert sorted(StubTableHandler.requests_per_page) == [1, 2]
@@ -0,0 +1,48 @@
+"""
+This is a test file for the picture_cache.py file.
+"""
+from io import BytesIO
+from unittest.mock import patch, Mock
+
+from PIL import Image
+
+from Src.scraping.picture_cache import save_thumbnail, thumbnail_path, thumbnail_url
+
+
+def image_response(size):
+    content = BytesIO()
+    Image.new("RGBA", size, (255, 0, 0, 255)).save(content, "PNG")
+    return Mock(ok=True, content=content.getvalue())
+
+
+def test_thumbnail_url():
+    base = "https://upload.wikimedia.org/wikipedia/commons"
+
+    # Test function
+    assert thumbnail_url(f"{base}/a/ab/John_Doe.jpg") == f"{base}/thumb/a/ab/John_Doe.jpg/300px-John_Doe.jpg"
+    assert thumbnail_url(f"{base}/a/ab/Seal.svg", 100) == f"{base}/thumb/a/ab/Seal.svg/100px-Seal.svg.png"
+    assert thumbnail_url("https://example.com/john_doe.jpg") == "https://example.com/john_doe.jpg"
+
+
+def test_thumbnail_path():
+    # Test function
+    assert thumbnail_path("John A. Doe Jr.", "Data") == "Data/pictures/John_A_Doe_Jr.jpg"
+
+
+@patch('requests.get')
+def test_save_thumbnail(mock_get, tmp_path):
+    missing = Mock(ok=False)
+    missing.raise_for_status.side_effect = Exception("404")
+    mock_get.side_effect = [missing, image_response((1200, 1600))]
+    path = str(tmp_path / "pictures" / "John_Doe.jpg")
+
+    # Test function
+    url = "https://upload.wikimedia.org/wikipedia/commons/a/ab/John_Doe.jpg"
+    assert save_thumbnail(url, path) == path
+    assert mock_get.call_args_list[1].args[0] == url
+    with Image.open(path) as image:
+        assert image.format == "JPEG"
+        assert image.size == (300, 400)
+
+    mock_get.side_effect = [missing, missing]
+    assert save_thumbnail(url, path) is None
@@ -0,0 +1,69 @@
+"""
+This is a test file for the politician_summary.py file.
+"""
+import pandas as pd
+
+from Src.scraping.politician_summary import build_politician_summary, refresh_politician_summary, top_group
+from Src.scraping.scraper import DataLoader
+
+
+def sample_trades():
+    return pd.DataFrame({
+        "Ticker": ["AAPL", "TLT", "MSFT", "XOM", "AAPL", "NVDA"],
+        "Politician": ["John Doe", "Jane Smith", "John Doe", "Jane Smith", "John Doe", "Jane Sold"],
+        "Party": ["R", "D", "R", "D", "R", "D"],
+        "Chamber": ["Senate", "House", "Senate", "House", "Senate", "House"],
+        "Traded": ["2021-05-01", "2022-03-15", "2023-01-25", "2024-07-19", "2020-02-01", "2022-01-01"],
+        "Transaction": ["Purchase", "Purchase", "Purchase", "Sale", "Purchase", "Sale"],
+        "Invested": [1000.0, 1500.0, 2000.0, -500.0, 3000.0, -2000.0]
+    })
+
+
+def test_build_politician_summary():
+    data = sample_trades()
+    data["quoteType"] = ["EQUITY", "BOND", "EQUITY", "EQUITY", "EQUITY", "EQUITY"]
+    data["sectorKey"] = ["Tech", "Finance", "Tech", "Energy", "Tech", "Tech"]
+
+    # Test function
+    summary = build_politician_summary(data).set_index("Politician")
+    assert summary.index.tolist() == ["Jane Smith", "Jane Sold", "John Doe"]
+    john = summary.loc["John Doe"]
+    assert (john["Party"], john["FirstTrade"], john["LastTrade"]) == ("R", "2020-02-01", "2023-01-25")
+    assert (john["Invested"], john["Sold"]) == (6000.0, 0.0)
+    assert (john["TopType"], john["TopTypeInvested"], john["TopSector"]) == ("EQUITY", 6000.0, "Tech")
+    assert pd.isna(john["TopSoldSector"])
+    jane = summary.loc["Jane Smith"]
+    assert (jane["TopType"], jane["Sold"], jane["TopSoldSector"]) == ("BOND", 500.0, "Energy")
+    assert pd.isna(jane["TopSector"])
+    assert pd.isna(summary.loc["Jane Sold", "TopType"])
+
+
+def test_top_group_breaks_ties_like_the_page_helpers():
+    data = pd.DataFrame({
+        "Politician": ["John Doe"] * 4,
+        "sectorKey": ["Tech", "Energy", "Utilities", "Finance"],
+        "Invested": [-500.0, -500.0, -100.0, -100.0]
+    })
+
+    # Test function
+    totals = data.groupby("sectorKey", as_index=False)["Invested"].sum()\
+        .sort_values(by="Invested", ascending=False)
+    assert top_group(data, "sectorKey").loc["John Doe", "sectorKey"] == totals.iloc[0]["sectorKey"] == "Finance"
+    assert top_group(data, "sectorKey", largest=False).loc["John Doe", "sectorKey"] \
+        == totals.iloc[-1]["sectorKey"] == "Tech"
+
+
+def test_refresh_politician_summary(tmp_path):
+    data_loader = DataLoader(str(tmp_path), backend="csv")
+    sample_trades().to_csv(tmp_path / "senators_trading.csv", index=False)
+    pd.DataFrame({
+        "Ticker": ["AAPL", "MSFT", "XOM"], "quoteType": ["EQUITY"] * 3,
+        "sectorKey": ["Tech", "Tech", "Energy"]
+    }).to_csv(tmp_path / "financial_instruments.csv", index=False)
+
+    # Test function
+    refresh_politician_summary(data_loader)
+    summary = data_loader.load("politician_summary", columns=["Politician"]).set_index("Politician")
+    assert summary.loc["Jane Smith", "TopType"] == "Unknown"
+    assert pd.isna(summary.loc["Jane Sold", "TopSector"])
+    assert summary.loc["John Doe", "TopSectorInvested"] == 6000.0
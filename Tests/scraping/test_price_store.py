@@ -0,0 +1,127 @@
+"""
+This is a test file for the price_store.py file.
+"""
+import numpy as np
+import pandas as pd
+
+from Src.scraping.price_store import (Price_Store, matches_refresh_point, month_labels,
+                                      open_price_matrix, wide_to_long)
+
+
+def wide_instruments():
+    return pd.DataFrame({
+        'Ticker': ['AAPL', 'MSFT'],
+        'shortName': ['Apple', 'Microsoft'],
+        '2023-01-01': [100.0, 200.0],
+        '2023-02-01': [110.0, np.nan]
+    })
+
+
+def test_wide_to_long():
+    # Test function
+    prices = wide_to_long(wide_instruments())
+    assert prices.columns.tolist() == ['Ticker', 'Date', 'Close']
+    assert prices.values.tolist() == [
+        ['AAPL', '2023-01-01', 100.0], ['AAPL', '2023-02-01', 110.0], ['MSFT', '2023-01-01', 200.0]
+    ]
+
+
+def test_migrate_wide_instruments(tmp_path):
+    wide_instruments().to_csv(tmp_path / "financial_instruments.csv", index=False)
+
+    # Test function
+    price_store = Price_Store(str(tmp_path))
+    assert price_store.price('AAPL', '2023-02-01') == 110.0
+    assert price_store.price('MSFT', '2023-02-01') is None
+    assert pd.read_csv(tmp_path / "financial_instruments.csv").columns.tolist() == ['Ticker', 'shortName']
+    assert len(pd.read_csv(tmp_path / "financial_prices.csv")) == 3
+
+
+def test_append_without_rewriting_history(tmp_path):
+    price_store = Price_Store(str(tmp_path))
+    price_store.append(pd.DataFrame({
+        'Ticker': ['AAPL', 'AAPL'], 'Date': ['2023-01-01', '2023-02-01'], 'Close': [100.0, 105.0]
+    }))
+
+    # Test function
+    appended = price_store.append(pd.DataFrame({
+        'Ticker': ['AAPL', 'AAPL', 'AAPL'],
+        'Date': ['2023-01-01', '2023-02-01', '2023-03-01'],
+        'Close': [100.0, 110.0, 120.0]
+    }))
+    assert appended == 2
+    assert len(pd.read_csv(tmp_path / "financial_prices.csv")) == 4
+
+    price_store = Price_Store(str(tmp_path))
+    assert price_store.history('AAPL').tolist() == [100.0, 110.0, 120.0]
+    assert price_store.price('AAPL', '2023-02-01') == 110.0
+
+
+def test_append_compacts_superseded_prices(tmp_path):
+    dates = ['2023-01-01', '2023-02-01', '2023-03-01', '2023-04-01']
+    price_store = Price_Store(str(tmp_path))
+    price_store.append(pd.DataFrame({'Ticker': ['AAPL'] * 4, 'Date': dates, 'Close': [100.0, 105.0, 110.0, 115.0]}))
+    price_store.append(pd.DataFrame({'Ticker': ['AAPL'] * 2, 'Date': dates[2:], 'Close': [111.0, 116.0]}))
+    assert len(pd.read_csv(tmp_path / "financial_prices.csv")) == 6
+
+    # Test function
+    price_store.append(pd.DataFrame({'Ticker': ['AAPL'] * 4, 'Date': dates, 'Close': [50.0, 52.5, 55.5, 58.0]}))
+    stored = pd.read_csv(tmp_path / "financial_prices.csv")
+    assert stored.values.tolist() == [['AAPL', date, close] for date, close in zip(dates, [50.0, 52.5, 55.5, 58.0])]
+    assert Price_Store(str(tmp_path)).history('AAPL').tolist() == [50.0, 52.5, 55.5, 58.0]
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_price_matrix_rebuilt_when_store_changes(tmp_path):
+    price_store = Price_Store(str(tmp_path))
+    price_store.append(pd.DataFrame({
+        'Ticker': ['AAPL', 'MSFT'], 'Date': ['2023-01-01', '2023-03-01'], 'Close': [100.0, 200.0]
+    }))
+
+    # Test function
+    tickers, first_month, matrix = open_price_matrix(str(tmp_path))
+    assert tickers == ['AAPL', 'MSFT']
+    assert month_labels(first_month, matrix.shape[1]) == ['2023-01-01', '2023-02-01', '2023-03-01']
+    np.testing.assert_array_equal(matrix, [[100.0, np.nan, np.nan], [np.nan, np.nan, 200.0]])
+
+    price_store.append(pd.DataFrame({'Ticker': ['TSLA'], 'Date': ['2023-04-01'], 'Close': [50.0]}))
+    tickers, first_month, matrix = open_price_matrix(str(tmp_path))
+    assert tickers == ['AAPL', 'MSFT', 'TSLA']
+    assert matrix.shape == (3, 4)
+
+
+def test_refresh_points(tmp_path):
+    price_store = Price_Store(str(tmp_path))
+    price_store.append(pd.DataFrame({
+        'Ticker': ['AAPL', 'AAPL', 'AAPL', 'MSFT'],
+        'Date': ['2023-03-01', '2023-01-01', '2023-02-01', '2023-03-01'],
+        'Close': [120.0, 100.0, 110.0, 200.0]
+    }))
+
+    # Test function
+    assert price_store.refresh_points() == {'AAPL': ('2023-02-01', 110.0), 'MSFT': ('2023-03-01', 200.0)}
+
+
+def test_matches_refresh_point():
+    history = pd.DataFrame({'Date': ['2023-02-01', '2023-03-01'], 'Close': [110.0, 121.0]})
+
+    # Test function
+    assert matches_refresh_point(history, ('2023-02-01', 110.0))
+    assert not matches_refresh_point(history, ('2023-02-01', 220.0))
+    assert not matches_refresh_point(history, ('2023-01-01', 100.0))
+
+
+def test_stale_tickers(tmp_path):
+    price_store = Price_Store(str(tmp_path))
+    price_store.append(pd.DataFrame({
+        'Ticker': ['AAPL', 'AAPL', 'MSFT'],
+        'Date': ['2023-01-01', '2023-02-01', '2023-01-01'],
+        'Close': [100.0, 110.0, 200.0]
+    }))
+
+    # Test function
+    assert price_store.last_dates == {'AAPL': '2023-02-01', 'MSFT': '2023-01-01'}
+    assert price_store.stale_tickers(['TSLA', 'MSFT', 'AAPL'], '2023-02-01') == ['TSLA', 'MSFT']
+    price_store.append(pd.DataFrame({'Ticker': ['MSFT'], 'Date': ['2023-02-01'], 'Close': [210.0]}))
+    assert price_store.stale_tickers(['TSLA', 'MSFT', 'AAPL'], '2023-02-01') == ['TSLA']
+    assert Price_Store(str(tmp_path)).stale_tickers(['MSFT'], '2023-02-01') == []
@@ -0,0 +1,81 @@
+"""
+This is a test file for the rate_limiter.py file.
+"""
+import types
+from unittest.mock import patch
+
+import pytest
+import pandas as pd
+
+from Src.scraping.rate_limiter import Rate_Limiter, is_rate_limit_error
+from Src.scraping.scraper import Financial_Instruments_Updater
+
+
+def test_token_bucket_paces_requests(clock):
+    rate_limiter = Rate_Limiter(rate=2.0, max_rate=2.0, max_concurrency=2,
+                                clock=clock, sleep=clock.sleep)
+
+    # Test function
+    for _ in range(5):
+        with rate_limiter.request():
+            pass
+    assert clock.now - 100.0 == pytest.approx(2.0)
+    assert rate_limiter.metrics()['requests'] == 5
+    assert rate_limiter.metrics()['requests_per_second'] == pytest.approx(2.5)
+
+
+def test_limits_adapt_to_responses(clock):
+    rate_limiter = Rate_Limiter(rate=1.0, max_rate=5.0, rate_step=0.5, max_concurrency=4,
+                                target_latency=1.0, clock=clock, sleep=clock.sleep)
+
+    # Test function
+    with rate_limiter.request():
+        pass
+    assert rate_limiter.metrics()['rate'] == 1.5
+    assert rate_limiter.metrics()['concurrency'] == 2
+
+    with rate_limiter.request() as request:
+        request.throttled = True
+    assert rate_limiter.metrics()['rate'] == 0.75
+    assert rate_limiter.metrics()['concurrency'] == 1
+
+    with pytest.raises(RuntimeError):
+        with rate_limiter.request():
+            raise RuntimeError("429 Client Error: Too Many Requests")
+    assert rate_limiter.metrics()['throttled'] == 2
+    assert rate_limiter.metrics()['rate'] == 0.375
+
+
+def test_is_rate_limit_error():
+    # Test function
+    assert is_rate_limit_error(Exception("Too Many Requests. Rate limited. Try after a while."))
+    assert not is_rate_limit_error(Exception("404 Not Found"))
+
+
+class FakeTicker:
+    def __init__(self, ticker):
+        self.ticker = ticker
+
+    @property
+    def info(self):
+        return {} if self.ticker == "BAN" else {'quoteType': 'EQUITY', 'shortName': self.ticker}
+
+    def history(self, period, interval):
+        return pd.DataFrame({'Date': pd.to_datetime(['2023-01-01']), 'Close': [105.0]})
+
+
+def test_updater_with_fake_yfinance(clock):
+    fake_yfinance = types.ModuleType("yfinance")
+    fake_yfinance.Ticker = FakeTicker
+    rate_limiter = Rate_Limiter(rate=1.0, clock=clock, sleep=clock.sleep)
+    updater = Financial_Instruments_Updater(rate_limiter=rate_limiter)
+
+    # Test function
+    with patch('Src.scraping.scraper.yf', fake_yfinance):
+        info, history, excluded = updater.process_ticker((0, 2, 'AAPL'))
+        assert info['shortName'].tolist() == ['AAPL']
+        assert history['Close'].tolist() == [105.0]
+        updater.get_symbol_info('BAN')
+    metrics = rate_limiter.metrics()
+    assert metrics['requests'] == 3
+    assert metrics['throttled'] == 1
@@ -0,0 +1,25 @@
+"""
+This is a test file for the refresh_journal.py file.
+"""
+from Src.scraping.refresh_journal import Refresh_Journal
+
+
+def test_pending_after_restart(tmp_path):
+    journal = Refresh_Journal(str(tmp_path), '2024-01-01')
+    journal.record(['AAPL', 'MSFT'])
+    journal.record(['MSFT', 'TSLA'])
+
+    # Test function
+    restarted = Refresh_Journal(str(tmp_path), '2024-01-01')
+    assert restarted.pending(['NVDA', 'AAPL', 'TSLA', 'GOOG']) == ['NVDA', 'GOOG']
+    assert Refresh_Journal(str(tmp_path), '2024-02-01').pending(['AAPL']) == ['AAPL']
+
+
+def test_clear(tmp_path):
+    journal = Refresh_Journal(str(tmp_path), '2024-01-01')
+    journal.record(['AAPL'])
+
+    # Test function
+    journal.clear()
+    assert not (tmp_path / "financial_refresh_journal.csv").exists()
+    assert Refresh_Journal(str(tmp_path), '2024-01-01').pending(['AAPL']) == ['AAPL']
@@ -2,23 +2,45 @@
 This is a test file for the scraper.py file.
 """
 
+import os
+import tempfile
 import unittest
+from multiprocessing import Value
 from unittest.mock import patch, Mock
 import pandas as pd
-from bs4 import BeautifulSoup
 import wikipedia
 
 from Src.scraping.scraper import (
     DataLoader,
     Senators_Trading_Updater,
     Financial_Instruments_Updater,
-    Senators_Information_Updater
+    Senators_Information_Updater,
+    init_instrument_worker,
+    process_ticker_task
 )
+from Src.scraping.metadata_cache import Metadata_Cache
+from Src.scraping.price_store import Price_Store, current_month
+from Src.scraping.rate_limiter import Rate_Limiter
+from Src.scraping.refresh_journal import Refresh_Journal
+from Src.scraping.table_parser import parse_table_bs4
+from Src.scraping.wiki_cache import Wiki_Cache
+
+
+def temporary_data_dir(test_case):
+    """
+    Create a data directory that is removed after the test.
+    """
+    directory = tempfile.TemporaryDirectory()
+    test_case.addCleanup(directory.cleanup)
+    return directory.name
 
 
 class TestDataLoader(unittest.TestCase):
     def setUp(self):
-        self.data_loader = DataLoader()
+        data_dir = temporary_data_dir(self)
+        for name in ["senators_trading", "financial_instruments"]:
+            pd.DataFrame(columns=['Ticker']).to_csv(os.path.join(data_dir, f"{name}.csv"), index=False)
+        self.data_loader = DataLoader(data_dir, backend="csv")
 
     @patch('pandas.read_csv')
     def test_load_senators_trading(self, mock_read_csv):
@@ -37,12 +59,22 @@ class TestDataLoader(unittest.TestCase):
         result = self.data_loader.load_financial_instruments()
         pd.testing.assert_frame_equal(result, mock_df)
 
+    def test_load_senators_trading_typed(self):
+        pd.DataFrame({'Ticker': ['AAPL'], 'Politician': ['John Doe'], 'Traded': ['2023-01-01']})\
+            .to_csv(os.path.join(self.data_loader.data_dir, "senators_trading.csv"), index=False)
+
+        # Test function
+        typed = self.data_loader.load_senators_trading(typed=True)
+        self.assertIsInstance(typed['Politician'].dtype, pd.CategoricalDtype)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(typed['Traded']))
+        self.assertEqual(self.data_loader.load_senators_trading()['Traded'].tolist(), ['2023-01-01'])
+
 
 class TestSenatorsTrading(unittest.TestCase):
     def setUp(self):
-        self.updater = Senators_Trading_Updater()
+        self.updater = Senators_Trading_Updater(data_dir=temporary_data_dir(self))
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_fetch_data(self, mock_post):
         mock_response = Mock()
         mock_response.status_code = 200
@@ -54,8 +86,9 @@ class TestSenatorsTrading(unittest.TestCase):
         self.assertEqual(result.status_code, 200)
         mock_post.assert_called_once()
 
-    def test_extract_row_data(self):
+    def test_prepare_page_data(self):
         html = '''
+        <table>
         <tr class="data-table__row">
             <td data-title="Stock">AAPL</td>
             <td data-title="Politician"><a>John Doe</a><abbr>D</abbr><div><small>Senate</small></div></td>
@@ -63,19 +96,54 @@ class TestSenatorsTrading(unittest.TestCase):
             <td data-title="Traded"><div>Jan 01, 2023</div></td>
             <td data-title="Filed"><div>Feb 01, 2023</div></td>
         </tr>
+        </table>
         '''
-        row = BeautifulSoup(html, 'html.parser').find('tr')
         exclude_tickers = pd.DataFrame({'Ticker': []})
 
         # Test function
-        result = self.updater.extract_row_data(row, exclude_tickers)
+        result = self.updater.prepare_page_data(parse_table_bs4(html), exclude_tickers)
         self.assertEqual(result['Ticker'].iloc[0], 'AAPL')
         self.assertEqual(result['Politician'].iloc[0], 'John Doe')
 
+    def test_prepare_page_data_cleans_all_rows_at_once(self):
+        html = '''
+        <table>
+        <tr class="data-table__row">
+            <td data-title="Stock">AAPL</td>
+            <td data-title="Politician"><a>John Doe</a><abbr>D</abbr><div><small>Senate</small></div></td>
+            <td data-title="Transaction"><span>Purchase</span><div><small>$15,000 - $50,000</small></div></td>
+            <td data-title="Traded"><div>Jan 01, 2023</div></td>
+            <td data-title="Filed"><div>Feb 01, 2023</div></td>
+        </tr>
+        <tr class="data-table__row">
+            <td data-title="Stock">MSFT</td>
+            <td data-title="Politician"><a>Jane Roe</a><abbr>R</abbr><div><small>House</small></div></td>
+            <td data-title="Transaction"><span>Sale</span><div><small>$1,001 - $15,000</small></div></td>
+            <td data-title="Traded"><div>Jan 03, 2023</div></td>
+            <td data-title="Filed"><div>Feb 03, 2023</div></td>
+        </tr>
+        <tr class="data-table__row"><td data-title="Stock">BROKEN</td></tr>
+        </table>
+        '''
+        row_records = parse_table_bs4(html)
+        exclude_tickers = pd.DataFrame({'Ticker': []})
+
+        # Test function
+        result = self.updater.prepare_page_data(row_records, exclude_tickers)
+        self.assertEqual(result['Ticker'].tolist(), ['AAPL', 'MSFT'])
+        self.assertEqual(result['Traded'].tolist(), ['2023-01-01', '2023-01-03'])
+        self.assertEqual(result['Invested'].tolist(), [32500.0, -8000.5])
+
+        single = pd.concat(
+            [self.updater.prepare_page_data([record], exclude_tickers) for record in row_records],
+            ignore_index=True
+        )
+        pd.testing.assert_frame_equal(result, single)
+
 
 class TestFinancialInstruments(unittest.TestCase):
     def setUp(self):
-        self.updater = Financial_Instruments_Updater()
+        self.updater = Financial_Instruments_Updater(data_dir=temporary_data_dir(self))
 
     @patch('yfinance.Ticker')
     def test_get_symbol_history(self, mock_ticker):
@@ -95,10 +163,190 @@ class TestFinancialInstruments(unittest.TestCase):
         result = self.updater.get_symbol_history('AAPL')
         self.assertTrue(isinstance(result, pd.DataFrame))
 
+    def test_get_symbol_history_incremental(self):
+        symbol = Mock()
+        symbol.history.side_effect = lambda **kwargs: pd.DataFrame({
+            'Date': pd.to_datetime(['2023-02-01', '2023-03-01']), 'Close': [110.0, 120.0]
+        })
+        self.updater.refresh_points = {'AAPL': ('2023-02-01', 110.0), 'TSLA': ('2023-02-01', 330.0)}
+
+        # Test function
+        result = self.updater.get_symbol_history('AAPL', symbol)
+        self.assertEqual(result['Date'].tolist(), ['2023-02-01', '2023-03-01'])
+        symbol.history.assert_called_once_with(start='2023-02-01', interval='1mo')
+
+        symbol.history.reset_mock()
+        self.updater.get_symbol_history('TSLA', symbol)
+        self.assertEqual(symbol.history.call_args_list[-1].kwargs, {'period': 'max', 'interval': '1mo'})
+
+    def test_process_ticker_task(self):
+        self.updater.get_symbol_info = Mock(side_effect=[pd.DataFrame({'Ticker': ['AAPL']}), None])
+        self.updater.get_symbol_history = Mock(return_value=pd.DataFrame({
+            'Ticker': ['AAPL'], 'Date': ['2023-01-01'], 'Close': [105.0]
+        }))
+        init_instrument_worker(self.updater)
+
+        # Test function
+        info, history, excluded = process_ticker_task((0, 2, 'AAPL'))
+        self.assertEqual(history['Close'].tolist(), [105.0])
+        self.assertTrue(excluded.empty)
+        info, history, excluded = process_ticker_task((1, 2, 'NONE'))
+        self.assertTrue(info.empty)
+        self.assertEqual(excluded['Ticker'].tolist(), ['NONE'])
+
+    @patch('yfinance.download')
+    def test_process_ticker_batch(self, mock_download):
+        closes = pd.DataFrame({
+            'AAPL': [100.0, 110.0], 'MSFT': [200.0, None], 'DEAD': [None, None]
+        }, index=pd.DatetimeIndex(['2023-01-01', '2023-02-01'], name='Date'))
+        mock_download.return_value = pd.concat({'Close': closes}, axis=1)
+        self.updater.get_symbol_info = Mock(side_effect=lambda ticker: pd.DataFrame({'Ticker': [ticker]}))
+        processed = Value('i', 0)
+        init_instrument_worker(self.updater, processed)
+        self.addCleanup(init_instrument_worker, None)
+
+        # Test function
+        results = self.updater.process_ticker_batch((0, 1, ['AAPL', 'MSFT', 'DEAD']))
+        self.assertEqual(processed.value, 3)
+        self.assertEqual(mock_download.call_count, 1)
+        self.assertEqual(results[0][1]['Close'].tolist(), [100.0, 110.0])
+        self.assertEqual(results[1][1]['Date'].tolist(), ['2023-01-01'])
+        self.assertEqual(results[2][2]['Ticker'].tolist(), ['DEAD'])
+        self.assertEqual(self.updater.get_symbol_info.call_count, 2)
+
+        mock_download.return_value = pd.DataFrame()
+        self.assertEqual(self.updater.process_ticker_batch((0, 1, ['AAPL', 'MSFT'])), [])
+        self.assertEqual(processed.value, 5)
+
+    def test_process_ticker_with_fresh_metadata(self):
+        self.updater.get_symbol_info = Mock()
+        self.updater.get_symbol_history = Mock(return_value=pd.DataFrame({
+            'Ticker': ['AAPL'], 'Date': ['2023-01-01'], 'Close': [105.0]
+        }))
+        self.updater.fresh_metadata = {'AAPL'}
+
+        # Test function
+        info, history, excluded = self.updater.process_ticker((0, 1, 'AAPL'))
+        self.assertTrue(info.empty)
+        self.assertEqual(history['Close'].tolist(), [105.0])
+        self.assertTrue(excluded.empty)
+        self.updater.get_symbol_info.assert_not_called()
+
+    def test_save_results(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            self.updater.data_loader = DataLoader(data_dir, backend='csv')
+            price_store = Price_Store(data_dir)
+            metadata_cache = Metadata_Cache(data_dir)
+            results = [
+                (pd.DataFrame({'Ticker': ['AAPL'], 'shortName': ['Apple']}),
+                 pd.DataFrame({'Ticker': ['AAPL'], 'Date': ['2024-01-01'], 'Close': [105.0]}),
+                 pd.DataFrame()),
+                (pd.DataFrame({'Ticker': ['OLD']}),
+                 pd.DataFrame({'Ticker': ['OLD'], 'Date': ['2023-01-01'], 'Close': [5.0]}),
+                 pd.DataFrame()),
+                (pd.DataFrame(), pd.DataFrame(), pd.DataFrame({'Ticker': ['NONE']}))
+            ]
+
+            # Test function
+            current_data, exclude_tickers, saved = self.updater.save_results(
+                results, '2024-01-01', price_store, metadata_cache,
+                pd.DataFrame({'Ticker': ['AAPL'], 'shortName': ['Apple Inc']}),
+                pd.DataFrame(columns=['Ticker'])
+            )
+            self.assertEqual(saved, 1)
+            self.assertEqual(current_data['shortName'].tolist(), ['Apple'])
+            self.assertEqual(exclude_tickers['Ticker'].tolist(), ['NONE'])
+            self.assertEqual(Price_Store(data_dir).price('AAPL', '2024-01-01'), 105.0)
+            self.assertIsNone(Price_Store(data_dir).price('OLD', '2023-01-01'))
+            self.assertEqual(Metadata_Cache(data_dir).fresh_tickers(['AAPL', 'OLD']), {'AAPL'})
+
+
+class TestFinancialInstrumentsResume(unittest.TestCase):
+    """
+    End-to-end runs of the refresh with a pool and a fake Yahoo Finance, which
+    logs the requested tickers to a file, as the pool workers are processes.
+    """
+    def setUp(self):
+        self.month = current_month()
+        self.previous_month = (pd.Timestamp(self.month) - pd.DateOffset(months=1)).strftime('%Y-%m-%d')
+
+    def run_refresh(self, data_dir, interrupt_at=None):
+        updater = Financial_Instruments_Updater(rate_limiter=Rate_Limiter(max_concurrency=1),
+                                                batch_size=2, data_dir=data_dir)
+        log_path = os.path.join(data_dir, "requested.txt")
+        month, previous_month = self.month, self.previous_month
+
+        def get_batch_history(self, tickers, start=None):
+            with open(log_path, "a") as log_file:
+                log_file.write("".join(f"{ticker}\n" for ticker in tickers))
+            # OLD was delisted, its history does not reach the current month
+            return {ticker: pd.DataFrame({
+                'Ticker': ticker, 'Date': [previous_month] if ticker == 'OLD' else [previous_month, month],
+                'Close': [float(len(ticker))] if ticker == 'OLD' else [float(len(ticker)), 2.0 * len(ticker)]
+            }) for ticker in tickers}
+
+        def get_symbol_history(self, ticker, symbol=None, full=False):
+            return get_batch_history(self, [ticker])[ticker]
+
+        def get_symbol_info(self, ticker, symbol=None):
+            return pd.DataFrame({'Ticker': [ticker], 'quoteType': ['EQUITY'], 'sectorKey': ['technology']})
+
+        save_results = Financial_Instruments_Updater.save_results
+        checkpoints = []
+
+        def interrupted_save_results(self, *args):
+            checkpoints.append(len(checkpoints))
+            if len(checkpoints) == interrupt_at:
+                raise KeyboardInterrupt("interrupted")
+            return save_results(self, *args)
+
+        with patch.object(Financial_Instruments_Updater, 'get_batch_history', get_batch_history), \
+                patch.object(Financial_Instruments_Updater, 'get_symbol_history', get_symbol_history), \
+                patch.object(Financial_Instruments_Updater, 'get_symbol_info', get_symbol_info), \
+                patch.object(Financial_Instruments_Updater, 'save_results', interrupted_save_results):
+            try:
+                updater.update_financial_instruments(checkpoint_size=2)
+            except KeyboardInterrupt:
+                pass
+
+        with open(log_path) as log_file:
+            requested = log_file.read().split()
+        os.remove(log_path)
+
+        return requested
+
+    def create_data_dir(self):
+        data_dir = temporary_data_dir(self)
+        DataLoader(data_dir, backend='csv').save("senators_trading", pd.DataFrame({
+            'Ticker': ['AAPL', 'OLD', 'MSFT', 'TSLA'],
+            'Politician': ['John Doe'] * 4, 'Party': ['D'] * 4, 'Chamber': ['Senate'] * 4,
+            'Traded': ['2024-01-01'] * 4, 'Filed': ['2024-02-01'] * 4,
+            'Transaction': ['Purchase'] * 4, 'Invested': [1000.0] * 4
+        }))
+        return data_dir
+
+    def test_resume_after_checkpoint(self):
+        full_dir = self.create_data_dir()
+        resumed_dir = self.create_data_dir()
+        self.assertEqual(self.run_refresh(full_dir), ['AAPL', 'OLD', 'MSFT', 'TSLA', '^GSPC'])
+
+        # Test function
+        self.assertEqual(self.run_refresh(resumed_dir, interrupt_at=2), ['AAPL', 'OLD', 'MSFT', 'TSLA', '^GSPC'])
+        self.assertEqual(Refresh_Journal(resumed_dir, self.month).done, {'AAPL', 'OLD'})
+        self.assertEqual(self.run_refresh(resumed_dir), ['MSFT', 'TSLA', '^GSPC'])
+        self.assertFalse(os.path.exists(os.path.join(resumed_dir, "financial_refresh_journal.csv")))
+
+        for name in ["financial_instruments", "financial_prices"]:
+            full = pd.read_csv(os.path.join(full_dir, f"{name}.csv"))
+            resumed = pd.read_csv(os.path.join(resumed_dir, f"{name}.csv"))
+            pd.testing.assert_frame_equal(resumed.sort_values(list(resumed.columns)).reset_index(drop=True),
+                                          full.sort_values(list(full.columns)).reset_index(drop=True))
+        self.assertIsNone(Price_Store(resumed_dir).price('OLD', self.previous_month))
+
 
 class TestSenatorsInformation(unittest.TestCase):
     def setUp(self):
-        self.updater = Senators_Information_Updater()
+        self.updater = Senators_Information_Updater(data_dir=temporary_data_dir(self))
 
     @patch('wikipedia.page')
     def test_process_senator(self, mock_wiki_page):
@@ -121,3 +369,64 @@ class TestSenatorsInformation(unittest.TestCase):
         # Test function
         result = self.updater.process_senator((0, 1, "Nonexistent Senator", "Senate"))
         self.assertIsNone(result)
+
+    @patch('Src.scraping.scraper.fetch_revisions')
+    def test_update_senators_information_uses_cache(self, mock_fetch_revisions):
+        with tempfile.TemporaryDirectory() as data_dir:
+            self.updater.data_loader = DataLoader(data_dir, backend='csv')
+            self.updater.data_loader.save("senators_trading", pd.DataFrame({
+                'Politician': ['John Doe', 'Jane Roe', 'Max Moe'], 'Chamber': ['Senate'] * 3
+            }))
+            self.updater.data_loader.save("senators_information", pd.DataFrame({
+                'Politician': ['John Doe', 'Jane Roe'], 'Information': ['Old', 'Old'],
+                'Link': ['-', '-'], 'Picture': ['-', '-']
+            }))
+            cache = Wiki_Cache(data_dir, clock=lambda: pd.Timestamp.now() - pd.Timedelta(days=60))
+            cache.record('John Doe', 'John Doe', 1)
+            cache.record('Jane Roe', 'Jane Roe', 1)
+            cache.save()
+            mock_fetch_revisions.return_value = {'John Doe': 1, 'Jane Roe': 2}
+            self.updater.process_senator = Mock(side_effect=lambda args: pd.DataFrame([{
+                'Politician': args[2], 'Information': 'New', 'Link': '-', 'Picture': '-',
+                'Title': args[2], 'Revision': 2
+            }]))
+
+            # Test function
+            self.updater.update_senators_information()
+            fetched = sorted(call.args[0][2] for call in self.updater.process_senator.call_args_list)
+            self.assertEqual(fetched, ['Jane Roe', 'Max Moe'])
+            data = self.updater.data_loader.load_senators_information().set_index('Politician')
+            self.assertEqual(data['Information'].to_dict(),
+                             {'John Doe': 'Old', 'Jane Roe': 'New', 'Max Moe': 'New'})
+
+            self.updater.process_senator.reset_mock()
+            self.updater.update_senators_information()
+            self.updater.process_senator.assert_not_called()
+
+    @patch('Src.scraping.scraper.fetch_revisions')
+    def test_update_senators_information_seeds_cache(self, mock_fetch_revisions):
+        with tempfile.TemporaryDirectory() as data_dir:
+            self.updater.data_loader = DataLoader(data_dir, backend='csv')
+            self.updater.data_loader.save("senators_trading", pd.DataFrame({
+                'Politician': ['John Doe', 'Jane Roe', 'Max Moe'], 'Chamber': ['Senate'] * 3
+            }))
+            self.updater.data_loader.save("senators_information", pd.DataFrame({
+                'Politician': ['John Doe', 'Jane Roe', 'Max Moe'], 'Information': ['Old'] * 3,
+                'Link': ['https://en.wikipedia.org/wiki/John_Doe', 'https://en.wikipedia.org/wiki/Jane_Roe', '-'],
+                'Picture': ['-'] * 3
+            }))
+            mock_fetch_revisions.side_effect = lambda titles: {
+                title: 7 for title in titles if title == 'John Doe'
+            }
+            self.updater.process_senator = Mock(side_effect=lambda args: pd.DataFrame([{
+                'Politician': args[2], 'Information': 'New', 'Link': '-', 'Picture': '-',
+                'Title': args[2], 'Revision': 2
+            }]))
+
+            # Test function
+            self.updater.update_senators_information()
+            fetched = sorted(call.args[0][2] for call in self.updater.process_senator.call_args_list)
+            self.assertEqual(fetched, ['Jane Roe', 'Max Moe'])
+            cache = Wiki_Cache(data_dir)
+            self.assertEqual(cache.entries.at['John Doe', 'Revision'], 7)
+            self.assertEqual(cache.missing(['John Doe', 'Jane Roe', 'Max Moe']), [])
@@ -1,16 +1,20 @@
 """
 This is a test file for the scraper_utils.py file.
 """
+import os
+import json
 
 import pytest
+import numpy as np
 import pandas as pd
 
+from Src.scraping.price_store import Price_Store
 from Src.scraping.scraper_utils import (
     get_last_current_data, delete_exclude_tickers,
     senators_data_preparation, fin_history_preparation,
     fin_info_preparation, fin_ticker_preparation,
     is_data_up_to_date, add_to_exclude_tickers,
-    get_profile_picture
+    get_profile_picture, replace_file, save_array, save_json
 )
 
 
@@ -251,6 +255,34 @@ def test_is_data_up_to_date(sample_current_data):
     assert not result
 
 
+def test_is_data_up_to_date_long_layout():
+    current_month = pd.Timestamp.today().replace(day=1).strftime('%Y-%m-%d')
+    current_prices = pd.DataFrame({
+        "Ticker": ["AAPL", "AAPL", "GOOG"],
+        "Date": ["2025-01-01", current_month, "2025-01-01"],
+        "Close": [134.57, 150.00, 2750.00]
+    })
+
+    # Test function
+    assert is_data_up_to_date(current_prices, "AAPL")
+    assert not is_data_up_to_date(current_prices, "GOOG")
+
+
+def test_is_data_up_to_date_price_store(tmp_path):
+    current_month = pd.Timestamp.today().replace(day=1).strftime('%Y-%m-%d')
+    price_store = Price_Store(str(tmp_path))
+    price_store.append(pd.DataFrame({
+        "Ticker": ["AAPL", "AAPL", "GOOG"],
+        "Date": ["2025-01-01", current_month, "2025-01-01"],
+        "Close": [134.57, 150.00, 2750.00]
+    }))
+
+    # Test function
+    assert is_data_up_to_date(price_store, "AAPL")
+    assert not is_data_up_to_date(price_store, "GOOG")
+    assert not is_data_up_to_date(price_store, "TSLA")
+
+
 def test_add_to_exclude_tickers():
     df = pd.DataFrame({"Ticker": ["AAPL", "GOOG", "MSFT"]})
 
@@ -296,3 +328,20 @@ def test_get_profile_picture():
     # Test function
     result = get_profile_picture(images)
     assert result == "http://example.com/profile1.jpg", "Should return the first valid image"
+
+
+def test_replace_file(tmp_path):
+    # Test function
+    save_array(str(tmp_path / "matrix.npy"), np.arange(3.0))
+    save_json(str(tmp_path / "index.json"), {"tickers": ["AAPL"]})
+    np.testing.assert_array_equal(np.load(tmp_path / "matrix.npy"), [0.0, 1.0, 2.0])
+    with open(tmp_path / "index.json") as index_file:
+        assert json.load(index_file) == {"tickers": ["AAPL"]}
+
+    def failing_write(file):
+        file.write(b"partial")
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        replace_file(str(tmp_path / "index.json"), failing_write)
+    assert sorted(os.listdir(tmp_path)) == ["index.json", "matrix.npy"]
@@ -0,0 +1,115 @@
+"""
+This is a test file for the storage.py file.
+"""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from Src.scraping.scraper import DataLoader
+from Src.scraping.storage import (
+    apply_schema, to_legacy, get_storage, CSV_Storage, Parquet_Storage
+)
+
+
+@pytest.fixture
+def trading_data():
+    return pd.DataFrame({
+        'Ticker': ['AAPL', 'MSFT', 'AAPL'],
+        'Politician': ['John Doe', 'Jane Roe', 'John Doe'],
+        'Party': ['D', 'R', 'D'],
+        'Chamber': ['Senate', 'House', 'Senate'],
+        'Transaction': ['Purchase', 'Sale', 'Purchase'],
+        'Traded': ['2023-01-01', '2023-01-02', '2023-01-03'],
+        'Filed': ['2023-02-01', '2023-02-02', '2023-02-03'],
+        'Invested': [8000.5, -8000.5, 32500.0]
+    })
+
+
+@pytest.fixture
+def instruments_data():
+    return pd.DataFrame({
+        'Ticker': ['AAPL', 'MSFT'],
+        'quoteType': ['EQUITY', 'EQUITY'],
+        'shortName': ['Apple', 'Microsoft'],
+        '2023-01-01': [134.57, 250.12],
+        '2023-02-01': [np.nan, 260.5]
+    })
+
+
+def test_apply_schema(trading_data, instruments_data):
+    # Test function
+    typed = apply_schema(trading_data, "senators_trading")
+    assert isinstance(typed['Politician'].dtype, pd.CategoricalDtype)
+    assert isinstance(typed['Ticker'].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(typed['Traded'])
+    assert typed['Invested'].dtype == np.float64
+
+    typed_instruments = apply_schema(instruments_data, "financial_instruments")
+    assert typed_instruments['2023-01-01'].dtype == np.float32
+    assert typed_instruments['shortName'].dtype == object
+
+
+def test_to_legacy_round_trip(trading_data):
+    # Test function
+    result = to_legacy(apply_schema(trading_data, "senators_trading"))
+    pd.testing.assert_frame_equal(result, trading_data)
+
+
+def test_parquet_storage_imports_csv(trading_data, tmp_path):
+    trading_data.to_csv(tmp_path / "senators_trading.csv", index=False)
+    storage = Parquet_Storage(str(tmp_path))
+
+    # Test function
+    result = storage.read("senators_trading", columns=["Ticker"])
+    assert os.path.exists(tmp_path / "senators_trading.parquet")
+    pd.testing.assert_frame_equal(result, trading_data)
+
+    typed = storage.read("senators_trading", columns=["Ticker"], typed=True)
+    assert isinstance(typed['Party'].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(typed['Filed'])
+
+
+def test_parquet_storage_reimports_newer_csv(trading_data, tmp_path):
+    trading_data.to_csv(tmp_path / "senators_trading.csv", index=False)
+    storage = Parquet_Storage(str(tmp_path))
+    storage.read("senators_trading", columns=["Ticker"])
+    time.sleep(0.01)
+    trading_data.iloc[:1].to_csv(tmp_path / "senators_trading.csv", mode="a", header=False, index=False)
+
+    # Test function
+    assert not storage.is_up_to_date("senators_trading")
+    assert len(storage.read("senators_trading", columns=["Ticker"])) == 4
+    assert storage.is_up_to_date("senators_trading")
+
+
+def test_parquet_storage_write_exports_csv(instruments_data, tmp_path):
+    storage = Parquet_Storage(str(tmp_path))
+
+    # Test function
+    storage.write("financial_instruments", instruments_data)
+    exported = pd.read_csv(tmp_path / "financial_instruments.csv")
+    assert exported['2023-01-01'].tolist() == [134.57, 250.12]
+    result = storage.read("financial_instruments", columns=["Ticker"])
+    assert result['2023-02-01'].dtype == np.float32
+    assert result['Ticker'].tolist() == ['AAPL', 'MSFT']
+
+
+def test_get_storage(monkeypatch, tmp_path):
+    # Test function
+    assert type(get_storage("csv", str(tmp_path))) is CSV_Storage
+    monkeypatch.setenv("SENATORS_STORAGE", "parquet")
+    assert type(get_storage(None, str(tmp_path))) is Parquet_Storage
+    with pytest.raises(ValueError):
+        get_storage("sqlite", str(tmp_path))
+
+
+def test_data_loader_backends_agree(trading_data, tmp_path):
+    trading_data.to_csv(tmp_path / "senators_trading.csv", index=False)
+
+    # Test function
+    from_csv = DataLoader(str(tmp_path), backend="csv").load_senators_trading()
+    from_parquet = DataLoader(str(tmp_path), backend="parquet").load_senators_trading()
+    pd.testing.assert_frame_equal(from_csv, from_parquet)
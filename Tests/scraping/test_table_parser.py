@@ -0,0 +1,108 @@
+"""
+This is a test file for the table_parser.py file. The parser backends are
+checked for parity with the BeautifulSoup extractor on a recorded page.
+"""
+import os
+
+import pytest
+from bs4 import BeautifulSoup
+
+from Src.scraping.table_parser import (
+    TABLE_PARSERS, get_table_parser, parse_table_bs4, parse_table_stream,
+    bs4_row_record, RECORD_FIELDS
+)
+from Src.scraping.scraper import Senators_Trading_Updater
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "trading_table.html")
+
+
+@pytest.fixture
+def html_content():
+    with open(FIXTURE_PATH, encoding="utf-8") as fixture:
+        return fixture.read()
+
+
+def test_bs4_parser_matches_row_extractor(html_content):
+    rows = BeautifulSoup(html_content, 'html.parser').find_all('tr', class_='data-table__row')
+    expected = [record for record in map(bs4_row_record, rows) if record is not None]
+
+    # Test function
+    records = parse_table_bs4(html_content)
+    assert records == expected
+    assert [record['Ticker'] for record in records] == ['AAPL', 'BRK.B', 'MSFT', 'NVDA', 'T']
+    assert records[2]['Chamber'] == 'Senate'
+    assert records[1]['Transaction'] == 'Sale'
+    assert all(list(record) == RECORD_FIELDS for record in records)
+
+
+@pytest.mark.parametrize("name", sorted(TABLE_PARSERS))
+def test_parser_parity(name, html_content):
+    # Test function
+    assert TABLE_PARSERS[name](html_content) == parse_table_bs4(html_content)
+
+
+@pytest.mark.parametrize("name", sorted(TABLE_PARSERS))
+def test_parser_parity_bare_rows(name, html_content):
+    # Rows sent without the surrounding table element
+    body = html_content[html_content.index("<tbody>") + 7:html_content.index("</tbody>")]
+
+    # Test function
+    assert TABLE_PARSERS[name](body) == parse_table_bs4(html_content)
+
+
+TRADE_ROW = (
+    '<tr class="data-table__row"><td data-title="Stock">{ticker}</td>'
+    '<td data-title="Politician"><a>John Doe</a><abbr>D</abbr><div><small>Senate</small></div></td>'
+    '<td data-title="Transaction"><span>Purchase</span><div><small>$15,000 - $50,000</small></div></td>'
+    '<td data-title="Traded"><div>Jan 01, 2023</div></td>'
+    '<td data-title="Filed"><div>Feb 01, 2023</div></td></tr>'
+)
+MALFORMED_ROWS = {
+    "unclosed cell": ('<td data-title="Stock">{ticker}</td>', '<td data-title="Stock">{ticker}'),
+    "stray span": ('<abbr>D</abbr>', '<abbr>D</abbr></span>'),
+    "stray span in cell": ('{ticker}</td>', '{ticker}</span></td>'),
+    "unclosed div": ('Jan 01, 2023</div>', 'Jan 01, 2023'),
+    "unclosed row": ('</td></tr>', '</td>'),
+    "stray row end": ('{ticker}</td>', '{ticker}</td></tr>')
+}
+
+
+@pytest.mark.parametrize("name", sorted(TABLE_PARSERS))
+@pytest.mark.parametrize("malformation", sorted(MALFORMED_ROWS))
+def test_parser_parity_malformed_rows(name, malformation):
+    old, new = MALFORMED_ROWS[malformation]
+    html_content = "<table><tbody>{}{}</tbody></table>".format(
+        TRADE_ROW.replace(old, new).format(ticker="AAPL"), TRADE_ROW.format(ticker="MSFT")
+    )
+
+    # Test function
+    records = parse_table_bs4(html_content)
+    assert TABLE_PARSERS[name](html_content) == records
+    assert [record['Ticker'] for record in records] == (
+        ['MSFT'] if malformation == "stray row end" else ['AAPL', 'MSFT']
+    )
+
+
+def test_stream_parser_empty_payload():
+    # Test function
+    assert parse_table_stream("<table></table>") == []
+
+
+def test_get_table_parser(monkeypatch):
+    # Test function
+    assert get_table_parser("stream") is parse_table_stream
+    monkeypatch.setenv("SENATORS_TABLE_PARSER", "bs4")
+    assert get_table_parser() is parse_table_bs4
+    with pytest.raises(ValueError):
+        get_table_parser("regex")
+
+
+def test_extract_page_data(html_content, tmp_path):
+    updater = Senators_Trading_Updater(parser="stream", data_dir=str(tmp_path))
+    exclude_tickers = updater.data_loader.load_exclude_tickers().iloc[0:0]
+
+    # Test function
+    result = updater.extract_page_data(html_content, exclude_tickers)
+    assert result['Ticker'].tolist() == ['AAPL', 'BRK.B', 'MSFT', 'NVDA', 'T']
+    assert result['Chamber'].tolist() == ['Senate', 'House', 'Senate', 'Senate', 'House']
+    assert result['Traded'].tolist()[0] == '2024-01-03'
@@ -0,0 +1,120 @@
+"""
+This is a test file for the trading_sync.py file.
+"""
+import os
+
+import pytest
+import pandas as pd
+
+from Src.scraping.scraper import DataLoader
+from Src.scraping.trading_sync import Trading_Sync, trade_hashes
+
+
+@pytest.fixture
+def trading_data():
+    return pd.DataFrame({
+        'Ticker': ['AAPL', 'MSFT', 'TSLA'],
+        'Politician': ['John Doe', 'Jane Roe', 'John Doe'],
+        'Party': ['D', 'R', 'D'],
+        'Chamber': ['Senate', 'House', 'Senate'],
+        'Transaction': ['Purchase', 'Sale', 'Purchase'],
+        'Traded': ['2023-01-01', '2023-01-02', '2023-01-03'],
+        'Filed': ['2023-02-01', '2023-02-02', '2023-02-03'],
+        'Invested': [8000.5, -8000.5, 32500.0]
+    })
+
+
+def test_trade_hashes_stable_across_csv_round_trip(trading_data, tmp_path):
+    path = tmp_path / "senators_trading.csv"
+    trading_data.to_csv(path, index=False)
+
+    # Test function
+    hashes = trade_hashes(trading_data)
+    assert len(set(hashes.tolist())) == 3
+    assert (hashes == trade_hashes(pd.read_csv(path))).all()
+
+
+def test_trade_hashes_ignore_party_and_chamber(trading_data):
+    changed = trading_data.assign(Party='I')
+
+    # Test function
+    assert (trade_hashes(trading_data) == trade_hashes(changed)).all()
+    assert trade_hashes(trading_data.assign(Invested=1.0))[0] != trade_hashes(trading_data)[0]
+
+
+def test_new_records_and_commit(trading_data, tmp_path):
+    trading_data.iloc[1:].to_csv(tmp_path / "senators_trading.csv", index=False)
+    trading_sync = Trading_Sync(DataLoader(str(tmp_path)))
+
+    # Test function
+    page_data = pd.concat([trading_data.iloc[:1]] * 2 + [trading_data.iloc[1:]], ignore_index=True)
+    new_data, page_known = trading_sync.new_records(page_data)
+    assert not page_known
+    assert new_data['Ticker'].tolist() == ['AAPL', 'AAPL']
+    assert trading_sync.has_known_records()
+
+    trading_sync.commit(new_data)
+    stored = pd.read_csv(tmp_path / "senators_trading.csv")
+    assert stored['Ticker'].tolist() == ['AAPL', 'AAPL', 'MSFT', 'TSLA']
+
+    trading_sync = Trading_Sync(DataLoader(str(tmp_path)))
+    new_data, page_known = trading_sync.new_records(page_data)
+    assert page_known
+    assert new_data.empty
+
+
+def test_commit_keeps_hash_store_when_dataset_write_fails(trading_data, tmp_path, monkeypatch):
+    trading_data.iloc[1:].to_csv(tmp_path / "senators_trading.csv", index=False)
+    trading_sync = Trading_Sync(DataLoader(str(tmp_path)))
+    hash_store = (tmp_path / "senators_trading_hashes.bin").read_bytes()
+
+    def failing_save(name, data):
+        raise OSError("disk full")
+    monkeypatch.setattr(trading_sync.data_loader, "save", failing_save)
+
+    # Test function
+    new_data, _ = trading_sync.new_records(trading_data)
+    with pytest.raises(OSError):
+        trading_sync.commit(new_data)
+    assert (tmp_path / "senators_trading_hashes.bin").read_bytes() == hash_store
+    assert pd.read_csv(tmp_path / "senators_trading.csv")['Ticker'].tolist() == ['MSFT', 'TSLA']
+    assert Trading_Sync(DataLoader(str(tmp_path))).new_records(trading_data)[0]['Ticker'].tolist() == ['AAPL']
+
+
+def test_new_records_counts_identical_trades_across_pages(trading_data, tmp_path):
+    trading_data.iloc[:1].to_csv(tmp_path / "senators_trading.csv", index=False)
+    trading_sync = Trading_Sync(DataLoader(str(tmp_path)))
+
+    # Test function
+    assert not trading_sync.has_known_records()
+    new_data, page_known = trading_sync.new_records(trading_data.iloc[:1])
+    assert page_known and new_data.empty
+    new_data, page_known = trading_sync.new_records(trading_data.iloc[:1])
+    assert not page_known
+    assert new_data['Ticker'].tolist() == ['AAPL']
+
+
+def test_hashes_rebuilt_when_dataset_changes(trading_data, tmp_path):
+    path = tmp_path / "senators_trading.csv"
+    trading_data.iloc[:1].to_csv(path, index=False)
+    Trading_Sync(DataLoader(str(tmp_path)))
+    trading_data.to_csv(path, index=False)
+    os.utime(path, (os.path.getmtime(path) + 10, os.path.getmtime(path) + 10))
+
+    # Test function
+    trading_sync = Trading_Sync(DataLoader(str(tmp_path)))
+    assert len(trading_sync.known_hashes) == 3
+
+
+def test_prune_removes_excluded_tickers(trading_data, tmp_path):
+    path = tmp_path / "senators_trading.csv"
+    trading_data.to_csv(path, index=False)
+    trading_sync = Trading_Sync(DataLoader(str(tmp_path)))
+    exclude_tickers = pd.DataFrame({'Ticker': ['TSLA']})
+    exclude_tickers.to_csv(tmp_path / "exclude_tickers.csv", index=False)
+    os.utime(tmp_path / "exclude_tickers.csv", (os.path.getmtime(path) + 10, os.path.getmtime(path) + 10))
+
+    # Test function
+    trading_sync.prune(exclude_tickers)
+    assert pd.read_csv(path)['Ticker'].tolist() == ['AAPL', 'MSFT']
+    assert len(trading_sync.known_hashes) == 2
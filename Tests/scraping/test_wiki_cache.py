@@ -0,0 +1,79 @@
+"""
+This is a test file for the wiki_cache.py file.
+"""
+from unittest.mock import patch, Mock
+
+import pandas as pd
+
+from Src.scraping.wiki_cache import Wiki_Cache, fetch_revisions, link_title
+
+
+def test_missing_and_expired(tmp_path, date_clock):
+    cache = Wiki_Cache(str(tmp_path), ttl=30, clock=date_clock)
+    cache.record('John Doe', 'John Doe (politician)', 123)
+    cache.record('Jane Roe')
+    date_clock.now += pd.Timedelta(days=10)
+    cache.record('Max Moe', 'Max Moe', 456)
+
+    # Test function
+    politicians = ['John Doe', 'Jane Roe', 'Max Moe', 'New Person']
+    assert cache.missing(politicians) == ['New Person']
+    assert cache.expired(politicians) == []
+    date_clock.now += pd.Timedelta(days=25)
+    assert cache.expired(politicians) == ['John Doe', 'Jane Roe']
+    cache.touch(['John Doe'])
+    assert cache.expired(politicians) == ['Jane Roe']
+    assert cache.title('John Doe') == 'John Doe (politician)'
+    assert cache.title('Jane Roe') is None
+
+
+def test_save_and_keep(tmp_path, date_clock):
+    cache = Wiki_Cache(str(tmp_path), clock=date_clock)
+    cache.record('John Doe', 'John Doe', 123)
+    cache.record('Max Moe', 'Max Moe', 456)
+    cache.record('Jane Roe')
+    cache.save()
+
+    # Test function
+    loaded = Wiki_Cache(str(tmp_path), clock=date_clock)
+    assert loaded.entries.at['John Doe', 'Revision'] == 123
+    assert loaded.expired(['John Doe', 'Jane Roe']) == []
+    loaded.keep(['John Doe'])
+    assert loaded.missing(['John Doe', 'Max Moe', 'Jane Roe']) == ['Max Moe']
+
+
+def test_link_title():
+    # Test function
+    assert link_title('https://en.wikipedia.org/wiki/John_Doe_(politician)') == 'John Doe (politician)'
+    assert link_title('https://en.wikipedia.org/wiki/Ren%C3%A9e_Roe') == 'Renée Roe'
+    assert link_title('https://en.wikipedia.org/wiki/') is None
+    assert link_title('-') is None
+    assert link_title(float('nan')) is None
+
+
+def test_seed_titles(tmp_path, date_clock):
+    cache = Wiki_Cache(str(tmp_path), clock=date_clock)
+    cache.record('Max Moe', 'Max Moe', 456)
+    information = pd.DataFrame({
+        'Politician': ['John Doe', 'Jane Roe', 'Max Moe', 'No Link'],
+        'Information': ['Senator', None, 'Senator', 'Senator'],
+        'Link': ['https://en.wikipedia.org/wiki/John_Doe', 'https://en.wikipedia.org/wiki/Jane_Roe',
+                 'https://en.wikipedia.org/wiki/Max_Moe', None]
+    })
+
+    # Test function
+    assert cache.seed_titles(information) == {'John Doe': 'John Doe'}
+    assert cache.seed_titles(information[['Politician']]) == {}
+
+
+@patch('requests.get')
+def test_fetch_revisions(mock_get):
+    mock_get.return_value = Mock(json=Mock(return_value={'query': {'pages': [
+        {'title': 'John Doe', 'revisions': [{'revid': 123}]},
+        {'title': 'Nobody', 'missing': True}
+    ]}}))
+
+    # Test function
+    assert fetch_revisions(['John Doe', 'Nobody', 'Max Moe'], batch_size=2) == {'John Doe': 123}
+    assert mock_get.call_count == 2
+    assert mock_get.call_args_list[0].kwargs['params']['titles'] == 'John Doe|Nobody'
@@ -2,12 +2,15 @@
 This is a test file for the test_align_your_investment_strategy.py file.
 """
 import pytest
+import numpy as np
 import pandas as pd
 from unittest.mock import patch
 
+from Src.clustering.cluster import Strategy_Clusters
+from Src.streamlit.data_layer import Data_Layer
 from Src.streamlit.align_your_investment_strategy import (
     load_and_merge_data, get_unique_sectors_and_instruments,
-    chunk_list
+    chunk_list, strategy_style_message
 )
 
 
@@ -42,7 +45,22 @@ def mock_data_loader():
         yield
 
 
-def test_load_and_merge_data():
+@pytest.fixture
+def data_layer(tmp_path):
+    # Fixture to use a data layer over temporary datasets
+    pd.DataFrame({
+        'Ticker': ['AAPL', 'GOOG', 'AMZN', 'XYZ'],
+        'Politician': ['John Doe', 'Jane Roe', 'John Doe', 'Jane Roe']
+    }).to_csv(tmp_path / "senators_trading.csv", index=False)
+    data_instruments = MockDataLoader().load_financial_instruments()
+    data_instruments['sectorKey'] = ['Tech', 'Tech', 'Unknown']
+    data_instruments.to_csv(tmp_path / "financial_instruments.csv", index=False)
+    with patch('Src.streamlit.align_your_investment_strategy.get_data_layer',
+               return_value=Data_Layer(str(tmp_path))):
+        yield
+
+
+def test_load_and_merge_data(data_layer):
     data_sector, data_instruments = load_and_merge_data()
 
     # Test function
@@ -99,3 +117,17 @@ def test_chunk_list():
     result_1 = list(chunk_list(lst, 1))
     expected_result_1 = [["a"], ["b"], ["c"], ["d"], ["e"], ["f"], ["g"]]
     assert result_1 == expected_result_1
+
+
+def test_strategy_style_message():
+    clusters = Strategy_Clusters("quoteType", ["A", "B", "C"], ["EQUITY", "ETF"],
+                                 np.array([0, 0, 1]), np.array([[95.0, 5.0], [0.0, 100.0]]))
+
+    # Test function
+    message = strategy_style_message(clusters, 0)
+    assert "shared by 2 politicians (e.g. A, B)" in message
+    assert message.endswith("95.0 % into EQUITY.")
+    assert strategy_style_message(clusters, 1) == (
+        "Your strategy is the closest to the trading style of C, who puts 100.0 % into ETF."
+    )
+    assert strategy_style_message(clusters, -1) == ""
@@ -0,0 +1,130 @@
+"""
+This is a test file for the data_layer.py file.
+"""
+import os
+
+import pytest
+import pandas as pd
+
+from Src.clustering.allocations import refresh_allocation_matrices
+from Src.scraping.politician_summary import refresh_politician_summary
+from Src.scraping.scraper import DataLoader
+from Src.streamlit.data_layer import Data_Layer
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    pd.DataFrame({
+        'Ticker': ['AAPL', 'MSFT', 'XYZ'],
+        'Politician': ['John Doe', 'Jane Roe', 'John Doe'],
+        'Transaction': ['Purchase', 'Sale', 'Purchase'],
+        'Invested': [1000.0, -500.0, 250.0]
+    }).to_csv(tmp_path / "senators_trading.csv", index=False)
+    pd.DataFrame({
+        'Ticker': ['AAPL', 'MSFT'],
+        'quoteType': ['EQUITY', 'EQUITY'],
+        'shortName': ['Apple', 'Microsoft'],
+        'sectorKey': ['technology', 'technology']
+    }).to_csv(tmp_path / "financial_instruments.csv", index=False)
+    pd.DataFrame({
+        'Politician': ['John Doe'],
+        'Information': ['Senator from Nowhere.'],
+        'Link': ['https://en.wikipedia.org/wiki/John_Doe'],
+        'Picture': ['https://example.com/john_doe.jpg']
+    }).to_csv(tmp_path / "senators_information.csv", index=False)
+    return str(tmp_path)
+
+
+def test_merged_data(data_dir):
+    data_layer = Data_Layer(data_dir)
+
+    # Test function
+    data = data_layer.merged_data()
+    assert len(data) == 3
+    assert data['sectorKey'].tolist() == ['technology', 'technology', 'Unknown']
+    assert data['country'].eq('Unknown').all()
+    assert data_layer.purchase_data()['Name'].tolist() == ['AAPL - Apple', 'XYZ - Unknown']
+
+
+def test_frames_cached_until_data_changes(data_dir, monkeypatch):
+    data_layer = Data_Layer(data_dir, check_interval=0)
+    data = data_layer.merged_data()
+    data_layer.politician_information('John Doe')
+    loads = []
+    monkeypatch.setattr(DataLoader, 'load', lambda self, name, columns, typed=None: loads.append(name) or pd.DataFrame(columns=columns))
+
+    # Test function
+    assert data_layer.merged_data() is data
+    assert data_layer.politician_information('John Doe')[0] == 'Senator from Nowhere.'
+    assert data_layer.politician_information('Jane Roe') == (None, None, None)
+    assert loads == []
+
+    DataLoader(data_dir, backend="csv").publish_version()
+    os.utime(os.path.join(data_dir, "data_version"), ns=(0, 0))
+    data_layer.merged_data()
+    assert loads == ['financial_instruments', 'senators_trading']
+
+
+def test_politician_picture_prefers_thumbnail(data_dir):
+    thumbnail = os.path.join(data_dir, "john_doe.jpg")
+    information = pd.read_csv(os.path.join(data_dir, "senators_information.csv"))
+    information['Thumbnail'] = thumbnail
+    information.to_csv(os.path.join(data_dir, "senators_information.csv"), index=False)
+
+    # Test function
+    assert Data_Layer(data_dir).politician_information('John Doe')[2] == 'https://example.com/john_doe.jpg'
+    open(thumbnail, "wb").close()
+    assert Data_Layer(data_dir).politician_information('John Doe')[2] == thumbnail
+
+
+def test_politician_summary(data_dir):
+    pd.DataFrame({
+        'Ticker': ['AAPL', 'MSFT'], 'Politician': ['John Doe', 'Jane Roe'], 'Party': ['R', 'D'],
+        'Chamber': ['Senate', 'House'], 'Traded': ['2023-01-01', '2023-02-01'],
+        'Transaction': ['Purchase', 'Sale'], 'Invested': [1000.0, -500.0]
+    }).to_csv(os.path.join(data_dir, "senators_trading.csv"), index=False)
+
+    # Test function
+    summary = Data_Layer(data_dir).politician_summary()
+    assert summary.loc['John Doe', 'TopSector'] == 'technology'
+    assert summary.loc['Jane Roe', 'Sold'] == 500.0
+
+    refresh_politician_summary(DataLoader(data_dir, backend="csv"))
+    stored = summary.reset_index()
+    stored['Invested'] = 1.0
+    stored.to_csv(os.path.join(data_dir, "politician_summary.csv"), index=False)
+    assert Data_Layer(data_dir).politician_summary().loc['John Doe', 'Invested'] == 1.0
+
+    # New trades of a summarised politician make the stored summary stale
+    with open(os.path.join(data_dir, "senators_trading.csv"), "a") as trading_file:
+        trading_file.write("MSFT,John Doe,R,Senate,2023-03-01,Purchase,3000.0\n")
+    assert Data_Layer(data_dir).politician_summary().loc['John Doe', 'Invested'] == 4000.0
+
+
+def test_politician_rows(data_dir):
+    data_layer = Data_Layer(data_dir)
+    data = data_layer.merged_data()
+
+    # Test function
+    assert data['Politician'].tolist() == ['Jane Roe', 'John Doe', 'John Doe']
+    assert data_layer.politician_rows(data, 'John Doe')['Ticker'].tolist() == ['AAPL', 'XYZ']
+    assert data_layer.frames['politician_ranges'] == {'Jane Roe': (0, 1), 'John Doe': (1, 3)}
+    assert data_layer.politician_rows(data, 'Nobody').empty
+    other = data.iloc[::-1]
+    assert data_layer.politician_rows(other, 'John Doe')['Ticker'].tolist() == ['XYZ', 'AAPL']
+
+
+def test_allocation_matrix(data_dir):
+    refresh_allocation_matrices(DataLoader(data_dir, backend="csv"))
+
+    # Test function
+    strategy_type = Data_Layer(data_dir).allocation_matrix("quoteType")
+    assert (strategy_type.politicians, strategy_type.categories) == (["John Doe"], ["EQUITY"])
+    assert strategy_type.matrix.tolist() == [[100.0]]
+
+    # Matrices older than the datasets are rebuilt from the merged data
+    pd.DataFrame({'Ticker': ['AAPL'], 'quoteType': ['ETF'], 'sectorKey': ['technology']})\
+        .to_csv(os.path.join(data_dir, "financial_instruments.csv"), index=False)
+    assert Data_Layer(data_dir).allocation_matrix("quoteType").categories == ["ETF"]
+    assert Data_Layer(data_dir).strategy_scan("quoteType").query({"ETF": 100.0})["Politician"].tolist() == ["John Doe"]
+    assert Data_Layer(data_dir).strategy_clusters("quoteType").members(0) == ["John Doe"]
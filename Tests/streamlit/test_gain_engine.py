@@ -0,0 +1,58 @@
+"""
+This is a test file for the gain_engine.py file.
+"""
+import numpy as np
+import pandas as pd
+
+from Src.scraping.price_store import Price_Store
+from Src.streamlit.gain_engine import Price_Matrix
+
+
+def long_prices():
+    return pd.DataFrame({
+        'Ticker': ['AAPL', 'AAPL', '^GSPC', '^GSPC', '^GSPC', 'NEW'],
+        'Date': ['2023-02-01', '2023-01-01', '2023-01-01', '2023-02-01', '2023-03-01', '2023-03-01'],
+        'Close': [110.0, 100.0, 4000.0, 4200.0, 4400.0, 10.0]
+    })
+
+
+def test_price_matrix_from_long():
+    price_matrix = Price_Matrix.from_long(long_prices())
+
+    # Test function
+    assert price_matrix.months.tolist() == ['2023-01-01', '2023-02-01', '2023-03-01']
+    assert price_matrix.last_prices.tolist() == [110.0, 4400.0, 10.0]
+    assert price_matrix.history('AAPL').to_dict() == {'2023-01-01': 100.0, '2023-02-01': 110.0}
+
+
+def test_trade_gains():
+    price_matrix = Price_Matrix.from_long(long_prices())
+
+    # Test function
+    gains, benchmark_gains = price_matrix.trade_gains(
+        ['AAPL', 'AAPL', 'NEW', 'MISSING'],
+        ['2023-01-15', '2023-02-03', '2023-01-10', '2023-01-10']
+    )
+    np.testing.assert_array_equal(gains, [10.0, 0.0, np.nan, np.nan])
+    np.testing.assert_array_equal(benchmark_gains, [10.0, 4.76, 10.0, 10.0])
+
+
+def test_trade_gains_without_prices():
+    price_matrix = Price_Matrix.from_long(pd.DataFrame(columns=['Ticker', 'Date', 'Close']))
+
+    # Test function
+    gains = price_matrix.gains(['AAPL'], ['2023-01-15'])
+    assert np.isnan(gains).all()
+
+
+def test_price_matrix_from_store(tmp_path):
+    price_store = Price_Store(str(tmp_path))
+    price_store.append(long_prices())
+
+    # Test function
+    price_matrix = Price_Matrix.from_store(str(tmp_path))
+    assert isinstance(price_matrix.prices, np.memmap)
+    assert price_matrix.prices.dtype == np.float32
+    assert price_matrix.column_indices(['2022-12-31', '2023-02-14', '2023-04-01']).tolist() == [-1, 1, -1]
+    gains, _ = price_matrix.trade_gains(['AAPL', 'NEW'], ['2023-01-15', '2023-03-02'])
+    np.testing.assert_array_equal(gains, [10.0, 0.0])
@@ -6,6 +6,8 @@ import pandas as pd
 
 from Src.scraping.scraper import DataLoader
 from Src.streamlit.home_page import general_information
+from Src.streamlit.data_layer import get_data_layer
+from Src.streamlit.gain_engine import Price_Matrix
 
 
 class MockDataLoader:
@@ -22,17 +24,24 @@ class MockDataLoader:
 
     def load_financial_instruments(self):
         return pd.DataFrame({
-            'AAPL': ['2022-01-01'],
-            'GOOGL': ['2022-01-01'],
-            'AMZN': ['2022-01-01'],
-            'Last_Update': ['2023-03-01']
+            'Ticker': ['AAPL', 'GOOGL', 'AMZN'],
+            'shortName': ['Apple', 'Alphabet', 'Amazon']
         })
 
+    def price_matrix(self):
+        return Price_Matrix.from_long(pd.DataFrame({
+            'Ticker': ['AAPL', 'AAPL'], 'Date': ['2023-04-01', '2023-06-01'], 'Close': [150.0, 180.0]
+        }))
+
 
 @pytest.fixture
 def mock_data_loader(monkeypatch):
     monkeypatch.setattr(DataLoader, 'load_senators_trading', MockDataLoader().load_senators_trading)
     monkeypatch.setattr(DataLoader, 'load_financial_instruments', MockDataLoader().load_financial_instruments)
+    get_data_layer().clear()
+    monkeypatch.setattr(get_data_layer(), 'price_matrix', MockDataLoader().price_matrix)
+    yield
+    get_data_layer().clear()
 
 
 def test_general_information(mock_data_loader):
@@ -43,4 +52,4 @@ def test_general_information(mock_data_loader):
     assert unique_tickers == 2
     assert sum_invested == 4500
     assert first_transaction == '2021'
-    assert last_update == 'Last_Update'
+    assert last_update == '2023-06-01'
@@ -2,8 +2,9 @@
 This file contains the Test cases for the politician_finder.py file.
 """
 import pytest
+import numpy as np
 import pandas as pd
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 from Src.streamlit.politician_finder import (
     party_politician, first_trade_politician, last_trade_politician,
@@ -12,8 +13,13 @@ from Src.streamlit.politician_finder import (
     most_traded_sector_politician, most_sold_sector_politician,
     wikipedia_information, chamber_politician,
     individual_invest_politician, most_active_sell,
-    most_active_purchase
+    most_active_purchase, party_name, chamber_name, trade_type_message,
+    trade_volume_message, traded_sector_message, sold_sector_message,
+    similar_politicians
 )
+from Src.clustering.allocations import Allocation_Matrix
+from Src.clustering.strategy_scan import Strategy_Scan
+from Src.streamlit.data_layer import Data_Layer
 
 
 @pytest.fixture
@@ -120,19 +126,44 @@ def test_most_sold_sector_politician_no_sale(sample_data2):
     assert "They did not perform any sales of EQUITY during the documented time period." in result
 
 
-@patch("Src.scraping.scraper.DataLoader")
-def test_wikipedia_information_not_found(mock_data_loader_class):
-    mock_data_loader = MagicMock()
-    mock_data_loader_class.return_value = mock_data_loader
-    mock_data_loader.load_senators_information.return_value = pd.DataFrame(columns=["Politician", "Information", "Link", "Picture"])
+def test_wikipedia_information_not_found(tmp_path):
+    pd.DataFrame(columns=["Politician", "Information", "Link", "Picture"]).to_csv(
+        tmp_path / "senators_information.csv", index=False
+    )
 
     # Test function
-    information, link, picture = wikipedia_information("Nonexistent Politician")
+    with patch("Src.streamlit.politician_finder.get_data_layer", return_value=Data_Layer(str(tmp_path))):
+        information, link, picture = wikipedia_information("Nonexistent Politician")
     assert information is None
     assert link is None
     assert picture is None
 
 
+def test_messages_of_missing_values():
+    # Test function, None for missing trades and NaN in the stored summary
+    assert party_name(None) == "Third Party"
+    assert chamber_name(None) == "Unknown Chamber"
+    for missing in [None, float("nan")]:
+        assert trade_type_message("John Doe", missing).endswith("during documented time period.")
+        assert trade_volume_message(missing) == ""
+        assert traded_sector_message(missing, missing) == "They have not invested in EQUITY either."
+        assert sold_sector_message("John Doe", missing, missing).startswith("They did not perform")
+
+
+@patch("Src.streamlit.politician_finder.get_data_layer")
+def test_similar_politicians(mock_get_data_layer):
+    allocations = Allocation_Matrix("sectorKey", ["A", "B", "C"], ["Energy", "Tech"],
+                                    np.array([[0.0, 100.0], [50.0, 50.0], [100.0, 0.0]]))
+    mock_get_data_layer.return_value.strategy_scan.return_value = Strategy_Scan(allocations)
+
+    # Test function
+    similar = similar_politicians("A", "sectorKey")
+    mock_get_data_layer.return_value.strategy_scan.assert_called_with("sectorKey")
+    assert similar["Politician"].tolist() == ["B"]
+    assert similar["Similarity (%)"].tolist() == [70.7]
+    assert similar_politicians("Nobody", "sectorKey").empty
+
+
 @pytest.fixture
 def sample_data3():
     return pd.DataFrame({
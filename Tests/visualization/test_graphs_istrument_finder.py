@@ -46,3 +46,11 @@ class TestPoliticianGraph(unittest.TestCase):
         self.assertEqual(fig.layout.title.text, f"{self.selected_instrument} - Price graph")
         self.assertEqual(fig.layout.xaxis.title.text, "Date")
         self.assertEqual(fig.layout.yaxis.title.text, "Price")
+
+    def test_generate_graph_from_price_history(self):
+        price_history = pd.Series([150.0, 160.0, 170.0], index=['2022-01-01', '2022-02-01', '2022-03-01'])
+        graph = PoliticianGraph(self.politician_data, self.selected_instrument, price_history)
+
+        # Test function
+        fig = graph.generate_graph()
+        self.assertEqual(list(fig.data[0].y), [150.0, 160.0, 170.0])
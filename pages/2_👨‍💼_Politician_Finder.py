@@ -3,14 +3,13 @@ This file contains the configuration of Streamlit app Politician Finder page.
 """
 import streamlit as st
 
-from Src.scraping.scraper import DataLoader
+from Src.streamlit.data_layer import get_data_layer, politician_rows
 from Src.visualization.graphs_politician_finder import Politician_Data_Visualizer
 from Src.streamlit.politician_finder import (
-    party_politician, first_trade_politician, last_trade_politician,
-    total_invested_politician, total_sold_politician, most_trade_type_politician,
-    most_traded_volume_politician, most_traded_sector_politician,
-    most_sold_sector_politician, most_active_purchase, most_active_sell,
-    section_three_purchase_table, chamber_politician, wikipedia_information
+    party_name, chamber_name, trade_type_message, trade_volume_message,
+    traded_sector_message, sold_sector_message, most_active_purchase,
+    most_active_sell, section_three_purchase_table, politician_summary,
+    wikipedia_information, similar_politicians
 )
 
 # Set the page configuration
@@ -55,17 +54,7 @@ st.write("""
 """)
 
 # Original data
-data_senators = DataLoader().load_senators_trading()
-data_instruments = DataLoader().load_financial_instruments()
-
-data_instruments = data_instruments[[
-    "Ticker", "quoteType", "longName", "shortName", "city", "country",
-    "industryKey", "sectorKey", "longBusinessSummary", "financialCurrency",
-    "currency"
-]]
-
-data = data_senators.merge(data_instruments, how="left", on="Ticker")
-data = data.fillna("Unknown")
+data = get_data_layer().merged_data()
 
 # Lists for Interactive Buttons:
 list_of_politicians = data.Politician.unique()
@@ -80,13 +69,14 @@ st.header(selected_politician)
 # General information
 st.subheader("General information")
 
-# Get information for interactive text
-party_politician_value = party_politician(data, selected_politician)
-chamber_politician_value = chamber_politician(data, selected_politician)
-first_trade_politician_value = first_trade_politician(data, selected_politician)
-last_trade_politician_value = last_trade_politician(data, selected_politician)
-total_invested_politician_value = total_invested_politician(data, selected_politician)
-total_sold_politician_value = total_sold_politician(data, selected_politician)
+# Get information for interactive text from the precomputed summary
+summary = politician_summary(selected_politician)
+party_politician_value = party_name(summary["Party"])
+chamber_politician_value = chamber_name(summary["Chamber"])
+first_trade_politician_value = summary["FirstTrade"]
+last_trade_politician_value = summary["LastTrade"]
+total_invested_politician_value = f"{summary['Invested']:,.0f}"
+total_sold_politician_value = f"{summary['Sold']:,.0f}"
 information, url, picture = wikipedia_information(selected_politician)
 
 content = (
@@ -148,10 +138,10 @@ with tab2:
 st.subheader("Exposure to the market")
 
 # Get information for interactive text
-message_1 = most_trade_type_politician(data, selected_politician)
-message_2 = most_traded_volume_politician(data, selected_politician)
-message_3 = most_traded_sector_politician(data, selected_politician)
-message_4 = most_sold_sector_politician(data, selected_politician)
+message_1 = trade_type_message(selected_politician, summary["TopType"])
+message_2 = trade_volume_message(summary["TopTypeInvested"])
+message_3 = traded_sector_message(summary["TopSector"], summary["TopSectorInvested"])
+message_4 = sold_sector_message(selected_politician, summary["TopSoldSector"], summary["TopSoldSectorInvested"])
 
 # Display the information
 st.write(f"{message_1} {message_2} {message_3} {message_4}")
@@ -220,10 +210,14 @@ st.write("Firstly, select whether you are interested in Purchases or Sales:")
 if "purchase_section_three" not in st.session_state:
     st.session_state.purchase_section_three = "Purchase"
 
+# The trades of the selected politician, a slice of the sorted data that the
+# tables of this section filter instead of the whole dataset
+politician_data = politician_rows(data, selected_politician)
+
 # Create tabs for Purchases and Sales
 tab_purchase, tab_sale = st.tabs(["Purchases 📈", "Sales 📉"])
 with tab_purchase:
-    if "Purchase" not in data[data["Politician"] == selected_politician].Transaction.unique():
+    if "Purchase" not in politician_data.Transaction.unique():
         st.write("There are no documented Purchases.")
     else:
         st.session_state.purchase_section_three = "Purchase"
@@ -231,7 +225,7 @@ with tab_purchase:
         list_of_types_of_instruments = list(
             map(
                 str,
-                data[(data["Politician"] == selected_politician) & (data["Transaction"] == "Purchase")].quoteType.unique()
+                politician_data[politician_data["Transaction"] == "Purchase"].quoteType.unique()
             )
         )
         list_of_types_of_instruments.sort()
@@ -241,12 +235,12 @@ with tab_purchase:
         )
 
         section_three_purchase_table(
-            data, list_of_types_of_instruments, selected_politician,
+            politician_data, list_of_types_of_instruments, selected_politician,
             "Purchase", selected_type_of_instrument_section_three
         )
 
 with tab_sale:
-    if "Sale" not in data[data["Politician"] == selected_politician].Transaction.unique():
+    if "Sale" not in politician_data.Transaction.unique():
         st.write("There are no documented Sales.")
     else:
         st.session_state.purchase_section_three = "Sale"
@@ -254,7 +248,7 @@ with tab_sale:
         list_of_types_of_instruments = list(
             map(
                 str,
-                data[(data["Politician"] == selected_politician) & (data["Transaction"] == "Sale")].quoteType.unique()
+                politician_data[politician_data["Transaction"] == "Sale"].quoteType.unique()
             )
         )
         list_of_types_of_instruments.sort()
@@ -265,7 +259,7 @@ with tab_sale:
         )
 
         section_three_purchase_table(
-            data, list_of_types_of_instruments, selected_politician,
+            politician_data, list_of_types_of_instruments, selected_politician,
             "Sale", selected_type_of_instrument_section_three
         )
 
@@ -286,3 +280,21 @@ try:
     st.plotly_chart(barchart_five_days, use_container_width=True, use_svg=True)
 except Exception as e:
     st.error(f"Error generating chart: {e}")
+
+
+# Politicians with a similar strategy
+st.subheader("Politicians trading alike")
+st.write(f"""
+    The politicians whose purchases are split the most similarly to those of
+    {selected_politician}, measured by the cosine similarity of the shares
+    invested in every instrument type or equity sector.
+""")
+
+tab_type, tab_sector = st.tabs(["Instrument types", "Equity sectors"])
+for tab, join in [(tab_type, "quoteType"), (tab_sector, "sectorKey")]:
+    with tab:
+        similar = similar_politicians(selected_politician, join)
+        if similar.empty:
+            st.write("There are no politicians with a similar allocation.")
+        else:
+            st.table(similar)
@@ -3,6 +3,7 @@ This file contains the configuration of Streamlit app Instrument Finder page.
 """
 import streamlit as st
 
+from Src.streamlit.data_layer import get_data_layer
 from Src.streamlit.instrument_finder import instrument_information, transform_data, process_politician_data
 from Src.visualization.graphs_istrument_finder import PoliticianGraph
 
@@ -86,6 +87,7 @@ for i, politician in enumerate(list_of_politicians):
                      "insider trading information.")
 
         # Graph generation
-        graph = PoliticianGraph(politician_data, selected_instrument)
+        price_history = get_data_layer().price_matrix().history(politician_data['Ticker'].iloc[0])
+        graph = PoliticianGraph(politician_data, selected_instrument, price_history)
         fig = graph.generate_graph()
         st.plotly_chart(fig)
@@ -4,14 +4,12 @@ This file contains the configuration of Streamlit app Align Your Investment Stra
 import streamlit as st
 import pandas as pd
 
-from Src.visualization.tables import (
-    data_for_strategy_align_type, data_for_strategy_align_sector
-)
 from Src.streamlit.align_your_investment_strategy import (
     chunk_list, equity_alignment_politician_sector, equity_alignment_politician_instrument,
-    load_and_merge_data, get_unique_sectors_and_instruments
+    load_and_merge_data, load_allocation_matrices, strategy_style_message
 )
-from Src.clustering.cluster import best_alignment
+from Src.streamlit.data_layer import get_data_layer
+from Src.clustering.cluster import clustered_alignment
 
 # Set the page configuration
 st.set_page_config(
@@ -85,13 +83,11 @@ st.write(
     """
 )
 
-# Load and merge data using the new function
+# Load the merged data and the precomputed allocations of the politicians
 data_sector, data_instruments = load_and_merge_data()
-list_of_unique_sectors, list_of_unique_instruments = get_unique_sectors_and_instruments(
-    data_instruments, data_sector
-)
-strategy_type = data_for_strategy_align_type(data_instruments)
-strategy_sector = data_for_strategy_align_sector(data_sector)
+strategy_type, strategy_sector = load_allocation_matrices()
+list_of_unique_sectors = strategy_sector.categories
+list_of_unique_instruments = strategy_type.categories
 
 # Initialize an empty dictionary for inputs
 inputs = {}
@@ -143,8 +139,10 @@ with tab1:
         strategy_inserted_instrument = pd.DataFrame(
             list(inputs_instrument.items()), columns=['quoteType', 'Invested by User']
         )
-        top_5_instrument_strategy = best_alignment(
-            strategy_type, strategy_inserted_instrument, "quoteType"
+        # Only the politicians of the nearest strategy cluster are ranked
+        clusters_instrument = get_data_layer().strategy_clusters("quoteType")
+        top_5_instrument_strategy, cluster_instrument = clustered_alignment(
+            strategy_type, clusters_instrument, strategy_inserted_instrument, "quoteType"
         )
 
         st.subheader("Alignment Result")
@@ -169,6 +167,7 @@ with tab1:
             """
         )
         st.table(top_5_instrument_strategy)
+        st.write(strategy_style_message(clusters_instrument, cluster_instrument))
         st.write("here you can browse the politicians to see the detailed analysis:")
 
         unique_5_politicians = top_5_instrument_strategy["Politician"].unique().tolist()
@@ -222,8 +221,10 @@ with tab2:
             strategy_inserted_sector = pd.DataFrame(
                 list(inputs.items()), columns=['sectorKey', 'Invested by User']
             )
-            top_5_sector_strategy = best_alignment(
-                strategy_sector, strategy_inserted_sector, "sectorKey"
+            # Only the politicians of the nearest strategy cluster are ranked
+            clusters_sector = get_data_layer().strategy_clusters("sectorKey")
+            top_5_sector_strategy, cluster_sector = clustered_alignment(
+                strategy_sector, clusters_sector, strategy_inserted_sector, "sectorKey"
             )
 
             st.subheader("Alignment Result")
@@ -236,12 +237,13 @@ with tab2:
                 """
             )
             st.table(top_5_sector_strategy)
+            st.write(strategy_style_message(clusters_sector, cluster_sector))
             st.write("here you can browse the politicians to see the detailed analysis:")
 
             unique_5_politicians = top_5_sector_strategy["Politician"].unique().tolist()
             equity_alignment_politician_sector(
                 unique_5_politicians, list_of_unique_sectors, data_sector,
-                strategy_inserted_sector
+                strategy_inserted_sector, strategy_sector
             )
 
     if disable_submit_button and human_interaction: